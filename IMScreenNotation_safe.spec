@@ -20,6 +20,9 @@ hiddenimports = [
     'canvas.drawing_canvas',
     'canvas.events',
     'canvas.painter',
+    'canvas.laser',
+    'canvas.ink',
+    'canvas.input_mask',
     'canvas.properties',
     'canvas.state_manager',
     'canvas.types',
@@ -45,6 +48,9 @@ hiddenimports = [
     'manager.tool_manager',
     'manager.tray_manager',
     'manager.config_manager',
+    'manager.idle_manager',
+    'manager.input_region',
+    'manager.screen_manager',
     
     # ruler 模块
     'ruler',
@@ -58,6 +64,15 @@ hiddenimports = [
     'shapes.advanced',
     'shapes.interactive',
     'shapes.ruler',
+    'shapes.bezier',
+    'shapes.style_cache',
+    'shapes.image',
+    'shapes.image_cache',
+    'shapes.image_loader',
+    'shapes.image_store',
+    'shapes.image_animation',
+    'shapes.image_vector',
+    'shapes.image_watcher',
     
     # text_style 模块
     'text_style',
@@ -72,11 +87,13 @@ hiddenimports = [
     'file_operations',
     'constants',
     'utils',
+    'app_log',
     
     # PyQt5核心模块
     'PyQt5.QtCore',
     'PyQt5.QtGui',
     'PyQt5.QtWidgets',
+    'PyQt5.QtSvg',  # SVG 图片标注
     'PyQt5.sip',
     
     # 系统模块（保守包含）
@@ -137,7 +154,6 @@ excludes = [
     'PyQt5.QtQml',
     'PyQt5.QtQuick',
     'PyQt5.QtQuickWidgets',
-    'PyQt5.QtSvg',
     'PyQt5.QtBluetooth',
     'PyQt5.QtNfc',
     'PyQt5.QtPositioning',
@@ -0,0 +1,126 @@
+"""
+日志模块
+基于标准库 logging，提供日志级别、按调用位置限流和内存环形缓冲区
+
+热路径使用 %-格式参数记录日志，级别未启用时 logging 只做一次整数比较，
+不会格式化字符串或写控制台。打包后的窗口程序没有控制台，日志仍保存在
+内存缓冲区中，可随时导出。
+"""
+import collections
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Optional
+from constants import (LOG_LEVEL, LOG_BUFFER_CAPACITY, LOG_RATE_LIMIT_BURST,
+                       LOG_RATE_LIMIT_INTERVAL)
+
+# 所有模块日志器的父日志器名称
+ROOT_LOGGER_NAME = "imscreen"
+
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+
+class RateLimitFilter(logging.Filter):
+    """按调用位置（文件, 行号）限流
+
+    每个位置在 LOG_RATE_LIMIT_INTERVAL 秒内最多通过 LOG_RATE_LIMIT_BURST 条，
+    被丢弃的条数附加在该位置下一条通过的日志后面。
+    """
+
+    def __init__(self, burst=LOG_RATE_LIMIT_BURST, interval=LOG_RATE_LIMIT_INTERVAL):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self._sites = {}  # (文件, 行号) -> [周期开始时间, 本周期已通过条数, 已丢弃条数]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        site = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            state = self._sites.get(site)
+            if state is None:
+                self._sites[site] = [now, 1, 0]
+                return True
+            if now - state[0] >= self.interval:
+                state[0] = now
+                state[1] = 0
+            if state[1] >= self.burst:
+                state[2] += 1
+                return False
+            state[1] += 1
+            suppressed, state[2] = state[2], 0
+        if suppressed:
+            record.msg = f"{record.msg} (此处已抑制 {suppressed} 条)"
+        return True
+
+
+class RingBufferHandler(logging.Handler):
+    """把最近的日志记录保存在内存中，导出时才格式化"""
+
+    def __init__(self, capacity=LOG_BUFFER_CAPACITY):
+        super().__init__()
+        self.records = collections.deque(maxlen=capacity)
+        self.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def dump(self) -> str:
+        """按时间顺序返回缓冲区中的所有日志"""
+        with self.lock:
+            records = list(self.records)
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.format(record))
+            except Exception:
+                lines.append(f"{record.levelname} {record.name}: {record.msg!r} {record.args!r}")
+        return "\n".join(lines)
+
+
+# 进程级共享实例
+log_buffer = RingBufferHandler()
+_rate_limiter = RateLimitFilter()
+_root_logger = logging.getLogger(ROOT_LOGGER_NAME)
+_root_logger.setLevel(LOG_LEVEL)
+_root_logger.propagate = False
+_root_logger.addHandler(log_buffer)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """获取模块日志器，日志经过限流后写入内存缓冲区和控制台"""
+    logger = logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+    if _rate_limiter not in logger.filters:
+        logger.addFilter(_rate_limiter)
+    return logger
+
+
+def setup_logging(level: Optional[str] = None) -> None:
+    """设置日志级别并在有控制台时输出到控制台
+
+    级别优先取环境变量 IMSCREEN_LOG_LEVEL，其次是参数（来自配置文件），最后是 LOG_LEVEL。
+    """
+    level_name = (os.environ.get("IMSCREEN_LOG_LEVEL") or level or LOG_LEVEL).upper()
+    if not isinstance(logging.getLevelName(level_name), int):
+        level_name = LOG_LEVEL
+    _root_logger.setLevel(level_name)
+
+    # 打包的窗口程序中 sys.stderr 为 None，此时只写内存缓冲区
+    stream = sys.stderr
+    has_console = any(isinstance(h, logging.StreamHandler) for h in _root_logger.handlers)
+    if stream is not None and not has_console:
+        console = logging.StreamHandler(stream)
+        console.setFormatter(logging.Formatter(LOG_FORMAT))
+        _root_logger.addHandler(console)
+
+
+def dump_log(path: Optional[str] = None) -> str:
+    """导出内存缓冲区中的日志，指定路径时同时写入文件"""
+    text = log_buffer.dump()
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return text
@@ -7,6 +7,9 @@ Canvas module - 画布模块
 - 事件处理 (CanvasEventHandler)
 - 状态管理 (CanvasStateManager)
 - 绘制管理 (CanvasPainter)
+- 激光笔拖尾 (LaserTrail)
+- 消失墨水 (DisappearingInk)
+- 标注形状的输入区域 (InputMask)
 - 类型定义 (ShapeType)
 
 主要接口：
@@ -26,6 +29,9 @@ from .properties import CanvasProperties
 from .events import CanvasEventHandler
 from .state_manager import CanvasStateManager
 from .painter import CanvasPainter
+from .laser import LaserTrail
+from .ink import DisappearingInk
+from .input_mask import InputMask
 from .types import ShapeType
 
 # 向外暴露的主要接口
@@ -35,6 +41,9 @@ __all__ = [
     'CanvasEventHandler',
     'CanvasStateManager',
     'CanvasPainter',
+    'LaserTrail',
+    'DisappearingInk',
+    'InputMask',
     'ShapeType'
 ]
 
@@ -1,21 +1,32 @@
 """
 Main drawing canvas widget
 """
+import os
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtCore import Qt, QPoint
+from PyQt5.QtCore import Qt, QPoint, pyqtSignal
 from PyQt5.QtGui import QPainter
 from typing import List, Optional
 
+from shapes import Image, LineRuler, CircleRuler
+from shapes.image_loader import image_loader
+from shapes.image_animation import image_animator
+from shapes.image_watcher import image_watcher
 from .types import ShapeType
 from .properties import CanvasProperties
 from .events import CanvasEventHandler
 from .state_manager import CanvasStateManager
 from .painter import CanvasPainter
+from .laser import LaserTrail
+from .ink import DisappearingInk
+from .input_mask import InputMask
 
 
 class DrawingCanvas(QWidget):
     """主绘图画布组件"""
     
+    # 画布背景颜色或透明度变化
+    appearance_changed = pyqtSignal()
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMouseTracking(True)  # Enable mouse tracking even when no button is pressed
@@ -28,6 +39,9 @@ class DrawingCanvas(QWidget):
         self.event_handler = CanvasEventHandler(self)
         self.state_manager = CanvasStateManager(self)
         self.painter = CanvasPainter(self)
+        self.laser = LaserTrail(self)
+        self.ink = DisappearingInk(self)
+        self.input_mask = InputMask(self)
         
         # 绘图状态
         self.shapes: List[ShapeType] = []  # List to store all drawn shapes
@@ -40,6 +54,57 @@ class DrawingCanvas(QWidget):
         self.ruler_pixel_length = 100
         self.ruler_real_length = 10.0
         self.ruler_unit = "cm"
+        
+        # 图片在后台解码完成后只重绘对应区域
+        image_loader.image_decoded.connect(self._on_image_decoded)
+        image_animator.frame_changed.connect(self._on_image_frame_changed)
+        image_watcher.image_changed.connect(self._on_image_file_changed)
+
+    def _on_image_decoded(self, source_key, image) -> None:
+        """后台图片解码完成"""
+        shapes = list(self.shapes)
+        if self.current_shape is not None:
+            shapes.append(self.current_shape)
+        for shape in shapes:
+            if isinstance(shape, Image):
+                old_rect = shape.get_paint_rect()
+                if shape.apply_decoded_image(source_key, image):
+                    self.update(old_rect.united(shape.get_paint_rect()).toAlignedRect())
+                    self.input_mask.update_shape(shape)
+
+    def _on_image_file_changed(self, path) -> None:
+        """链接的图片文件被修改，重新加载引用它的图片"""
+        shapes = list(self.shapes)
+        if self.current_shape is not None:
+            shapes.append(self.current_shape)
+        for shape in shapes:
+            if isinstance(shape, Image) and shape.image_path and os.path.abspath(shape.image_path) == path:
+                old_rect = shape.get_paint_rect()
+                # 后台解码的结果由 _on_image_decoded 负责重绘
+                if shape.reload_image():
+                    self.update(old_rect.united(shape.get_paint_rect()).toAlignedRect())
+                    self.input_mask.update_shape(shape)
+
+    def _animated_images(self, source_key) -> list:
+        """画布上引用该动画的图片"""
+        shapes = list(self.shapes)
+        if self.current_shape is not None:
+            shapes.append(self.current_shape)
+        return [shape for shape in shapes
+                if isinstance(shape, Image) and shape.animation is not None
+                and shape.source_key == source_key]
+
+    def references_animation(self, source_key) -> bool:
+        """画布上是否还有引用该动画的图片"""
+        return bool(self._animated_images(source_key))
+
+    def _on_image_frame_changed(self, source_key) -> None:
+        """动画图片换帧，只重绘引用该文件的图片区域
+
+        动画由所有屏幕的画布共享，是否停止播放由 ScreenManager 统一判断。
+        """
+        for shape in self._animated_images(source_key):
+            self.update(shape.get_paint_rect().toAlignedRect())
 
     # 属性设置方法的代理
     def set_current_tool(self, tool: str) -> None:
@@ -62,11 +127,13 @@ class DrawingCanvas(QWidget):
         """设置画布背景颜色"""
         self.properties.set_canvas_color(color)
         self.update()  # Redraw the canvas
+        self.appearance_changed.emit()
 
     def set_canvas_opacity(self, opacity: float) -> None:
         """设置画布不透明度"""
         self.properties.set_canvas_opacity(opacity)
         self.update()
+        self.appearance_changed.emit()
 
     # 文本相关属性设置方法的代理
     def set_text_font_family(self, font_family: str) -> None:
@@ -118,17 +185,30 @@ class DrawingCanvas(QWidget):
         """重做操作"""
         self.state_manager.redo()
 
+    def apply_ruler_settings(self, settings: dict) -> None:
+        """应用标尺设置，并更新画布中已存在的标尺形状的显示设置"""
+        self.ruler_pixel_length = settings.get('pixel_length', 100)
+        self.ruler_real_length = settings.get('real_length', 10.0)
+        self.ruler_unit = settings.get('unit', 'cm')
+        for shape in self.shapes:
+            if isinstance(shape, LineRuler):
+                shape.show_ticks = settings.get('show_ticks', True)
+                shape.tick_interval = settings.get('tick_interval', 1.0)
+            elif isinstance(shape, CircleRuler):
+                shape.show_diameter_line = settings.get('show_diameter_line', True)
+        self.update()
+
     def clear_canvas(self):
         """清空画布"""
         self.state_manager.clear_canvas()
 
-    def to_json_data(self):
+    def to_json_data(self, image_store=None):
         """将画布内容导出为JSON数据"""
-        return self.state_manager.to_json_data()
+        return self.state_manager.to_json_data(image_store)
 
-    def from_json_data(self, json_data):
+    def from_json_data(self, json_data, image_store=None):
         """从JSON数据导入画布内容"""
-        self.state_manager.from_json_data(json_data)
+        self.state_manager.from_json_data(json_data, image_store)
 
     # Qt事件处理
     def paintEvent(self, event):
@@ -5,6 +5,9 @@ from PyQt5.QtCore import Qt, QPoint, QRect, QPointF
 from PyQt5.QtWidgets import QInputDialog
 from shapes import Line, Rectangle, Circle, Arrow, Freehand, Point, LaserPointer, FilledFreehand, Text, Eraser, LineRuler, CircleRuler, Image
 from .types import ShapeType
+from app_log import get_logger
+
+logger = get_logger(__name__)
 
 # 导入文本编辑对话框
 try:
@@ -85,17 +88,13 @@ class CanvasEventHandler:
                     opacity=self.canvas.properties.current_opacity
                 )
                 self.canvas.shapes.append(self.canvas.current_shape)
+                self.canvas.ink.track(self.canvas.current_shape)
+                self.canvas.input_mask.add_shape(self.canvas.current_shape)
                 self.canvas.current_shape = None
                 self.canvas.drawing = False  # Point is a single click action
             elif self.canvas.properties.current_tool == 'laser_pointer':
                 # 激光笔不保存状态，因为它是临时的
-                self.canvas.current_shape = LaserPointer(
-                    event.pos(), 
-                    color=self.canvas.properties.current_color, 
-                    thickness=self.canvas.properties.current_thickness, 
-                    opacity=self.canvas.properties.current_opacity
-                )
-                self.canvas.update()  # 立即更新显示激光笔
+                self._add_laser_point(event.pos())
                 return  # 激光笔是临时的，不添加到shapes列表中，也不保存状态
             elif self.canvas.properties.current_tool == 'eraser':
                 # 橡皮擦工具：开始擦除操作
@@ -114,6 +113,8 @@ class CanvasEventHandler:
         """处理鼠标移动事件"""
         if self.canvas.drawing:
             self.canvas.end_point = event.pos()
+            # 拖拽期间使用快速渲染，空闲后自动恢复高画质
+            self.canvas.painter.begin_interaction()
             
             if self.canvas.properties.current_tool == 'line':
                 self.canvas.current_shape = Line(
@@ -153,24 +154,22 @@ class CanvasEventHandler:
                 if isinstance(self.canvas.current_shape, FilledFreehand):
                     self.canvas.current_shape.points.append(self.canvas.end_point)
             elif self.canvas.properties.current_tool == 'laser_pointer':
-                # 更新激光笔位置
-                self.canvas.current_shape = LaserPointer(
-                    event.pos(), 
-                    color=self.canvas.properties.current_color, 
-                    thickness=self.canvas.properties.current_thickness, 
-                    opacity=self.canvas.properties.current_opacity
-                )
-                self.canvas.update()
+                # 更新激光笔位置，拖尾自行按时间淡出并只重绘其所在区域
+                self._add_laser_point(event.pos())
                 return  # 激光笔是临时的，不添加到shapes列表中
             elif self.canvas.properties.current_tool == 'eraser':
                 # 橡皮擦：添加擦除点
                 if isinstance(self.canvas.current_shape, Eraser):
-                    self.canvas.current_shape.points.append(self.canvas.end_point)
+                    # 只重绘新增的一段擦除轨迹
+                    dirty_rect = self.canvas.current_shape.add_point(self.canvas.end_point)
+                    self.canvas.update(dirty_rect.toAlignedRect())
+                    return
             elif self.canvas.properties.current_tool == 'line_ruler':
                 # 直线标尺 - 使用 RulerManager 创建
-                if hasattr(self.canvas, 'parent') and hasattr(self.canvas.parent(), 'ruler_manager'):
+                ruler_manager = self._ruler_manager()
+                if ruler_manager is not None:
                     # 通过 RulerManager 创建，会应用所有当前设置
-                    self.canvas.current_shape = self.canvas.parent().ruler_manager.create_line_ruler(
+                    self.canvas.current_shape = ruler_manager.create_line_ruler(
                         self.canvas.start_point, self.canvas.end_point
                     )
                 else:
@@ -188,9 +187,10 @@ class CanvasEventHandler:
                 # 圆形标尺 - 使用 RulerManager 创建
                 radius = int(((self.canvas.end_point.x() - self.canvas.start_point.x())**2 + 
                              (self.canvas.end_point.y() - self.canvas.start_point.y())**2)**0.5)
-                if hasattr(self.canvas, 'parent') and hasattr(self.canvas.parent(), 'ruler_manager'):
+                ruler_manager = self._ruler_manager()
+                if ruler_manager is not None:
                     # 通过 RulerManager 创建，会应用所有当前设置
-                    self.canvas.current_shape = self.canvas.parent().ruler_manager.create_circle_ruler(
+                    self.canvas.current_shape = ruler_manager.create_circle_ruler(
                         self.canvas.start_point, radius
                     )
                 else:
@@ -211,6 +211,7 @@ class CanvasEventHandler:
         """处理鼠标释放事件"""
         if event.button() == Qt.LeftButton and self.canvas.drawing:
             self.canvas.drawing = False
+            self.canvas.painter.end_interaction()
             if (self.canvas.current_shape and 
                 self.canvas.properties.current_tool != 'point' and 
                 self.canvas.properties.current_tool != 'laser_pointer'):
@@ -223,9 +224,19 @@ class CanvasEventHandler:
                 if (self.canvas.properties.current_tool == 'eraser' and 
                     isinstance(self.canvas.current_shape, Eraser)):
                     self._perform_erase_operation(self.canvas.current_shape)
+                    self.canvas.current_shape.release_preview()
                 else:
+                    # 自由绘制笔画提交时拟合为贝塞尔曲线
+                    if (isinstance(self.canvas.current_shape, (Freehand, FilledFreehand)) and
+                        self.canvas.properties.freehand_curve_fitting):
+                        self.canvas.current_shape.fit_curves(
+                            self.canvas.properties.freehand_fit_tolerance,
+                            self.canvas.properties.freehand_keep_raw_points
+                        )
+                    
                     if self.canvas.properties.single_draw_mode:
                         self.canvas.shapes.clear()
+                        self.canvas.input_mask.reset()
                         # 单次绘制模式下，清空撤销栈并重新开始
                         self.canvas.state_manager.undo_stack.clear()
                         self.canvas.state_manager.redo_stack.clear()
@@ -233,6 +244,8 @@ class CanvasEventHandler:
                         self.canvas.state_manager.undo_stack.append([])  # 空的序列化状态列表
                     
                     self.canvas.shapes.append(self.canvas.current_shape)
+                    self.canvas.ink.track(self.canvas.current_shape)
+                    self.canvas.input_mask.add_shape(self.canvas.current_shape)
                     
                     # 发出形状添加信号
                     self.canvas.state_manager.shape_added.emit(self.canvas.current_shape)
@@ -240,6 +253,21 @@ class CanvasEventHandler:
             self.canvas.current_shape = None
             self.canvas.update()
 
+    def _ruler_manager(self):
+        """标尺管理器属于主窗口，其他屏幕的画布窗口通过 main_window 找到它"""
+        window = self.canvas.parent()
+        window = getattr(window, 'main_window', window)
+        return getattr(window, 'ruler_manager', None)
+
+    def _add_laser_point(self, position):
+        """向激光笔拖尾添加位置"""
+        self.canvas.laser.add_point(
+            QPointF(position),
+            self.canvas.properties.current_color,
+            self.canvas.properties.current_thickness,
+            self.canvas.properties.current_opacity
+        )
+
     def _create_text_annotation(self, position):
         """创建文本标注"""
         try:
@@ -280,10 +308,13 @@ class CanvasEventHandler:
                 
                 # 添加到形状列表
                 self.canvas.shapes.append(text_shape)
+                self.canvas.ink.track(text_shape)
+                self.canvas.input_mask.add_shape(text_shape)
                 
                 # 如果是单次绘制模式，清空其他形状
                 if self.canvas.properties.single_draw_mode:
                     self.canvas.shapes = [text_shape]
+                    self.canvas.input_mask.reset()
                     self.canvas.state_manager.undo_stack.clear()
                 
                 # 更新显示
@@ -359,6 +390,7 @@ class CanvasEventHandler:
                     # 如果文本为空，删除该文本标注
                     if text_shape in self.canvas.shapes:
                         self.canvas.shapes.remove(text_shape)
+                        self.canvas.input_mask.remove_shape(text_shape)
                         print("文本标注已删除")
                 else:
                     # 更新文本内容
@@ -369,6 +401,7 @@ class CanvasEventHandler:
                         # 如果有边界计算方法，重新计算
                         if hasattr(text_shape, '_calculate_bounds'):
                             text_shape._calculate_bounds()
+                    self.canvas.input_mask.update_shape(text_shape)
                     
                     print(f"文本标注已更新: {new_text}")
                 
@@ -399,8 +432,9 @@ class CanvasEventHandler:
         for shape in shapes_to_remove:
             if shape in self.canvas.shapes:
                 self.canvas.shapes.remove(shape)
+                self.canvas.input_mask.remove_shape(shape)
         
-        print(f"橡皮擦删除了 {len(shapes_to_remove)} 个形状")
+        logger.debug("橡皮擦删除了 %d 个形状", len(shapes_to_remove))
 
     def _find_image_at_position(self, position):
         """查找指定位置的图片标注
@@ -442,10 +476,13 @@ class CanvasEventHandler:
                     
                     # 添加到形状列表
                     self.canvas.shapes.append(image_shape)
+                    self.canvas.ink.track(image_shape)
+                    self.canvas.input_mask.add_shape(image_shape)
                     
                     # 如果是单次绘制模式，清空其他形状
                     if self.canvas.properties.single_draw_mode:
                         self.canvas.shapes = [image_shape]
+                        self.canvas.input_mask.reset()
                         self.canvas.state_manager.undo_stack.clear()
                     
                     # 更新显示
@@ -470,10 +507,13 @@ class CanvasEventHandler:
                     
                     # 添加到形状列表
                     self.canvas.shapes.append(image_shape)
+                    self.canvas.ink.track(image_shape)
+                    self.canvas.input_mask.add_shape(image_shape)
                     
                     # 如果是单次绘制模式，清空其他形状
                     if self.canvas.properties.single_draw_mode:
                         self.canvas.shapes = [image_shape]
+                        self.canvas.input_mask.reset()
                         self.canvas.state_manager.undo_stack.clear()
                     
                     # 更新显示
@@ -507,6 +547,7 @@ class CanvasEventHandler:
                     
                     # 重新加载图片（如果路径改变了）
                     image_shape.load_image()
+                    self.canvas.input_mask.update_shape(image_shape)
                     
                     # 更新显示
                     self.canvas.update()
@@ -0,0 +1,125 @@
+"""
+Disappearing ink: committed shapes that fade out and remove themselves
+"""
+import heapq
+import itertools
+from PyQt5.QtGui import QPainter
+from PyQt5.QtCore import QDateTime, QRectF, QTimer
+from constants import INK_FADE_DURATION, INK_FADE_FRAME_INTERVAL
+
+
+class DisappearingInk:
+    """消失墨水 - 管理形状的到期时间
+
+    到期时间保存在最小堆中，只用一个单次定时器等待最早的到期时间，
+    不需要每帧扫描 canvas.shapes。到期的形状在 INK_FADE_DURATION 内淡出，
+    淡出期间只重绘这些形状所在的区域，结束后从画布中移除。
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.fading = {}  # 正在淡出的形状 -> 开始淡出的时间
+        self._deadlines = []  # (到期时间, 序号, 形状) 组成的最小堆
+        self._counter = itertools.count()  # 到期时间相同时按加入顺序排列，避免比较形状对象
+
+        self._expiry_timer = QTimer()
+        self._expiry_timer.setSingleShot(True)
+        self._expiry_timer.timeout.connect(self._on_deadline)
+
+        self._fade_timer = QTimer()
+        self._fade_timer.setInterval(INK_FADE_FRAME_INTERVAL)
+        self._fade_timer.timeout.connect(self._on_fade_frame)
+
+    def track(self, shape, expires_at=None) -> None:
+        """登记新提交的形状，消失墨水模式关闭时忽略
+
+        Args:
+            expires_at: 到期时间（毫秒时间戳），默认按当前设置的寿命计算
+        """
+        if expires_at is None:
+            if not self.canvas.properties.disappearing_ink:
+                return
+            expires_at = QDateTime.currentMSecsSinceEpoch() + self.canvas.properties.ink_lifetime
+        shape.expires_at = expires_at
+        heapq.heappush(self._deadlines, (expires_at, next(self._counter), shape))
+        # 新的到期时间早于当前等待的时间时才需要重新设置定时器
+        if self._deadlines[0][2] is shape:
+            self._arm_expiry_timer()
+
+    def clear(self) -> None:
+        """取消所有等待中的到期和淡出"""
+        self._deadlines.clear()
+        self.fading.clear()
+        self._expiry_timer.stop()
+        self._fade_timer.stop()
+
+    def is_fading(self) -> bool:
+        """是否有形状正在淡出"""
+        return bool(self.fading)
+
+    def fade_factor(self, shape) -> float:
+        """返回形状当前的不透明度系数"""
+        started = self.fading.get(shape)
+        if started is None:
+            return 1.0
+        elapsed = QDateTime.currentMSecsSinceEpoch() - started
+        return max(0.0, 1.0 - elapsed / INK_FADE_DURATION)
+
+    def draw_fading(self, painter: QPainter, shape) -> None:
+        """以淡出后的不透明度绘制形状"""
+        old_opacity = painter.opacity()
+        painter.setOpacity(old_opacity * self.fade_factor(shape))
+        shape.draw(painter)
+        painter.setOpacity(old_opacity)
+
+    def _arm_expiry_timer(self) -> None:
+        if not self._deadlines:
+            self._expiry_timer.stop()
+            return
+        delay = self._deadlines[0][0] - QDateTime.currentMSecsSinceEpoch()
+        self._expiry_timer.start(max(0, int(delay)))
+
+    def _on_deadline(self) -> None:
+        """最早的到期时间已到，开始淡出所有已到期的形状"""
+        now = QDateTime.currentMSecsSinceEpoch()
+        current = None
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, _, shape = heapq.heappop(self._deadlines)
+            if current is None:
+                current = set(self.canvas.shapes)
+            # 已被擦除、清空或单次绘制模式替换的形状不再淡出
+            if shape in current:
+                self.fading[shape] = now
+        if self.fading and not self._fade_timer.isActive():
+            self._fade_timer.start()
+        self._arm_expiry_timer()
+
+    def _on_fade_frame(self) -> None:
+        """淡出动画帧：重绘正在淡出的形状，移除已完全淡出的形状"""
+        now = QDateTime.currentMSecsSinceEpoch()
+        dirty = QRectF()
+        full_update = False
+        finished = []
+        for shape, started in self.fading.items():
+            rect = shape.get_paint_rect()
+            if rect is None:
+                full_update = True
+            else:
+                dirty = dirty.united(rect)
+            if now - started >= INK_FADE_DURATION:
+                finished.append(shape)
+
+        for shape in finished:
+            del self.fading[shape]
+            try:
+                self.canvas.shapes.remove(shape)
+            except ValueError:
+                continue  # 已被擦除、清空或撤销
+            self.canvas.input_mask.remove_shape(shape)
+
+        if full_update:
+            self.canvas.update()
+        elif not dirty.isNull():
+            self.canvas.update(dirty.toAlignedRect())
+        if not self.fading:
+            self._fade_timer.stop()
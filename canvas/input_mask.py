@@ -0,0 +1,200 @@
+"""
+标注形状的输入区域：画布只在有标注的地方接收鼠标输入
+"""
+from PyQt5.QtCore import QRect, QTimer
+from PyQt5.QtGui import QRegion
+from shapes import Image
+from constants import INPUT_MASK_CELL_SIZE, INPUT_MASK_MAX_RECTS, INPUT_MASK_UPDATE_DELAY
+
+
+class InputMask:
+    """由形状包围矩形组成的输入区域
+
+    画布按 INPUT_MASK_CELL_SIZE 划分网格，每个形状占据其包围矩形覆盖的格子，
+    格子按引用计数记录，形状增删或修改时由对应的代码调用 add_shape、remove_shape、
+    update_shape 只更新它自己的格子；整个形状列表被替换（撤销、重做、清空、导入）时
+    调用 reset 重新比较一次。绘制本身不会触发任何更新。
+    生成区域时把格子按行合并成条带、再合并相同的相邻条带，矩形数超过
+    INPUT_MASK_MAX_RECTS 时把网格加粗一倍重新合并，保证更新输入区域的代价有上限。
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self._apply = None  # 启用时设置：接收 QRegion 并应用到窗口的回调
+        self._cells = {}  # (列, 行) -> 覆盖该格子的形状数
+        self._shapes = {}  # 形状 -> (包围矩形, 占据的格子)
+        self._region = None
+        self._resync = False  # 是否需要重新比较整个形状列表
+        self._changed = False  # 格子是否有变化、需要重新生成区域
+
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(INPUT_MASK_UPDATE_DELAY)
+        self._timer.timeout.connect(self._update)
+
+    @property
+    def enabled(self) -> bool:
+        return self._apply is not None
+
+    def enable(self, apply) -> None:
+        """开始跟踪形状，并立即应用一次输入区域"""
+        self._apply = apply
+        self._region = None
+        self._resync = True
+        self._update()
+
+    def disable(self) -> None:
+        """停止跟踪并丢弃所有状态"""
+        self._apply = None
+        self._timer.stop()
+        self._cells.clear()
+        self._shapes.clear()
+        self._region = None
+        self._resync = False
+        self._changed = False
+
+    def add_shape(self, shape) -> None:
+        """形状加入画布后调用"""
+        if self._apply is None:
+            return
+        self._track(shape)
+        self._schedule_update()
+
+    def remove_shape(self, shape) -> None:
+        """形状从画布移除后调用"""
+        if self._apply is None:
+            return
+        entry = self._shapes.pop(shape, None)
+        if entry is not None:
+            self._release(entry[1])
+            self._changed = True
+            self._schedule_update()
+
+    def update_shape(self, shape) -> None:
+        """形状的大小或位置改变后调用，只处理已跟踪的形状"""
+        if self._apply is None or shape not in self._shapes:
+            return
+        self._track(shape)
+        self._schedule_update()
+
+    def reset(self) -> None:
+        """整个形状列表被替换后调用"""
+        if self._apply is None:
+            return
+        self._resync = True
+        self._schedule_update()
+
+    def _schedule_update(self) -> None:
+        """短时间内的多次变化合并为一次更新"""
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _update(self) -> None:
+        if self._apply is None:
+            return
+        if self._resync:
+            self._resync = False
+            self._sync()
+        if self._changed or self._region is None:
+            self._changed = False
+            region = self._build_region()
+            if self._region is None or region != self._region:
+                self._region = region
+                self._apply(region)
+
+    def _sync(self) -> None:
+        """比较当前形状与已记录的形状，只更新新增、删除或移动的形状"""
+        current = set(self.canvas.shapes)
+        for shape in [shape for shape in self._shapes if shape not in current]:
+            self._release(self._shapes.pop(shape)[1])
+            self._changed = True
+        for shape in current:
+            self._track(shape)
+
+    def _track(self, shape) -> None:
+        """记录形状占据的格子，包围矩形没有变化时不做任何事"""
+        if isinstance(shape, Image):
+            # 推迟加载的图片在加载前只有占位符大小，先加载以得到真实区域，
+            # 不依赖画布是否先绘制过；后台解码完成后由画布调用 update_shape
+            shape.ensure_loaded()
+        rect = shape.get_paint_rect()
+        if rect is None:
+            rect = QRect(0, 0, self.canvas.width(), self.canvas.height())
+        else:
+            rect = rect.toAlignedRect()
+        entry = self._shapes.get(shape)
+        if entry is not None and entry[0] == rect:
+            return
+        if entry is not None:
+            self._release(entry[1])
+        cells = self._cells_for(rect)
+        for cell in cells:
+            self._cells[cell] = self._cells.get(cell, 0) + 1
+        self._shapes[shape] = (rect, cells)
+        self._changed = True
+
+    def _release(self, cells) -> None:
+        for cell in cells:
+            count = self._cells[cell] - 1
+            if count:
+                self._cells[cell] = count
+            else:
+                del self._cells[cell]
+
+    @staticmethod
+    def _cells_for(rect: QRect):
+        size = INPUT_MASK_CELL_SIZE
+        left, top = max(0, rect.left()) // size, max(0, rect.top()) // size
+        right, bottom = max(0, rect.right()) // size, max(0, rect.bottom()) // size
+        return tuple((col, row) for row in range(top, bottom + 1) for col in range(left, right + 1))
+
+    def _build_region(self) -> QRegion:
+        cells = set(self._cells)
+        size = INPUT_MASK_CELL_SIZE
+        rects = self._merge_cells(cells)
+        while len(rects) > INPUT_MASK_MAX_RECTS:
+            cells = {(col // 2, row // 2) for col, row in cells}
+            size *= 2
+            rects = self._merge_cells(cells)
+
+        region = QRegion()
+        for col, row, cols, rows in rects:
+            region = region.united(QRect(col * size, row * size, cols * size, rows * size))
+        return region
+
+    @staticmethod
+    def _merge_cells(cells):
+        """把格子合并为矩形 (列, 行, 列数, 行数)：先合并每行的连续格子，再合并上下相同的条带"""
+        rows = {}
+        for col, row in cells:
+            rows.setdefault(row, []).append(col)
+
+        rects = []
+        open_runs = {}  # (起始列, 结束列) -> [起始行, 最后一行]
+        for row in sorted(rows):
+            runs = []
+            cols = sorted(rows[row])
+            start = previous = cols[0]
+            for col in cols[1:]:
+                if col != previous + 1:
+                    runs.append((start, previous))
+                    start = col
+                previous = col
+            runs.append((start, previous))
+
+            next_open = {}
+            for run in runs:
+                span = open_runs.pop(run, None)
+                if span is not None and span[1] == row - 1:
+                    span[1] = row
+                    next_open[run] = span
+                else:
+                    if span is not None:
+                        open_runs[run] = span
+                    next_open[run] = [row, row]
+            for (first, last), (top, bottom) in open_runs.items():
+                rects.append((first, top, last - first + 1, bottom - top + 1))
+            open_runs = next_open
+        for (first, last), (top, bottom) in open_runs.items():
+            rects.append((first, top, last - first + 1, bottom - top + 1))
+        return rects
@@ -0,0 +1,88 @@
+"""
+Laser pointer trail with its own animation clock
+"""
+from collections import deque
+from PyQt5.QtGui import QColor, QPen, QPainter
+from PyQt5.QtCore import QDateTime, QRectF, QTimer, Qt
+from shapes import LaserPointer
+from constants import LASER_TRAIL_CAPACITY, LASER_TRAIL_DURATION, LASER_FRAME_INTERVAL
+
+
+class LaserTrail:
+    """激光笔拖尾 - 最近位置的环形缓冲区，按时间淡出
+
+    拖尾有独立的动画定时器，每帧只重绘拖尾所在的区域，
+    拖尾完全淡出后定时器自动停止，空闲时不会产生唤醒。
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.samples = deque(maxlen=LASER_TRAIL_CAPACITY)  # LaserPointer 采样，最旧的在前
+        self._dirty_rect = QRectF()  # 上一帧拖尾占据的区域
+        self._timer = QTimer()
+        self._timer.setInterval(LASER_FRAME_INTERVAL)
+        self._timer.timeout.connect(self._on_frame)
+
+    def add_point(self, position, color, thickness, opacity) -> None:
+        """记录激光笔的新位置"""
+        self.samples.append(LaserPointer(
+            position, duration=LASER_TRAIL_DURATION,
+            color=color, thickness=thickness, opacity=opacity
+        ))
+        self._repaint()
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def is_active(self) -> bool:
+        """拖尾是否仍在显示"""
+        return bool(self.samples)
+
+    def _on_frame(self) -> None:
+        """动画帧：丢弃已淡出的采样并重绘拖尾区域"""
+        now = QDateTime.currentMSecsSinceEpoch()
+        samples = self.samples
+        while samples and now - samples[0].start_time > samples[0].duration:
+            samples.popleft()
+        self._repaint()
+        if not samples:
+            self._timer.stop()
+
+    def _repaint(self) -> None:
+        """重绘上一帧和当前帧拖尾覆盖的区域"""
+        rect = self._bounding_rect()
+        dirty = self._dirty_rect.united(rect)
+        if not dirty.isNull():
+            self.canvas.update(dirty.toAlignedRect())
+        self._dirty_rect = rect
+
+    def _bounding_rect(self) -> QRectF:
+        if not self.samples:
+            return QRectF()
+        xs = [sample.center_point.x() for sample in self.samples]
+        ys = [sample.center_point.y() for sample in self.samples]
+        margin = max(sample.radius + sample.thickness for sample in self.samples) + 2
+        return QRectF(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys)).adjusted(
+            -margin, -margin, margin, margin)
+
+    def draw(self, painter: QPainter) -> None:
+        """绘制拖尾：越旧的线段越细越透明，最新位置绘制激光点"""
+        if not self.samples:
+            return
+        now = QDateTime.currentMSecsSinceEpoch()
+        old_pen = painter.pen()
+        old_brush = painter.brush()
+
+        previous = None
+        for sample in self.samples:
+            fade = 1.0 - (now - sample.start_time) / sample.duration
+            if previous is not None and fade > 0:
+                color = QColor(sample.base_color)
+                color.setAlphaF(sample.opacity * fade)
+                painter.setPen(QPen(color, max(1.0, sample.radius * 2 * fade), Qt.SolidLine, Qt.RoundCap))
+                painter.drawLine(previous, sample.center_point)
+            previous = sample.center_point
+
+        self.samples[-1].draw(painter)
+
+        painter.setPen(old_pen)
+        painter.setBrush(old_brush)
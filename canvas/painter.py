@@ -2,17 +2,44 @@
 Canvas painting and rendering functionality
 """
 from PyQt5.QtGui import QPainter, QColor
+from PyQt5.QtCore import QTimer
+from constants import RENDER_IDLE_DELAY
 
 
 class CanvasPainter:
     """处理画布的绘制和渲染"""
-    
+
     def __init__(self, canvas):
         self.canvas = canvas
 
+        # 渐进式画质：拖拽过程中关闭抗锯齿，输入空闲后再以高画质重绘
+        self.interacting = False
+        self.fast_scene_during_interaction = False  # 交互时是否连同已提交的形状一起降低画质
+        self._idle_timer = QTimer()
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(RENDER_IDLE_DELAY)
+        self._idle_timer.timeout.connect(self._on_input_idle)
+
+    def begin_interaction(self) -> None:
+        """标记正在拖拽/调整大小，并推迟高画质重绘"""
+        self.interacting = True
+        self._idle_timer.start()
+
+    def end_interaction(self) -> None:
+        """结束交互，下一帧立即恢复高画质"""
+        self._idle_timer.stop()
+        self.interacting = False
+
+    def _on_input_idle(self) -> None:
+        """输入空闲一段时间后以完整画质重绘"""
+        if self.interacting:
+            self.interacting = False
+            self.canvas.update()
+
     def paint_canvas(self, painter: QPainter):
         """绘制整个画布"""
-        painter.setRenderHint(QPainter.Antialiasing)
+        fast_scene = self.interacting and self.fast_scene_during_interaction
+        painter.setRenderHint(QPainter.Antialiasing, not fast_scene)
 
         # Draw canvas background with current color and opacity
         # 如果画布完全透明，绘制一个几乎透明的背景来确保鼠标事件可以被接收
@@ -24,9 +51,47 @@ class CanvasPainter:
             painter.fillRect(self.canvas.rect(), self.canvas.properties.canvas_color)
 
         # Draw all shapes
-        for shape in self.canvas.shapes:
-            shape.draw(painter)
+        self._draw_shapes_batched(painter, self.canvas.shapes)
+
+        # Draw laser pointer trail
+        self.canvas.laser.draw(painter)
 
         # Draw current shape being drawn
         if self.canvas.current_shape:
+            # 正在绘制的预览在交互期间不使用抗锯齿
+            painter.setRenderHint(QPainter.Antialiasing, not self.interacting)
             self.canvas.current_shape.draw(painter)
+
+    def _draw_shapes_batched(self, painter: QPainter, shapes) -> None:
+        """按画笔/画刷状态将相邻形状分组绘制
+
+        只合并连续且 batch_key 相同的形状，因此不会改变形状之间的叠放顺序。
+        正在淡出的消失墨水形状单独以降低的不透明度绘制。
+        """
+        fading = self.canvas.ink.fading
+        run = []
+        run_key = None
+        for shape in shapes:
+            if fading and shape in fading:
+                self._flush_batch(painter, run)
+                self.canvas.ink.draw_fading(painter, shape)
+                run = []
+                run_key = None
+                continue
+            key = shape.batch_key()
+            if key is not None and key == run_key:
+                run.append(shape)
+                continue
+            self._flush_batch(painter, run)
+            run = [shape]
+            run_key = key
+        self._flush_batch(painter, run)
+
+    def _flush_batch(self, painter: QPainter, run) -> None:
+        """绘制一组同状态的形状"""
+        if not run:
+            return
+        if len(run) == 1:
+            run[0].draw(painter)
+        else:
+            type(run[0]).draw_batch(painter, run)
@@ -4,6 +4,7 @@ Canvas properties and settings management
 from PyQt5.QtGui import QColor
 from PyQt5.QtCore import QObject
 from typing import Union, List, Optional
+from constants import FREEHAND_FIT_TOLERANCE, INK_LIFETIME
 
 
 class CanvasProperties(QObject):
@@ -20,6 +21,15 @@ class CanvasProperties(QObject):
         self.canvas_opacity = 0.0  # Default fully transparent
         self.single_draw_mode = False  # New attribute for single draw mode
         
+        # 自由绘制曲线拟合相关属性
+        self.freehand_curve_fitting = True  # 松开鼠标时将笔画拟合为贝塞尔曲线
+        self.freehand_fit_tolerance = FREEHAND_FIT_TOLERANCE
+        self.freehand_keep_raw_points = False  # 拟合后是否保留原始采样点
+        
+        # 消失墨水：提交的形状在 ink_lifetime 毫秒后淡出并自动移除
+        self.disappearing_ink = False
+        self.ink_lifetime = INK_LIFETIME
+        
         # 文本相关属性
         self.text_font_family = "Arial"
         self.text_font_size = 16
@@ -126,6 +136,21 @@ class CanvasProperties(QObject):
         """设置当前绘图不透明度"""
         self.current_opacity = opacity
 
+    def set_freehand_curve_fitting(self, enabled: bool, tolerance: Optional[float] = None,
+                                   keep_raw_points: Optional[bool] = None) -> None:
+        """设置自由绘制的曲线拟合选项"""
+        self.freehand_curve_fitting = enabled
+        if tolerance is not None and tolerance > 0:
+            self.freehand_fit_tolerance = tolerance
+        if keep_raw_points is not None:
+            self.freehand_keep_raw_points = keep_raw_points
+
+    def set_disappearing_ink(self, enabled: bool, lifetime: Optional[int] = None) -> None:
+        """设置消失墨水模式，只影响之后提交的形状"""
+        self.disappearing_ink = enabled
+        if lifetime is not None and lifetime > 0:
+            self.ink_lifetime = lifetime
+
     def set_canvas_color(self, color: Union[QColor, str, List[int]]) -> None:
         """设置画布背景颜色"""
         if isinstance(color, str):
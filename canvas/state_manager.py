@@ -51,6 +51,7 @@ class CanvasStateManager(QObject):
             # 恢复到上一个状态
             previous_serialized_state = self.undo_stack.pop()
             self.canvas.shapes = self._deserialize_shapes(previous_serialized_state)
+            self.canvas.input_mask.reset()
             self.canvas.update()
 
     def redo(self):
@@ -69,10 +70,16 @@ class CanvasStateManager(QObject):
             # 恢复到下一个状态
             next_serialized_state = self.redo_stack.pop()
             self.canvas.shapes = self._deserialize_shapes(next_serialized_state)
+            self.canvas.input_mask.reset()
             self.canvas.update()
 
     def _deserialize_shapes(self, serialized_shapes):
-        """从序列化的形状数据重建形状对象列表"""
+        """从序列化的形状数据重建形状对象列表
+
+        重建的形状会替换整个 canvas.shapes，旧形状的到期和淡出随之作废，
+        先清空消失墨水的记录，再登记恢复的形状。
+        """
+        self.canvas.ink.clear()
         shapes = []
         for shape_data in serialized_shapes:
             # 创建shape_data的副本，避免修改原始数据
@@ -110,6 +117,10 @@ class CanvasStateManager(QObject):
             else:
                 continue  # Skip unknown shape types
             
+            # 消失墨水形状恢复后继续按原到期时间消失
+            if shape_dict.get("expires_at") is not None:
+                self.canvas.ink.track(shape, shape_dict["expires_at"])
+            
             shapes.append(shape)
         return shapes
 
@@ -120,27 +131,67 @@ class CanvasStateManager(QObject):
         
         # 清空画布
         self.canvas.shapes.clear()
+        self.canvas.ink.clear()
+        self.canvas.input_mask.reset()
         self.canvas.update()
 
-    def to_json_data(self):
-        """将画布内容导出为JSON数据"""
+    def to_json_data(self, image_store=None):
+        """将画布内容导出为JSON数据
+
+        Args:
+            image_store: 指定时把图片按内容哈希保存到该存储中，JSON 只记录哈希
+        """
+        return json.dumps(self.export_shapes(image_store), indent=2)
+
+    def export_shapes(self, image_store=None):
+        """把画布上的形状序列化为可导出的字典列表"""
         serialized_shapes = []
         for shape in self.canvas.shapes:
-            serialized_shapes.append(shape.to_dict())
-        return json.dumps(serialized_shapes, indent=2)
+            shape_data = shape.to_dict()
+            # 导出的标注不再消失
+            shape_data.pop("expires_at", None)
+            if image_store is not None and shape_data["type"] == "Image" and shape.image_path:
+                image_hash = image_store.put(shape.image_path)
+                if image_hash:
+                    shape_data["image_hash"] = image_hash
+            serialized_shapes.append(shape_data)
+        return serialized_shapes
 
-    def from_json_data(self, json_data):
-        """从JSON数据导入画布内容"""
+    def from_json_data(self, json_data, image_store=None):
+        """从JSON数据导入画布内容
+
+        Args:
+            image_store: 指定时优先从该存储中按哈希查找图片
+        """
+        try:
+            self.import_shapes(json.loads(json_data), image_store)
+        except (json.JSONDecodeError, KeyError, ValueError) as e:
+            print(f"导入数据时出错: {e}")
+            raise
+
+    def import_shapes(self, serialized_shapes, image_store=None):
+        """用导入的字典列表替换画布内容 - 支持撤销"""
         # 保存当前状态到撤销栈
         self.save_state_to_undo_stack()
         
         # 清空当前画布
         self.canvas.shapes.clear()
+        self.canvas.input_mask.reset()
         
         try:
-            data = json.loads(json_data)
-            self.canvas.shapes = self._deserialize_shapes(data)
+            if image_store is not None:
+                self._resolve_stored_images(serialized_shapes, image_store)
+            self.canvas.shapes = self._deserialize_shapes(serialized_shapes)
+        finally:
             self.canvas.update()
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
-            print(f"导入数据时出错: {e}")
-            raise
+
+    @staticmethod
+    def _resolve_stored_images(serialized_shapes, image_store):
+        """把带有内容哈希的图片路径指向存储中的文件"""
+        for shape_data in serialized_shapes:
+            image_hash = shape_data.get("image_hash")
+            if shape_data.get("type") != "Image" or not image_hash:
+                continue
+            stored_path = image_store.path_for(image_hash, shape_data.get("image_path", ""))
+            if stored_path is not None:
+                shape_data["image_path"] = stored_path
@@ -48,6 +48,7 @@ def load_config():
             "hotkeys": {
                 "toggle_visibility": "<ctrl>+<alt>+h",
                 "toggle_passthrough": "<ctrl>+<alt>+p",
+                "toggle_ink_passthrough": "<ctrl>+<alt>+i",
                 "toggle_canvas_visibility": "<ctrl>+<alt>+v",
                 "toggle_toolbar_collapse": "<ctrl>+<alt>+t",
                 "toggle_complete_hide": "",
@@ -55,6 +56,7 @@ def load_config():
                 "undo": "<ctrl>+z",
                 "redo": "<ctrl>+y",
                 "single_draw_mode": "<ctrl>+<alt>+s",
+                "disappearing_ink": "<ctrl>+<alt>+d",
                 "tool_line": "<ctrl>+1",
                 "tool_rectangle": "<ctrl>+2",
                 "tool_circle": "<ctrl>+3",
@@ -106,6 +108,7 @@ def load_config():
             "hotkeys": {
                 "toggle_visibility": "<ctrl>+<alt>+h",
                 "toggle_passthrough": "<ctrl>+<alt>+p",
+                "toggle_ink_passthrough": "<ctrl>+<alt>+i",
                 "toggle_canvas_visibility": "<ctrl>+<alt>+v",
                 "toggle_toolbar_collapse": "<ctrl>+<alt>+t",
                 "toggle_complete_hide": "",
@@ -113,6 +116,7 @@ def load_config():
                 "undo": "<ctrl>+z",
                 "redo": "<ctrl>+y",
                 "single_draw_mode": "<ctrl>+<alt>+s",
+                "disappearing_ink": "<ctrl>+<alt>+d",
                 "tool_line": "<ctrl>+1",
                 "tool_rectangle": "<ctrl>+2",
                 "tool_circle": "<ctrl>+3",
@@ -36,10 +36,38 @@ TRAY_NOTIFICATION_TIMEOUT = 3000
 
 # 文件过滤器
 JSON_FILE_FILTER = "JSON Files (*.json)"
+JSON_EMBED_IMAGES_FILE_FILTER = "JSON Files with embedded images (*.json)"
 
 # 状态栏消息超时时间（毫秒）
 STATUS_MESSAGE_TIMEOUT = 2000
 STATUS_MESSAGE_TIMEOUT_LONG = 3000
 
 # 定时器间隔
-TOOLBAR_CHECK_INTERVAL = 3000
+IDLE_ENTER_DELAY = 3000  # 穿透模式下无活动多久后进入空闲模式（毫秒）
+TOOLBAR_RESTACK_DELAY = 100  # 窗口激活或对话框关闭后多久置顶工具栏（毫秒），合并连续的事件
+RENDER_IDLE_DELAY = 150  # 拖拽停止多久后以高画质重绘（毫秒）
+
+# 激光笔拖尾
+LASER_TRAIL_DURATION = 500  # 拖尾上每个位置淡出所需时间（毫秒）
+LASER_TRAIL_CAPACITY = 64  # 拖尾最多保留的位置数
+LASER_FRAME_INTERVAL = 16  # 拖尾动画帧间隔（毫秒）
+
+# 消失墨水
+INK_LIFETIME = 5000  # 形状提交后多久开始消失（毫秒）
+INK_FADE_DURATION = 600  # 淡出持续时间（毫秒）
+INK_FADE_FRAME_INTERVAL = 33  # 淡出动画帧间隔（毫秒）
+
+# 自由绘制曲线拟合
+FREEHAND_FIT_TOLERANCE = 2.0  # 拟合曲线允许偏离采样点的最大距离（像素）
+
+# 仅标注处接收鼠标的输入区域
+INPUT_MASK_CELL_SIZE = 32  # 包围矩形对齐到的网格大小（像素）
+INPUT_MASK_MAX_RECTS = 64  # 输入区域最多包含的矩形数，超过时加粗网格
+INPUT_MASK_UPDATE_DELAY = 50  # 画布变化后多久更新输入区域（毫秒），合并连续的变化
+
+# 日志
+LOG_LEVEL = "INFO"  # 默认日志级别，可在 config.json 的 log_level 或环境变量 IMSCREEN_LOG_LEVEL 中修改
+LOG_BUFFER_CAPACITY = 2000  # 内存中保留的最近日志条数
+LOG_RATE_LIMIT_BURST = 10  # 同一调用位置在一个周期内最多输出的条数
+LOG_RATE_LIMIT_INTERVAL = 1.0  # 限流周期（秒）
+LOG_FILE_FILTER = "Log Files (*.log);;Text Files (*.txt)"
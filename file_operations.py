@@ -4,7 +4,8 @@
 """
 from typing import TYPE_CHECKING
 from PyQt5.QtWidgets import QFileDialog
-from constants import JSON_FILE_FILTER, STATUS_MESSAGE_TIMEOUT
+from constants import JSON_FILE_FILTER, JSON_EMBED_IMAGES_FILE_FILTER, STATUS_MESSAGE_TIMEOUT
+from shapes.image_store import ImageStore
 
 if TYPE_CHECKING:
     from main import AnnotationTool
@@ -28,22 +29,26 @@ class FileOperations:
             try:
                 with open(file_name, "r") as f:
                     json_data: str = f.read()
-                self.main_window.canvas.from_json_data(json_data)
+                # 按屏幕导入到对应的画布，内嵌的图片按哈希从同目录的图片存储中查找
+                self.main_window.screen_manager.from_json_data(json_data, ImageStore.beside(file_name))
                 self.main_window._status_bar.showMessage("标注导入成功", STATUS_MESSAGE_TIMEOUT)
             except Exception as e:
                 self.main_window._status_bar.showMessage(f"导入失败: {e}", STATUS_MESSAGE_TIMEOUT)
     
     def export_canvas_content(self) -> None:
         """导出标注内容"""
-        file_name, _ = QFileDialog.getSaveFileName(
+        file_name, selected_filter = QFileDialog.getSaveFileName(
             self.main_window, 
             "导出标注", 
             "", 
-            JSON_FILE_FILTER
+            f"{JSON_FILE_FILTER};;{JSON_EMBED_IMAGES_FILE_FILTER}"
         )
         if file_name:
             try:
-                json_data: str = self.main_window.canvas.to_json_data()
+                # 内嵌图片模式下图片按内容哈希保存到同目录的图片存储，相同图片只保存一份
+                image_store = ImageStore.beside(file_name) if selected_filter == JSON_EMBED_IMAGES_FILE_FILTER else None
+                # 所有屏幕的标注按屏幕分组导出
+                json_data: str = self.main_window.screen_manager.to_json_data(image_store)
                 with open(file_name, "w") as f:
                     f.write(json_data)
                 self.main_window._status_bar.showMessage("标注导出成功", STATUS_MESSAGE_TIMEOUT)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+热键分发基准测试
+把合成的 pynput Key/KeyCode 事件直接送入 HotkeyManager.on_press/on_release，
+测量注册 10/100/1000 个热键时每个事件的耗时，以及从监听线程收到按键
+到主线程执行 _execute_hotkey_callback 的延迟，结果以直方图输出。
+
+全局键盘钩子会处理整个桌面的每一次按键，这里的数字就是本程序给所有按键增加的开销。
+
+用法:
+    python -m hotkey.hotkey_benchmark
+    python -m hotkey.hotkey_benchmark --sizes 10 100 1000 --rounds 5 --output result.json
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+from pynput import keyboard
+from PyQt5.QtCore import QCoreApplication, QTimer
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from hotkey.hotkey_manager import HotkeyManager
+else:
+    from .hotkey_manager import HotkeyManager
+
+# 默认测试的热键数量
+DEFAULT_SIZES = (10, 100, 1000)
+
+# 每个规模重复发送整套事件的轮数
+DEFAULT_ROUNDS = 5
+
+# 两个热键之间的间隔（毫秒），模拟真实按键节奏，避免主线程事件队列堆积影响延迟
+DEFAULT_PRESS_INTERVAL_MS = 1
+
+# 组合热键可用的修饰键（名称 -> 模拟按下时使用的 pynput 按键）
+MODIFIER_KEYS = {
+    'ctrl': keyboard.Key.ctrl_l,
+    'alt': keyboard.Key.alt_l,
+    'shift': keyboard.Key.shift_l,
+}
+
+# 可作为主键的普通字符
+CHAR_KEYS = "abcdefghijklmnopqrstuvwxyz0123456789`-=[]\\;',./"
+
+# 不属于任何热键的按键，模拟正常打字时钩子收到的按键
+UNBOUND_KEYS = (
+    keyboard.Key.space, keyboard.Key.enter, keyboard.Key.backspace, keyboard.Key.tab,
+    keyboard.Key.left, keyboard.Key.right, keyboard.Key.up, keyboard.Key.down,
+)
+
+
+def _step_string(modifiers, main_key):
+    parts = [f"<{name}>" for name in modifiers]
+    parts.append(f"<{main_key}>" if main_key.startswith('f') and main_key[1:].isdigit() else main_key)
+    return "+".join(parts)
+
+
+def _step_events(modifiers, main_key):
+    """单步热键对应的按下/释放事件序列"""
+    if main_key.startswith('f') and main_key[1:].isdigit():
+        key = getattr(keyboard.Key, main_key)
+    else:
+        key = keyboard.KeyCode.from_char(main_key)
+    modifier_keys = [MODIFIER_KEYS[name] for name in modifiers]
+    events = [('press', k) for k in modifier_keys]
+    events.append(('press', key))
+    events.append(('release', key))
+    events.extend(('release', k) for k in reversed(modifier_keys))
+    return events
+
+
+def generate_hotkeys(count):
+    """生成 count 个互不冲突的热键，返回 [(热键字符串, 事件序列)]
+
+    先用完所有单步组合，再以 <ctrl>+<alt>+<shift>+<fN> 为前缀生成两步序列热键，
+    这些前缀本身不会作为单步热键注册。
+    """
+    modifier_sets = [(), ('ctrl',), ('alt',), ('shift',), ('ctrl', 'alt'),
+                     ('ctrl', 'shift'), ('alt', 'shift'), ('ctrl', 'alt', 'shift')]
+    function_keys = [f"f{i}" for i in range(1, 13)]
+    leaders = [(('ctrl', 'alt', 'shift'), key) for key in function_keys]
+
+    candidates = []
+    for modifiers in modifier_sets:
+        for main_key in list(CHAR_KEYS) + function_keys:
+            if (modifiers, main_key) in leaders:
+                continue
+            candidates.append((_step_string(modifiers, main_key), _step_events(modifiers, main_key)))
+    for leader in leaders:
+        for main_key in CHAR_KEYS:
+            hotkey_str = f"{_step_string(*leader)}, {main_key}"
+            candidates.append((hotkey_str, _step_events(*leader) + _step_events((), main_key)))
+
+    if count > len(candidates):
+        raise ValueError(f"最多只能生成 {len(candidates)} 个热键")
+    return candidates[:count]
+
+
+class BenchmarkRun:
+    """单个规模的测试：在工作线程中模拟监听线程发送事件，在主线程中收集回调"""
+
+    def __init__(self, app, count, rounds, press_interval_ms):
+        self.app = app
+        self.count = count
+        self.rounds = rounds
+        self.press_interval = press_interval_ms / 1000.0
+        self.manager = HotkeyManager(None)
+        self.hotkeys = generate_hotkeys(count)
+        self.event_times = []  # 每个 on_press/on_release 调用的耗时（纳秒）
+        self.latencies = []  # 监听线程收到主键到主线程执行回调的延迟（纳秒）
+        self.cpu_time = 0  # 工作线程的总 CPU 时间（纳秒）
+        self.event_count = 0
+        self._sent_at = {}
+        self._expected = count * rounds
+        self._lock = threading.Lock()
+
+        for hotkey_str, _ in self.hotkeys:
+            self.manager.register_hotkey(hotkey_str, self._make_callback(hotkey_str))
+
+    def _make_callback(self, hotkey_str):
+        def callback():
+            received = time.perf_counter_ns()
+            with self._lock:
+                sent = self._sent_at.pop(hotkey_str, None)
+            if sent is not None:
+                self.latencies.append(received - sent)
+            if len(self.latencies) >= self._expected:
+                self.app.quit()
+        return callback
+
+    def _feed(self):
+        """模拟 pynput 监听线程"""
+        manager = self.manager
+        handlers = {'press': manager.on_press, 'release': manager.on_release}
+        cpu_start = time.thread_time_ns()
+        for _ in range(self.rounds):
+            for index, (hotkey_str, events) in enumerate(self.hotkeys):
+                # 热键之间插入一个普通按键，覆盖未命中的路径
+                unbound = UNBOUND_KEYS[index % len(UNBOUND_KEYS)]
+                events = [('press', unbound), ('release', unbound)] + events
+                trigger_index = max(i for i, (kind, _) in enumerate(events) if kind == 'press')
+                for i, (kind, key) in enumerate(events):
+                    start = time.perf_counter_ns()
+                    if i == trigger_index:
+                        with self._lock:
+                            self._sent_at[hotkey_str] = start
+                    handlers[kind](key)
+                    self.event_times.append(time.perf_counter_ns() - start)
+                self.event_count += len(events)
+                if self.press_interval:
+                    time.sleep(self.press_interval)
+        self.cpu_time = time.thread_time_ns() - cpu_start
+
+    def run(self):
+        worker = threading.Thread(target=self._feed, daemon=True)
+        # 安全超时，防止丢失回调时一直等待
+        timeout = QTimer()
+        timeout.setSingleShot(True)
+        timeout.timeout.connect(self.app.quit)
+        timeout.start(int(60_000 + self._expected * (self.press_interval * 1000 + 10)))
+        QTimer.singleShot(0, worker.start)
+        self.app.exec_()
+        timeout.stop()
+        worker.join()
+
+    def summary(self):
+        return {
+            'hotkeys': self.count,
+            'events': self.event_count,
+            'callbacks': len(self.latencies),
+            'expected_callbacks': self._expected,
+            'cpu_ns_per_event': self.cpu_time / self.event_count if self.event_count else 0,
+            'event_ns': percentiles(self.event_times),
+            'latency_ns': percentiles(self.latencies),
+        }
+
+
+def percentiles(samples):
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pick(p):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+    return {'p50': pick(0.50), 'p90': pick(0.90), 'p99': pick(0.99), 'max': ordered[-1]}
+
+
+def format_histogram(title, samples, width=40):
+    """按 2 的幂划分微秒区间的文本直方图"""
+    lines = [title]
+    if not samples:
+        lines.append("  (无数据)")
+        return "\n".join(lines)
+
+    buckets = {}
+    for sample in samples:
+        us = sample / 1000.0
+        bucket = 0
+        while us >= (1 << bucket) and bucket < 30:
+            bucket += 1
+        buckets[bucket] = buckets.get(bucket, 0) + 1
+
+    peak = max(buckets.values())
+    for bucket in range(min(buckets), max(buckets) + 1):
+        n = buckets.get(bucket, 0)
+        low = 0 if bucket == 0 else 1 << (bucket - 1)
+        label = f"{low:>7}-{1 << bucket:<7}us"
+        bar = "#" * (max(1, round(n * width / peak)) if n else 0)
+        lines.append(f"  {label} {n:>8} {bar}")
+    stats = percentiles(samples)
+    lines.append("  " + "  ".join(f"{name}={value / 1000.0:.1f}us" for name, value in stats.items()))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="热键分发基准测试")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="注册的热键数量")
+    parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS, help="每个规模重复的轮数")
+    parser.add_argument('--interval', type=float, default=DEFAULT_PRESS_INTERVAL_MS, help="热键之间的间隔（毫秒）")
+    parser.add_argument('--output', help="把结果摘要写入 JSON 文件，便于跟踪变化")
+    args = parser.parse_args(argv)
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    results = []
+    for size in args.sizes:
+        run = BenchmarkRun(app, size, args.rounds, args.interval)
+        run.run()
+        summary = run.summary()
+        results.append(summary)
+
+        print(f"=== {size} 个热键: {summary['events']} 个事件, "
+              f"回调 {summary['callbacks']}/{summary['expected_callbacks']}, "
+              f"CPU {summary['cpu_ns_per_event'] / 1000.0:.2f}us/事件 ===")
+        print(format_histogram("每个事件的处理耗时:", run.event_times))
+        print(format_histogram("监听线程到主线程回调的延迟:", run.latencies))
+        print()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
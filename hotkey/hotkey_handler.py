@@ -4,11 +4,15 @@
 """
 from typing import TYPE_CHECKING
 from .hotkey_settings import HotkeySettingsDialog
+from .hotkey_manager import HOTKEY_SEQUENCE_TIMEOUT
 from constants import STATUS_MESSAGE_TIMEOUT_LONG
+from app_log import get_logger
 
 if TYPE_CHECKING:
     from main import AnnotationTool
 
+logger = get_logger(__name__)
+
 
 class HotkeyHandler:
     """热键处理器"""
@@ -20,10 +24,25 @@ class HotkeyHandler:
         """设置热键"""
         # 清空现有热键
         if hasattr(self.main_window, 'hotkey_manager') and self.main_window.hotkey_manager:
-            self.main_window.hotkey_manager.hotkeys.clear()
+            self.main_window.hotkey_manager.clear_hotkeys()
         
         hotkeys = self.main_window.config["hotkeys"]
-        print(f"设置热键配置: {hotkeys}")
+        logger.debug("设置热键配置: %s", hotkeys)
+        
+        # 序列热键按下前缀后在状态栏提示，重复调用时避免重复连接
+        manager = self.main_window.hotkey_manager
+        try:
+            manager.sequence_pending.disconnect(self._on_sequence_pending)
+        except TypeError:
+            pass
+        manager.sequence_pending.connect(self._on_sequence_pending)
+        
+        # 热键会立即唤醒空闲模式
+        try:
+            manager.hotkey_triggered.disconnect(self._on_hotkey_triggered)
+        except TypeError:
+            pass
+        manager.hotkey_triggered.connect(self._on_hotkey_triggered)
         
         # 注册基本功能热键
         self._register_basic_hotkeys(hotkeys)
@@ -37,7 +56,7 @@ class HotkeyHandler:
         # 注册标尺功能热键
         self._register_ruler_hotkeys(hotkeys)
         
-        print(f"热键设置完成，共注册 {len(self.main_window.hotkey_manager.hotkeys)} 个热键")
+        logger.info("热键设置完成，共注册 %d 个热键", len(self.main_window.hotkey_manager.hotkeys))
     
     def _register_basic_hotkeys(self, hotkeys: dict) -> None:
         """注册基本功能热键"""
@@ -54,6 +73,12 @@ class HotkeyHandler:
                 self.main_window.transparency_manager.toggle_mouse_passthrough
             )
         
+        if hotkeys.get("toggle_ink_passthrough") and hasattr(self.main_window, 'transparency_manager'):
+            self.main_window.hotkey_manager.register_hotkey(
+                hotkeys["toggle_ink_passthrough"], 
+                self.main_window.transparency_manager.toggle_ink_passthrough
+            )
+        
         if hotkeys.get("toggle_canvas_visibility") and hasattr(self.main_window, 'window_manager'):
             self.main_window.hotkey_manager.register_hotkey(
                 hotkeys["toggle_canvas_visibility"], 
@@ -75,19 +100,19 @@ class HotkeyHandler:
         if hotkeys.get("clear_canvas"):
             self.main_window.hotkey_manager.register_hotkey(
                 hotkeys["clear_canvas"], 
-                self.main_window.canvas.clear_canvas
+                self.main_window.screen_manager.clear_all
             )
         
         if hotkeys.get("undo"):
             self.main_window.hotkey_manager.register_hotkey(
                 hotkeys["undo"], 
-                self.main_window.canvas.undo
+                self.main_window.screen_manager.undo
             )
         
         if hotkeys.get("redo"):
             self.main_window.hotkey_manager.register_hotkey(
                 hotkeys["redo"], 
-                self.main_window.canvas.redo
+                self.main_window.screen_manager.redo
             )
         
         # 单次绘制模式热键需要特殊处理
@@ -97,9 +122,18 @@ class HotkeyHandler:
                 if hasattr(self.main_window.toolbar, 'single_draw_mode_btn') and self.main_window.toolbar.single_draw_mode_btn:
                     self.main_window.toolbar.single_draw_mode_btn.click()
                 else:
-                    print("警告: single_draw_mode_btn 未初始化")
+                    logger.warning("single_draw_mode_btn 未初始化")
             self.main_window.hotkey_manager.register_hotkey(hotkeys["single_draw_mode"], toggle_single_draw)
         
+        # 消失墨水模式热键同样通过按钮切换，保持按钮状态一致
+        if hotkeys.get("disappearing_ink"):
+            def toggle_disappearing_ink():
+                if hasattr(self.main_window.toolbar, 'disappearing_ink_btn') and self.main_window.toolbar.disappearing_ink_btn:
+                    self.main_window.toolbar.disappearing_ink_btn.click()
+                else:
+                    logger.warning("disappearing_ink_btn 未初始化")
+            self.main_window.hotkey_manager.register_hotkey(hotkeys["disappearing_ink"], toggle_disappearing_ink)
+        
         # 注册属性调整热键
         self._register_property_adjustment_hotkeys(hotkeys)
     
@@ -170,11 +204,9 @@ class HotkeyHandler:
                 
                 # 显示状态消息
                 self.main_window._status_bar.showMessage(f"线条粗细: {new_value}", STATUS_MESSAGE_TIMEOUT_LONG)
-                print(f"线条粗细调整为: {new_value}")
-        except Exception as e:
-            print(f"调整线条粗细时出错: {e}")
-            import traceback
-            traceback.print_exc()
+                logger.debug("线条粗细调整为: %d", new_value)
+        except Exception:
+            logger.exception("调整线条粗细时出错")
     
     def _adjust_drawing_opacity(self, increase: bool) -> None:
         """调整绘制不透明度"""
@@ -205,11 +237,9 @@ class HotkeyHandler:
                 
                 # 显示状态消息
                 self.main_window._status_bar.showMessage(f"绘制不透明度: {new_percentage}%", STATUS_MESSAGE_TIMEOUT_LONG)
-                print(f"绘制不透明度调整为: {new_percentage}%")
-        except Exception as e:
-            print(f"调整绘制不透明度时出错: {e}")
-            import traceback
-            traceback.print_exc()
+                logger.debug("绘制不透明度调整为: %d%%", new_percentage)
+        except Exception:
+            logger.exception("调整绘制不透明度时出错")
     
     def _adjust_canvas_opacity(self, increase: bool) -> None:
         """调整画布不透明度"""
@@ -247,11 +277,20 @@ class HotkeyHandler:
                 
                 # 显示状态消息
                 self.main_window._status_bar.showMessage(f"画布不透明度: {new_percentage}%", STATUS_MESSAGE_TIMEOUT_LONG)
-                print(f"画布不透明度调整为: {new_percentage}%")
-        except Exception as e:
-            print(f"调整画布不透明度时出错: {e}")
-            import traceback
-            traceback.print_exc()
+                logger.debug("画布不透明度调整为: %d%%", new_percentage)
+        except Exception:
+            logger.exception("调整画布不透明度时出错")
+    
+    def _on_hotkey_triggered(self, hotkey_str: str, callback) -> None:
+        """热键触发时退出空闲模式"""
+        if hasattr(self.main_window, 'idle_manager'):
+            self.main_window.idle_manager.notify_activity()
+    
+    def _on_sequence_pending(self, prefix: str) -> None:
+        """序列热键的前缀已按下，提示等待下一步"""
+        if hasattr(self.main_window, '_status_bar'):
+            self.main_window._status_bar.showMessage(
+                f"{prefix}, ... 等待下一个按键", int(HOTKEY_SEQUENCE_TIMEOUT * 1000))
     
     def _register_tool_hotkeys(self, hotkeys: dict) -> None:
         """注册工具切换热键"""
@@ -293,7 +332,7 @@ class HotkeyHandler:
     
     def test_hotkey_function(self) -> None:
         """测试热键功能"""
-        print("测试热键被触发!")
+        logger.info("测试热键被触发")
         self.main_window._status_bar.showMessage("热键测试成功！", STATUS_MESSAGE_TIMEOUT_LONG)
     
     def open_hotkey_settings(self) -> None:
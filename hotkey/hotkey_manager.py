@@ -1,18 +1,56 @@
 from pynput import keyboard
+import re
 import threading
+import time
+from app_log import get_logger
 from PyQt5.QtCore import QTimer, QObject, pyqtSignal
 from PyQt5.QtWidgets import QApplication
 
+logger = get_logger(__name__)
+
+# 按键名称缓存的容量上限，正常键盘的按键数远小于此值
+KEY_STRING_CACHE_SIZE = 1024
+
+# 序列热键中各步之间的分隔符（逗号加空白），如 "<ctrl>+k, r"
+HOTKEY_SEQUENCE_SEPARATOR = re.compile(r',\s+')
+
+# 序列热键两步之间允许的最长间隔（秒），超时后重新从第一步开始匹配
+HOTKEY_SEQUENCE_TIMEOUT = 1.5
+
+
+def split_hotkey_sequence(hotkey_str):
+    """把热键字符串拆分为依次按下的各步，如 "<ctrl>+k, r" -> ["<ctrl>+k", "r"]"""
+    return [step.strip() for step in HOTKEY_SEQUENCE_SEPARATOR.split(hotkey_str.strip()) if step.strip()]
+
+
+class _HotkeyNode:
+    """热键前缀树的节点，每条边是一步 (frozenset(修饰键), 主键)"""
+    __slots__ = ('children', 'entry', 'prefix')
+
+    def __init__(self, prefix=""):
+        self.children = {}
+        self.entry = None  # 在此结束的热键 (热键字符串, 回调)
+        self.prefix = prefix  # 到达此节点已按下的步骤，用于提示
+
+
 class HotkeyManager(QObject):
     # 添加信号用于线程间通信
     hotkey_triggered = pyqtSignal(str, object)
+    # 序列热键的前缀已按下，等待下一步时发出，参数为已按下的部分
+    sequence_pending = pyqtSignal(str)
     
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
         self.listener = None
         self.hotkeys = {}
+        self._root = _HotkeyNode()  # 热键前缀树，单步热键就是根节点的直接子节点
+        self._sequence_node = self._root  # 序列热键当前匹配到的位置
+        self._sequence_deadline = 0.0
         self.pressed_keys = set()
+        self._pressed_modifiers = {}  # 当前按下的修饰键 -> 修饰键名称
+        self.current_modifiers = frozenset()
+        self._key_string_cache = {}  # 按键标识 -> 规范化后的字符串
         self.current_combination = set()
         self.last_triggered_hotkey = None  # 防止重复触发
         self.modifier_keys = {
@@ -28,10 +66,49 @@ class HotkeyManager(QObject):
         self.hotkey_triggered.connect(self._execute_hotkey_callback)
 
     def register_hotkey(self, hotkey_str, callback):
-        """注册热键"""
-        if hotkey_str and hotkey_str.strip():
-            self.hotkeys[hotkey_str] = callback
-            print(f"注册热键: {hotkey_str}")
+        """注册热键，同时预先解析并插入前缀树
+
+        支持用 ", " 分隔的序列热键，如 "<ctrl>+k, r"。
+
+        Returns:
+            是否注册成功
+        """
+        if not hotkey_str or not hotkey_str.strip():
+            return False
+        
+        steps = []
+        for step_str in split_hotkey_sequence(hotkey_str):
+            modifiers, main_key = self.parse_hotkey(step_str)
+            if main_key is None:
+                logger.warning("无效的热键: %s", hotkey_str)
+                return False
+            steps.append((frozenset(modifiers), main_key, step_str))
+        if not steps:
+            return False
+        
+        node = self._root
+        for modifiers, main_key, step_str in steps:
+            if node.entry is not None:
+                logger.warning("热键 '%s' 以已注册的热键 '%s' 开头，后者将无法触发", hotkey_str, node.entry[0])
+            child = node.children.get((modifiers, main_key))
+            if child is None:
+                prefix = f"{node.prefix}, {step_str}" if node.prefix else step_str
+                child = _HotkeyNode(prefix)
+                node.children[(modifiers, main_key)] = child
+            node = child
+        if node.children:
+            logger.warning("热键 '%s' 是其他序列热键的前缀，将无法触发", hotkey_str)
+        
+        node.entry = (hotkey_str, callback)
+        self.hotkeys[hotkey_str] = callback
+        logger.debug("注册热键: %s", hotkey_str)
+        return True
+
+    def clear_hotkeys(self):
+        """清除所有已注册的热键"""
+        self.hotkeys.clear()
+        self._root = _HotkeyNode()
+        self._sequence_node = self._root
 
     def parse_hotkey(self, hotkey_str):
         """解析热键字符串，返回需要的修饰键和主键"""
@@ -75,14 +152,26 @@ class HotkeyManager(QObject):
                 main_key = main_key.lower()
             
             return modifiers, main_key
-        except Exception as e:
-            print(f"Error parsing hotkey '{hotkey_str}': {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error parsing hotkey '%s'", hotkey_str)
             return set(), None
 
     def key_to_string(self, key):
-        """将按键转换为字符串"""
+        """将按键转换为字符串，结果按按键标识 (vk/char/name) 缓存"""
+        if isinstance(key, keyboard.KeyCode):
+            identity = ('code', key.vk, key.char)
+        else:
+            identity = ('key', getattr(key, 'name', None) or key)
+        key_str = self._key_string_cache.get(identity)
+        if key_str is None:
+            key_str = self._normalize_key(key)
+            if len(self._key_string_cache) >= KEY_STRING_CACHE_SIZE:
+                self._key_string_cache.clear()
+            self._key_string_cache[identity] = key_str
+        return key_str
+
+    def _normalize_key(self, key):
+        """把 pynput 按键对象规范化为热键字符串中使用的名称"""
         try:
             # 处理修饰键
             if key in self.modifier_keys:
@@ -143,10 +232,8 @@ class HotkeyManager(QObject):
             except:
                 return "unknown_key"
 
-        except Exception as e:
-            print(f"Error converting key to string: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error converting key to string")
             return "error_key"
 
     def check_hotkey_match(self, hotkey_str):
@@ -156,20 +243,12 @@ class HotkeyManager(QObject):
             if main_key is None:
                 return False
             
-            # 获取当前按下的修饰键
-            current_modifiers = set()
-            for key in self.pressed_keys:
-                if key in self.modifier_keys:
-                    current_modifiers.add(self.modifier_keys[key])
-            
             # 检查修饰键是否严格匹配（必须完全相等）
-            modifiers_match = required_modifiers == current_modifiers
+            modifiers_match = required_modifiers == self.current_modifiers
             
             return modifiers_match
-        except Exception as e:
-            print(f"Error in check_hotkey_match: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error in check_hotkey_match")
             return False
     
     def check_main_key_match(self, hotkey_str, pressed_key):
@@ -193,20 +272,16 @@ class HotkeyManager(QObject):
                 match = key_str == main_key
 
             return match
-        except Exception as e:
-            print(f"Error in check_main_key_match: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error in check_main_key_match")
             return False
 
     def _execute_hotkey_callback(self, hotkey_str, callback):
         """在主线程中执行热键回调"""
         try:
             callback()
-        except Exception as e:
-            print(f"✗ 热键回调执行失败: {hotkey_str}, 错误: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("热键回调执行失败: %s", hotkey_str)
 
     def on_press(self, key):
         """按键按下事件"""
@@ -215,78 +290,60 @@ class HotkeyManager(QObject):
             if key not in self.pressed_keys:
                 self.pressed_keys.add(key)
             
-            # 记录按键信息，方便调试
-            key_str = self.key_to_string(key)
-            pressed_str = [self.key_to_string(k) for k in self.pressed_keys if k is not None]
+            # 如果按下的是修饰键，只更新修饰键状态，不需要检查热键
+            modifier = self.modifier_keys.get(key)
+            if modifier is not None:
+                self._pressed_modifiers[key] = modifier
+                self.current_modifiers = frozenset(self._pressed_modifiers.values())
+                return
+            
+            # 沿前缀树走一步，每次按键只需常数次字典查找，与注册的热键数量无关
+            pressed_key_str = self.key_to_string(key)
+            step = (self.current_modifiers, pressed_key_str)
+            root = self._root
+            node = self._sequence_node
+            if node is not root and time.monotonic() > self._sequence_deadline:
+                node = root  # 序列热键超时，重新开始
             
-            # 如果按下的是修饰键，不需要立即检查热键
-            if key in self.modifier_keys:
+            child = node.children.get(step)
+            if child is None and node is not root:
+                # 序列被其他按键打断，把当前按键当作新的第一步
+                child = root.children.get(step)
+            if child is None:
+                self._sequence_node = root
                 return
             
-            # 检查热键匹配 - 只在按下非修饰键时检查
-            # 对每个已注册的热键进行检查
-            for hotkey_str, callback in self.hotkeys.items():
-                try:
-                    required_modifiers, main_key = self.parse_hotkey(hotkey_str)
-                    if main_key is None:
-                        continue
-                    
-                    # 检查主键是否匹配
-                    key_matched = False
-                    pressed_key_str = self.key_to_string(key)
-                    
-                    # 数字键的特殊处理
-                    if main_key.isdigit() and pressed_key_str.isdigit():
-                        key_matched = main_key == pressed_key_str
-                    # 功能键的特殊处理
-                    elif main_key.startswith('f') and main_key[1:].isdigit():
-                        # 处理f1-f12
-                        func_key_name = main_key.lower()
-                        if hasattr(key, 'name') and key.name and key.name.lower() == func_key_name:
-                            key_matched = True
-                        elif pressed_key_str == func_key_name:
-                            key_matched = True
-                    else:
-                        # 其他普通按键
-                        key_matched = main_key == pressed_key_str
-                    
-                    # 检查修饰键是否匹配
-                    current_modifiers = set()
-                    for mod_key in self.pressed_keys:
-                        if mod_key in self.modifier_keys:
-                            current_modifiers.add(self.modifier_keys[mod_key])
-                    
-                    # 修饰键必须完全匹配，而不是子集匹配
-                    modifiers_matched = required_modifiers == current_modifiers
-
-                    # 如果主键和修饰键都匹配，触发回调
-                    if key_matched and modifiers_matched:
-                        # 防止重复触发同一个热键
-                        current_combination = f"{hotkey_str}_{pressed_key_str}"
-                        if self.last_triggered_hotkey != current_combination:
-                            print(f"✓ 热键匹配成功: {hotkey_str}")
-                            self.last_triggered_hotkey = current_combination
-                            
-                            # 使用信号安全地在主线程中执行回调
-                            self.hotkey_triggered.emit(hotkey_str, callback)
-                        else:
-                            print(f"热键重复触发，忽略: {hotkey_str}")
-                except Exception as hotkey_e:
-                    print(f"处理热键 '{hotkey_str}' 时出错: {hotkey_e}")
-                    import traceback
-                    traceback.print_exc()
+            if child.children:
+                # 序列热键的前缀，等待下一步
+                self._sequence_node = child
+                self._sequence_deadline = time.monotonic() + HOTKEY_SEQUENCE_TIMEOUT
+                self.sequence_pending.emit(child.prefix)
+                return
+            
+            self._sequence_node = root
+            hotkey_str, callback = child.entry
+            
+            # 防止重复触发同一个热键
+            current_combination = f"{hotkey_str}_{pressed_key_str}"
+            if self.last_triggered_hotkey != current_combination:
+                logger.debug("热键匹配成功: %s", hotkey_str)
+                self.last_triggered_hotkey = current_combination
+                
+                # 使用信号安全地在主线程中执行回调
+                self.hotkey_triggered.emit(hotkey_str, callback)
+            else:
+                logger.debug("热键重复触发，忽略: %s", hotkey_str)
                     
-        except Exception as e:
-            print(f"Hotkey processing error: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Hotkey processing error")
 
     def on_release(self, key):
         """按键释放事件"""
         try:
             if key in self.pressed_keys:
                 self.pressed_keys.remove(key)
-                key_str = self.key_to_string(key)
+                if self._pressed_modifiers.pop(key, None) is not None:
+                    self.current_modifiers = frozenset(self._pressed_modifiers.values())
                 
                 # 如果释放的是主键（非修饰键），重置最后触发的热键
                 if key not in self.modifier_keys:
@@ -295,10 +352,8 @@ class HotkeyManager(QObject):
                 # 如果所有键都释放了，也重置状态
                 if not self.pressed_keys:
                     self.last_triggered_hotkey = None
-        except Exception as e:
-            print(f"Error in on_release: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error in on_release")
 
     def start_listening(self):
         """开始监听热键"""
@@ -311,10 +366,8 @@ class HotkeyManager(QObject):
                 )
                 self.listener.start()
                 return True
-            except Exception as e:
-                print(f"启动热键监听失败: {e}")
-                import traceback
-                traceback.print_exc()
+            except Exception:
+                logger.exception("启动热键监听失败")
                 return False
         return True
 
@@ -325,8 +378,9 @@ class HotkeyManager(QObject):
                 self.listener.stop()
                 self.listener = None
                 self.pressed_keys.clear()
+                self._pressed_modifiers.clear()
+                self.current_modifiers = frozenset()
+                self._sequence_node = self._root
                 self.last_triggered_hotkey = None
-            except Exception as e:
-                print(f"停止热键监听失败: {e}")
-                import traceback
-                traceback.print_exc()
+            except Exception:
+                logger.exception("停止热键监听失败")
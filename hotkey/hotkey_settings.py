@@ -3,7 +3,7 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                              QMessageBox, QGroupBox, QGridLayout, QSpinBox)
 from PyQt5.QtCore import Qt
 from config import save_config
-from .hotkey_manager import HotkeyManager
+from .hotkey_manager import HotkeyManager, split_hotkey_sequence
 
 class HotkeySettingsDialog(QDialog):
     def __init__(self, main_window, config):
@@ -35,6 +35,7 @@ class HotkeySettingsDialog(QDialog):
         app_hotkeys = [
             ("toggle_visibility", "显示/隐藏窗口"),
             ("toggle_passthrough", "切换鼠标穿透"),
+            ("toggle_ink_passthrough", "仅标注处接收鼠标"),
             ("toggle_canvas_visibility", "显示/隐藏画布"),
             ("toggle_toolbar_collapse", "折叠/展开工具栏"),
             ("toggle_complete_hide", "完全隐藏窗口(可自定义)")
@@ -89,7 +90,8 @@ class HotkeySettingsDialog(QDialog):
             ("clear_canvas", "清空画布"),
             ("undo", "撤销"),
             ("redo", "重做"),
-            ("single_draw_mode", "单次绘制模式")
+            ("single_draw_mode", "单次绘制模式"),
+            ("disappearing_ink", "消失墨水模式")
         ]
         
         for i, (key, label) in enumerate(draw_hotkeys):
@@ -194,7 +196,8 @@ class HotkeySettingsDialog(QDialog):
                            "- 修饰键: <ctrl>, <alt>, <shift>\n"
                            "- 功能键: <f1>, <f2>, ..., <f12>\n"
                            "- 普通键: a, b, c, ..., 1, 2, 3, ...\n"
-                           "- 组合: <ctrl>+<alt>+h, <ctrl>+z, <f1>")
+                           "- 组合: <ctrl>+<alt>+h, <ctrl>+z, <f1>\n"
+                           "- 序列: 用逗号加空格分隔依次按下的各步，如 <ctrl>+k, r")
         info_label.setStyleSheet("QLabel { background-color: #f0f0f0; padding: 10px; border: 1px solid #ccc; }")
         scroll_layout.addWidget(info_label)
         
@@ -235,12 +238,14 @@ class HotkeySettingsDialog(QDialog):
         default_hotkeys = {
             "toggle_visibility": "<ctrl>+<alt>+h",
             "toggle_passthrough": "<ctrl>+<alt>+p",
+            "toggle_ink_passthrough": "<ctrl>+<alt>+i",
             "toggle_canvas_visibility": "<ctrl>+<alt>+v",
             "toggle_toolbar_collapse": "<ctrl>+<alt>+t",
             "clear_canvas": "<ctrl>+<alt>+c",
             "undo": "<ctrl>+z",
             "redo": "<ctrl>+y",
             "single_draw_mode": "<ctrl>+<alt>+s",
+            "disappearing_ink": "<ctrl>+<alt>+d",
             "tool_line": "<ctrl>+1",
             "tool_rectangle": "<ctrl>+2",
             "tool_circle": "<ctrl>+3",
@@ -273,8 +278,16 @@ class HotkeySettingsDialog(QDialog):
         if not hotkey_str.strip():
             return True  # 空热键是允许的
         
+        # 序列热键逐步验证
+        steps = split_hotkey_sequence(hotkey_str)
+        if not steps:
+            return False
+        return all(self._validate_hotkey_step(step) for step in steps)
+    
+    def _validate_hotkey_step(self, step_str):
+        """验证序列热键中单步的格式"""
         # 简单的格式验证
-        parts = hotkey_str.split('+')
+        parts = step_str.split('+')
         valid_modifiers = ['<ctrl>', '<alt>', '<shift>']
         valid_function_keys = [f'<f{i}>' for i in range(1, 13)]
         
@@ -288,6 +301,15 @@ class HotkeySettingsDialog(QDialog):
         
         return True
     
+    @staticmethod
+    def _normalize_sequence(hotkey_str):
+        """把热键规范化为各步 (修饰键集合, 主键) 组成的元组，忽略大小写和修饰键顺序"""
+        steps = []
+        for step in split_hotkey_sequence(hotkey_str):
+            parts = [part.strip().lower() for part in step.split('+')]
+            steps.append((frozenset(parts[:-1]), parts[-1]))
+        return tuple(steps)
+    
     def apply_settings(self):
         """应用设置"""
         new_hotkeys = {}
@@ -311,6 +333,17 @@ class HotkeySettingsDialog(QDialog):
             if hotkey:
                 used_hotkeys[hotkey] = key
         
+        # 检查序列热键的前缀冲突：较短的热键会先触发，较长的永远无法触发
+        sequences = {self._normalize_sequence(hotkey): hotkey for hotkey in used_hotkeys}
+        for sequence, hotkey in sequences.items():
+            for length in range(1, len(sequence)):
+                prefix_hotkey = sequences.get(sequence[:length])
+                if prefix_hotkey is not None:
+                    QMessageBox.warning(self, "热键冲突",
+                                      f"热键 '{prefix_hotkey}' 是序列热键 '{hotkey}' 的开头，"
+                                      f"后者将无法触发。\n请修改其中一个热键。")
+                    return
+        
         # 保存配置
         self.config["hotkeys"] = new_hotkeys
         
@@ -345,14 +378,11 @@ class HotkeySettingsDialog(QDialog):
     def closeEvent(self, event):
         """重写关闭事件以确保工具栏回到最前面"""
         try:
-            # 立即确保工具栏回到最前面，并延迟再次确保
+            # 对话框完全关闭后工具栏回到最前面
             if (hasattr(self, 'main_window') and 
                 self.main_window and 
                 hasattr(self.main_window, 'window_manager')):
-                self.main_window.window_manager.ensure_toolbar_on_top()
-                # 延迟再次确保，给对话框更多时间完全关闭
-                from PyQt5.QtCore import QTimer
-                QTimer.singleShot(300, self.main_window.window_manager.ensure_toolbar_on_top)
+                self.main_window.window_manager.schedule_toolbar_restack(activate=True)
             
             super().closeEvent(event)
         except Exception as e:
@@ -5,7 +5,7 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QSlider, QGroupBox, QGridLayout,
                              QLineEdit, QFileDialog, QMessageBox)
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPixmap
+from PyQt5.QtGui import QImageReader
 from shapes.image import Image
 
 
@@ -144,10 +144,9 @@ class ImageSettingsDialog(QDialog):
             QMessageBox.warning(self, "警告", "请先选择图片文件！")
             return
         
-        # 验证图片文件是否存在且可读
+        # 验证图片文件是否存在且可读（只读取文件头，不解码整张图片）
         try:
-            test_pixmap = QPixmap(self.selected_image_path)
-            if test_pixmap.isNull():
+            if not QImageReader(self.selected_image_path).canRead():
                 QMessageBox.warning(self, "错误", "无法加载选择的图片文件！")
                 return
         except Exception as e:
@@ -7,18 +7,19 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QLabel, QFileDialog, QStatusBar, QMenuBar, QAction, 
                              QSystemTrayIcon, QMenu, QStyle)
 from PyQt5.QtGui import QColor, QIcon, QCloseEvent, QPixmap, QPainter
-from PyQt5.QtCore import Qt, QTimer, QPoint, QEvent
+from PyQt5.QtCore import Qt, QPoint, QEvent
 from canvas import DrawingCanvas
 from config import load_config, save_config
 from file_operations import FileOperations
+from app_log import setup_logging
 
 # 导入模块化组件 - 使用更规范的导入方式
 from hotkey import HotkeyManager, HotkeyHandler, HotkeySettingsDialog
 from manager import (WindowManager, TransparencyManager, ToolManager, 
-                     TrayManager, ConfigManager)
+                     TrayManager, ConfigManager, IdleManager, ScreenManager)
 from toolbar import AnnotationToolbar
 from ruler import RulerManager
-from constants import TOOLBAR_CHECK_INTERVAL, STATUS_MESSAGE_TIMEOUT
+from constants import STATUS_MESSAGE_TIMEOUT
 
 # 显式导入所有必需的模块确保PyInstaller能正确打包
 try:
@@ -70,6 +71,7 @@ class AnnotationTool(QMainWindow):
         self.main_layout.setSpacing(0)
 
         self.config: Dict[str, Any] = load_config()
+        setup_logging(self.config.get("log_level"))
         
         # 初始化管理器
         self.window_manager = WindowManager(self)
@@ -78,6 +80,8 @@ class AnnotationTool(QMainWindow):
         self.tray_manager = TrayManager(self)
         self.file_operations = FileOperations(self)
         self.hotkey_handler = HotkeyHandler(self)
+        self.idle_manager = IdleManager(self)
+        self.screen_manager = ScreenManager(self)
         self.config_manager = ConfigManager(self)
         self.ruler_manager = RulerManager(self)
         
@@ -105,7 +109,6 @@ class AnnotationTool(QMainWindow):
 
         # 工具栏相关属性
         self.toolbar: AnnotationToolbar
-        self.toolbar_timer: QTimer
         
         # 文本对话框状态标志，用于防止焦点抢夺
         self._text_dialog_active: bool = False
@@ -120,6 +123,7 @@ class AnnotationTool(QMainWindow):
         self.window_manager.setup_menubar()
         self.window_manager.setup_window_properties()  # 先设置窗口属性，包括画布
         self.setup_toolbar()  # 然后创建工具栏
+        self.screen_manager.setup()  # 为其他屏幕创建画布窗口
         self.transparency_manager.initialize_transparency_settings()
         self.hotkey_handler.setup_hotkeys()  # 设置热键
         self.hotkey_manager.start_listening()  # 启动热键监听
@@ -133,12 +137,8 @@ class AnnotationTool(QMainWindow):
         # 确保工具栏在主窗口显示后仍然在最前面
         self.window_manager.ensure_toolbar_on_top()
         
-        # 设置定时器定期确保工具栏在最前面
-        self.toolbar_timer = QTimer()
-        self.toolbar_timer.timeout.connect(self.window_manager.ensure_toolbar_on_top)
-        # 只在非穿透模式下启动定时器，避免在穿透模式下抢夺焦点
-        if not getattr(self, 'passthrough_state', False):
-            self.toolbar_timer.start(TOOLBAR_CHECK_INTERVAL)  # 使用更长的检查间隔
+        # 窗口激活和焦点变化时重新置顶工具栏，不再定时轮询
+        self.window_manager.install_restack_triggers()
         
         # 记录最后用户活动时间，用于智能工具栏管理
         self._last_user_activity = 0
@@ -150,6 +150,9 @@ class AnnotationTool(QMainWindow):
         if app:
             app.installEventFilter(self)
         
+        # 穿透模式下无活动时进入空闲模式，停止事件过滤
+        self.idle_manager.notify_activity()
+        
         # 初始化系统托盘
         self.tray_manager.setup_system_tray()
     def setup_toolbar(self) -> None:
@@ -224,6 +227,10 @@ class AnnotationTool(QMainWindow):
         """切换单次绘制模式"""
         self.tool_manager.toggle_single_draw_mode(checked)
 
+    def toggle_disappearing_ink(self, checked: bool) -> None:
+        """切换消失墨水模式"""
+        self.tool_manager.toggle_disappearing_ink(checked)
+
     def toggle_toolbar_collapse(self) -> None:
         """切换工具栏折叠/展开状态"""
         self.toolbar.toggle_toolbar_collapse()
@@ -242,32 +249,15 @@ class AnnotationTool(QMainWindow):
         self.ruler_manager.start_quick_calibration()
 
     def update_canvas_ruler_settings(self, settings: dict) -> None:
-        """更新画布的标尺设置"""
-        self.canvas.ruler_pixel_length = settings.get('pixel_length', 100)
-        self.canvas.ruler_real_length = settings.get('real_length', 10.0)
-        self.canvas.ruler_unit = settings.get('unit', 'cm')
-        
-        # 更新画布中已存在的标尺形状的显示设置
-        from shapes.ruler import LineRuler, CircleRuler
-        for shape in self.canvas.shapes:
-            # 检查是否为直线标尺
-            if isinstance(shape, LineRuler):
-                shape.show_ticks = settings.get('show_ticks', True)
-                shape.tick_interval = settings.get('tick_interval', 1.0)
-            # 检查是否为圆形标尺
-            elif isinstance(shape, CircleRuler):
-                shape.show_diameter_line = settings.get('show_diameter_line', True)
-        
-        # 重新绘制画布以应用新设置
-        self.canvas.update()
+        """更新所有屏幕画布的标尺设置"""
+        for canvas in self.screen_manager.canvases():
+            canvas.apply_ruler_settings(settings)
 
     def closeEvent(self, event: QCloseEvent) -> None:
         """关闭事件处理"""
         # 在退出前自动保存当前配置
         self.save_current_config()
         
-        if hasattr(self, 'toolbar_timer'):
-            self.toolbar_timer.stop()
         if hasattr(self, 'hotkey_manager') and self.hotkey_manager:
             self.hotkey_manager.stop_listening()
         if hasattr(self, 'toolbar'):
@@ -291,8 +281,8 @@ class AnnotationTool(QMainWindow):
             obj.isModal() and 
             obj != self and
             obj != self.toolbar):
-            # 延迟确保工具栏在最前面，等待对话框完全关闭
-            QTimer.singleShot(500, self.ensure_toolbar_on_top)  # 增加延迟到500ms
+            # 对话框关闭后置顶工具栏，等待对话框完全关闭
+            self.window_manager.schedule_toolbar_restack(activate=True)
         
         # 让事件继续正常处理
         return super().eventFilter(obj, event)
@@ -7,11 +7,15 @@ from .transparency_manager import TransparencyManager
 from .tool_manager import ToolManager
 from .tray_manager import TrayManager
 from .config_manager import ConfigManager
+from .idle_manager import IdleManager
+from .screen_manager import ScreenManager
 
 __all__ = [
     'WindowManager',
     'TransparencyManager',
     'ToolManager',
     'TrayManager',
-    'ConfigManager'
+    'ConfigManager',
+    'IdleManager',
+    'ScreenManager'
 ]
@@ -4,7 +4,7 @@
 """
 from typing import TYPE_CHECKING, Dict, Any
 from config import load_config, save_config
-from constants import STATUS_MESSAGE_TIMEOUT
+from constants import STATUS_MESSAGE_TIMEOUT, FREEHAND_FIT_TOLERANCE, INK_LIFETIME
 
 if TYPE_CHECKING:
     from main import AnnotationTool
@@ -26,6 +26,10 @@ class ConfigManager:
         config["current_opacity"] = self.main_window.canvas.properties.current_opacity
         config["canvas_color"] = self.main_window.canvas.properties.canvas_color
         config["canvas_opacity"] = self.main_window.canvas.properties.canvas_opacity
+        config["freehand_curve_fitting"] = self.main_window.canvas.properties.freehand_curve_fitting
+        config["freehand_fit_tolerance"] = self.main_window.canvas.properties.freehand_fit_tolerance
+        config["freehand_keep_raw_points"] = self.main_window.canvas.properties.freehand_keep_raw_points
+        config["ink_lifetime"] = self.main_window.canvas.properties.ink_lifetime
         
         # 保存透明度设置
         if hasattr(self.main_window, 'user_passthrough_opacity'):
@@ -75,6 +79,12 @@ class ConfigManager:
         canvas.set_current_opacity(config["current_opacity"])
         canvas.set_canvas_color(config["canvas_color"])
         canvas.set_canvas_opacity(config["canvas_opacity"])
+        canvas.properties.set_freehand_curve_fitting(
+            config.get("freehand_curve_fitting", True),
+            config.get("freehand_fit_tolerance", FREEHAND_FIT_TOLERANCE),
+            config.get("freehand_keep_raw_points", False)
+        )
+        canvas.properties.set_disappearing_ink(False, config.get("ink_lifetime", INK_LIFETIME))
     
     def _apply_text_config(self, config: Dict[str, Any]) -> None:
         """应用文本配置"""
@@ -0,0 +1,103 @@
+"""
+空闲模式管理模块
+穿透模式下没有动画和用户交互时进入空闲模式，停止所有不必要的唤醒
+"""
+from typing import TYPE_CHECKING
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QTimer, QEvent
+from shapes.image_animation import image_animator
+from app_log import get_logger
+from constants import IDLE_ENTER_DELAY
+
+if TYPE_CHECKING:
+    from main import AnnotationTool
+
+logger = get_logger(__name__)
+
+# 空闲模式下唤醒程序的工具栏事件
+_WAKE_EVENTS = frozenset((QEvent.Enter, QEvent.MouseButtonPress, QEvent.KeyPress,
+                          QEvent.Wheel, QEvent.TabletPress))
+
+
+class IdleManager(QObject):
+    """空闲模式管理器
+
+    空闲模式下移除应用级事件过滤器（它会为每个输入事件记录时间戳），
+    只在工具栏上保留一个过滤器等待用户回来。热键、工具栏输入、
+    应用激活或焦点窗口变化都会立即退出空闲模式。
+
+    进入空闲模式的检查由单次定时器在最后一次活动 IDLE_ENTER_DELAY 后执行，
+    只有在仍有动画播放时才会重新检查，进入空闲后不再有任何定时唤醒。
+    """
+
+    def __init__(self, main_window: 'AnnotationTool'):
+        super().__init__()
+        self.main_window = main_window
+        self.idle = False
+
+        self._check_timer = QTimer(self)
+        self._check_timer.setSingleShot(True)
+        self._check_timer.setInterval(IDLE_ENTER_DELAY)
+        self._check_timer.timeout.connect(self._try_enter_idle)
+
+        app = QApplication.instance()
+        if app:
+            app.applicationStateChanged.connect(lambda state: self.notify_activity())
+            app.focusWindowChanged.connect(lambda window: self.notify_activity())
+
+    def notify_activity(self) -> None:
+        """有用户活动（热键、输入、窗口状态变化），退出空闲模式并重新计时"""
+        if self.idle:
+            self._exit_idle()
+        self._check_timer.start()
+
+    def _can_idle(self) -> bool:
+        """是否满足进入空闲模式的条件"""
+        if not getattr(self.main_window, 'passthrough_state', False):
+            return False
+        app = QApplication.instance()
+        if app and (app.activeModalWidget() is not None or app.activePopupWidget() is not None):
+            return False
+        return not self._has_animations()
+
+    def _has_animations(self) -> bool:
+        if image_animator.is_playing():
+            return True
+        return any(canvas.laser.is_active() or canvas.ink.is_fading()
+                   for canvas in self.main_window.screen_manager.canvases())
+
+    def _try_enter_idle(self) -> None:
+        if self.idle:
+            return
+        if self._can_idle():
+            self._enter_idle()
+        elif getattr(self.main_window, 'passthrough_state', False) and self._has_animations():
+            # 动画本身就在唤醒程序，等它们结束后再检查
+            self._check_timer.start()
+        # 其他情况（非穿透模式、对话框打开）由穿透切换或焦点变化重新触发检查
+
+    def _enter_idle(self) -> None:
+        self.idle = True
+        app = QApplication.instance()
+        if app:
+            app.removeEventFilter(self.main_window)
+        toolbar = getattr(self.main_window, 'toolbar', None)
+        if toolbar:
+            toolbar.installEventFilter(self)
+        logger.debug("进入空闲模式")
+
+    def _exit_idle(self) -> None:
+        self.idle = False
+        toolbar = getattr(self.main_window, 'toolbar', None)
+        if toolbar:
+            toolbar.removeEventFilter(self)
+        app = QApplication.instance()
+        if app:
+            app.installEventFilter(self.main_window)
+        logger.debug("退出空闲模式")
+
+    def eventFilter(self, obj, event) -> bool:
+        """空闲模式下工具栏收到输入时立即恢复"""
+        if self.idle and event.type() in _WAKE_EVENTS:
+            self.notify_activity()
+        return False
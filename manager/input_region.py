@@ -0,0 +1,170 @@
+"""
+窗口输入区域模块
+不重建原生窗口地设置顶层窗口接收鼠标输入的区域
+
+- X11：通过 XShape 扩展设置窗口的输入形状（ShapeInput），绘制不受影响
+- Windows：切换扩展样式 WS_EX_TRANSPARENT，只支持整窗穿透
+- 其他平台没有原生实现，调用方回退到 Qt.WindowTransparentForInput
+"""
+import ctypes
+import ctypes.util
+import sys
+from typing import Optional
+from PyQt5.QtGui import QGuiApplication, QRegion
+from app_log import get_logger
+
+logger = get_logger(__name__)
+
+
+class _XRectangle(ctypes.Structure):
+    _fields_ = [("x", ctypes.c_short), ("y", ctypes.c_short),
+                ("width", ctypes.c_ushort), ("height", ctypes.c_ushort)]
+
+
+class _X11Backend:
+    """XShape 输入形状，支持任意矩形集合"""
+
+    supports_partial = True
+
+    SHAPE_SET = 0
+    SHAPE_INPUT = 2
+    UNSORTED = 0
+
+    def __init__(self):
+        xlib_path = ctypes.util.find_library("X11")
+        xext_path = ctypes.util.find_library("Xext")
+        if not xlib_path or not xext_path:
+            raise OSError("找不到 libX11/libXext")
+        self._xlib = ctypes.CDLL(xlib_path)
+        self._xext = ctypes.CDLL(xext_path)
+        self._xlib.XOpenDisplay.restype = ctypes.c_void_p
+        self._xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        self._xlib.XFlush.argtypes = [ctypes.c_void_p]
+        self._xext.XShapeQueryExtension.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
+        self._xext.XShapeCombineRectangles.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+            ctypes.POINTER(_XRectangle), ctypes.c_int, ctypes.c_int, ctypes.c_int]
+        self._xext.XShapeCombineMask.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+            ctypes.c_ulong, ctypes.c_int]
+
+        # 单独的显示连接；窗口是服务器端资源，可以跨连接修改
+        self._display = self._xlib.XOpenDisplay(None)
+        if not self._display:
+            raise OSError("无法连接 X 服务器")
+        event_base, error_base = ctypes.c_int(), ctypes.c_int()
+        if not self._xext.XShapeQueryExtension(self._display, ctypes.byref(event_base), ctypes.byref(error_base)):
+            raise OSError("X 服务器不支持 XShape 扩展")
+
+    def apply(self, window_id: int, region: Optional[QRegion], scale: float) -> None:
+        if region is None:
+            # 清除输入形状，恢复为整个窗口
+            self._xext.XShapeCombineMask(self._display, window_id, self.SHAPE_INPUT, 0, 0, 0, self.SHAPE_SET)
+        else:
+            rects = region.rects()
+            array = (_XRectangle * max(1, len(rects)))()
+            for i, rect in enumerate(rects):
+                array[i] = _XRectangle(int(rect.x() * scale), int(rect.y() * scale),
+                                       int(round(rect.width() * scale)), int(round(rect.height() * scale)))
+            self._xext.XShapeCombineRectangles(self._display, window_id, self.SHAPE_INPUT, 0, 0,
+                                               array, len(rects), self.SHAPE_SET, self.UNSORTED)
+        self._xlib.XFlush(self._display)
+
+
+class _WindowsBackend:
+    """WS_EX_TRANSPARENT 扩展样式，只能整窗穿透"""
+
+    supports_partial = False
+
+    GWL_EXSTYLE = -20
+    WS_EX_TRANSPARENT = 0x00000020
+    WS_EX_LAYERED = 0x00080000
+    SWP_FLAGS = 0x0001 | 0x0002 | 0x0004 | 0x0010 | 0x0020  # NOSIZE|NOMOVE|NOZORDER|NOACTIVATE|FRAMECHANGED
+
+    def __init__(self):
+        user32 = ctypes.windll.user32
+        if ctypes.sizeof(ctypes.c_void_p) == 8:
+            self._get_style = user32.GetWindowLongPtrW
+            self._set_style = user32.SetWindowLongPtrW
+        else:
+            self._get_style = user32.GetWindowLongW
+            self._set_style = user32.SetWindowLongW
+        self._get_style.restype = ctypes.c_ssize_t
+        self._get_style.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        self._set_style.restype = ctypes.c_ssize_t
+        self._set_style.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_ssize_t]
+        self._set_window_pos = user32.SetWindowPos
+
+    def apply(self, window_id: int, region: Optional[QRegion], scale: float) -> None:
+        hwnd = ctypes.c_void_p(window_id)
+        style = self._get_style(hwnd, self.GWL_EXSTYLE)
+        if region is None:
+            style &= ~self.WS_EX_TRANSPARENT
+        else:
+            style |= self.WS_EX_TRANSPARENT | self.WS_EX_LAYERED
+        self._set_style(hwnd, self.GWL_EXSTYLE, style)
+        self._set_window_pos(hwnd, None, 0, 0, 0, 0, self.SWP_FLAGS)
+
+
+_backend = None
+_backend_checked = False
+
+
+def _get_backend():
+    """按平台创建共享的原生实现，不可用时返回 None"""
+    global _backend, _backend_checked
+    if not _backend_checked:
+        _backend_checked = True
+        try:
+            if sys.platform == "win32":
+                _backend = _WindowsBackend()
+            elif QGuiApplication.platformName() == "xcb":
+                _backend = _X11Backend()
+        except (OSError, AttributeError) as e:
+            logger.warning("原生输入区域不可用，回退到窗口标志: %s", e)
+            _backend = None
+    return _backend
+
+
+class InputRegion:
+    """顶层窗口接收鼠标输入的区域，修改时不重建原生窗口"""
+
+    def __init__(self, widget):
+        self.widget = widget
+
+    @property
+    def supported(self) -> bool:
+        """当前平台能否不重建窗口地切换整窗穿透"""
+        return _get_backend() is not None
+
+    @property
+    def supports_partial(self) -> bool:
+        """当前平台能否只在部分区域接收输入"""
+        backend = _get_backend()
+        return backend is not None and backend.supports_partial
+
+    def set_region(self, region: Optional[QRegion]) -> bool:
+        """设置接收输入的区域（窗口坐标）
+
+        Args:
+            region: None 表示整个窗口接收输入，空区域表示完全穿透
+
+        Returns:
+            是否已通过原生方式应用；返回 False 时调用方需要自行回退
+        """
+        backend = _get_backend()
+        if backend is None:
+            return False
+        if region is not None and not region.isEmpty() and not backend.supports_partial:
+            return False
+        try:
+            backend.apply(int(self.widget.winId()), region, self.widget.devicePixelRatioF())
+        except Exception:
+            logger.exception("设置窗口输入区域失败")
+            return False
+        return True
+
+    def set_passthrough(self, enabled: bool) -> bool:
+        """整窗穿透或恢复接收输入"""
+        return self.set_region(QRegion() if enabled else None)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+鼠标穿透切换基准测试
+在一个与主窗口相同的无边框透明置顶窗口上反复切换鼠标穿透，分别测量
+原生输入区域（InputRegion）和 Qt.WindowTransparentForInput 窗口标志两种方式的耗时。
+
+每次切换记录两个数字：调用本身的耗时，以及调用后处理完待处理事件的耗时
+（修改窗口标志会重建原生窗口，大部分代价在随后的事件处理中）。
+
+用法:
+    python -m manager.input_region_bench
+    xvfb-run -a python -m manager.input_region_bench --toggles 200 --output result.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from PyQt5.QtWidgets import QApplication, QWidget
+from PyQt5.QtCore import Qt
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from manager.input_region import InputRegion
+else:
+    from .input_region import InputRegion
+
+# 每种方式切换的次数（开和关各算一次）
+DEFAULT_TOGGLES = 100
+
+
+def percentiles(samples):
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pick(p):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+    return {'p50': pick(0.50), 'p90': pick(0.90), 'p99': pick(0.99), 'max': ordered[-1]}
+
+
+def _create_overlay(app):
+    """创建与主窗口相同设置的覆盖窗口"""
+    widget = QWidget(None, Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
+    widget.setAttribute(Qt.WA_TranslucentBackground)
+    screen = app.primaryScreen()
+    if screen is not None:
+        widget.setGeometry(screen.geometry())
+    widget.show()
+    app.processEvents()
+    return widget
+
+
+def _toggle_input_region(widget, region, enabled):
+    return region.set_passthrough(enabled)
+
+
+def _toggle_window_flags(widget, region, enabled):
+    flags = widget.windowFlags()
+    if enabled:
+        flags |= Qt.WindowTransparentForInput
+    else:
+        flags &= ~Qt.WindowTransparentForInput
+    widget.setWindowFlags(flags)
+    widget.show()
+    return True
+
+
+METHODS = (
+    ('input_region', "原生输入区域", _toggle_input_region),
+    ('window_flags', "窗口标志", _toggle_window_flags),
+)
+
+
+def run_method(app, toggle, toggles):
+    """在新的覆盖窗口上切换 toggles 次，返回 (调用耗时, 含事件处理的耗时)，单位毫秒"""
+    widget = _create_overlay(app)
+    region = InputRegion(widget)
+    call_times = []
+    settle_times = []
+    try:
+        for i in range(toggles):
+            enabled = i % 2 == 0
+            start = time.perf_counter()
+            if not toggle(widget, region, enabled):
+                return None
+            called = time.perf_counter()
+            app.processEvents()
+            settled = time.perf_counter()
+            call_times.append((called - start) * 1000)
+            settle_times.append((settled - start) * 1000)
+    finally:
+        region.set_passthrough(False)
+        widget.close()
+        app.processEvents()
+    return call_times, settle_times
+
+
+def _format_stats(samples):
+    return "  ".join(f"{name}={value:.3f}ms" for name, value in percentiles(samples).items())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="鼠标穿透切换基准测试")
+    parser.add_argument('--toggles', type=int, default=DEFAULT_TOGGLES, help="每种方式切换的次数")
+    parser.add_argument('--output', help="把结果摘要写入 JSON 文件，便于跟踪变化")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"平台: {app.platformName()}, 切换 {args.toggles} 次")
+    results = {'platform': app.platformName(), 'toggles': args.toggles}
+    for key, title, toggle in METHODS:
+        measured = run_method(app, toggle, args.toggles)
+        if measured is None:
+            print(f"=== {title}: 当前平台不支持 ===")
+            results[key] = None
+            continue
+        call_times, settle_times = measured
+        print(f"=== {title} ===")
+        print(f"  调用:         {_format_stats(call_times)}")
+        print(f"  含事件处理:   {_format_stats(settle_times)}")
+        results[key] = {'call_ms': percentiles(call_times), 'settle_ms': percentiles(settle_times)}
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
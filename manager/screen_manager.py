@@ -0,0 +1,250 @@
+"""
+多屏幕管理模块
+为主窗口以外的每个屏幕创建一个轻量的画布窗口
+"""
+import json
+from typing import TYPE_CHECKING, Dict, List
+from PyQt5.QtWidgets import QApplication, QWidget
+from PyQt5.QtCore import QObject, QEvent, Qt
+from canvas import DrawingCanvas
+from shapes.image_animation import image_animator
+from app_log import get_logger
+from .input_region import InputRegion
+
+if TYPE_CHECKING:
+    from main import AnnotationTool
+
+logger = get_logger(__name__)
+
+
+class ScreenCanvasWindow(QWidget):
+    """覆盖单个屏幕的透明画布窗口
+
+    每个窗口只覆盖自己的屏幕，拥有独立的绘制缓存并使用该屏幕的设备像素比；
+    画布属性（工具、颜色等）与主画布共享同一个对象。
+    """
+
+    def __init__(self, screen, main_window: 'AnnotationTool'):
+        super().__init__(None, Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setContentsMargins(0, 0, 0, 0)
+        self.screen_ref = screen
+        # 标尺管理器等应用级对象通过主窗口查找
+        self.main_window = main_window
+        self.canvas = DrawingCanvas(self)
+        self.canvas.properties = main_window.canvas.properties
+        self.canvas.apply_ruler_settings(main_window.ruler_manager.get_ruler_settings())
+        self.input_region = InputRegion(self)
+        self.fit_to_screen()
+
+    def fit_to_screen(self) -> None:
+        """窗口和画布与屏幕几何保持一致"""
+        geometry = self.screen_ref.geometry()
+        # 先创建原生窗口并指定屏幕，保证使用该屏幕的设备像素比
+        self.winId()
+        if self.windowHandle():
+            self.windowHandle().setScreen(self.screen_ref)
+        self.setGeometry(geometry)
+        self.setFixedSize(geometry.size())
+        self.canvas.setGeometry(0, 0, geometry.width(), geometry.height())
+        self.canvas.setFixedSize(geometry.size())
+
+
+class ScreenManager(QObject):
+    """多屏幕管理器
+
+    主窗口覆盖它所在的屏幕，其余每个屏幕各有一个 ScreenCanvasWindow。
+    形状按屏幕划分，每块画布只保存自己屏幕上的形状（画布坐标），
+    避免一个跨越整个虚拟桌面的大窗口在每次完整重绘时绘制所有屏幕。
+    撤销/重做作用于最近操作过的画布，清空作用于所有画布。
+    屏幕移除时，其上的形状合并到主画布。
+
+    导出的 JSON 为 {"screens": {屏幕名称: [形状, ...]}}；导入时找不到对应屏幕的
+    形状放到主画布，旧版导出的形状列表也导入到主画布。
+    """
+
+    def __init__(self, main_window: 'AnnotationTool'):
+        super().__init__()
+        self.main_window = main_window
+        self.windows: Dict[object, ScreenCanvasWindow] = {}  # QScreen -> 画布窗口
+        self.active_canvas = main_window.canvas
+        self.ink_passthrough = False  # “仅标注处接收鼠标”模式是否开启
+
+    def setup(self) -> None:
+        """为其他屏幕创建画布窗口并开始响应屏幕变化"""
+        app = QApplication.instance()
+        if not app:
+            return
+        main_canvas = self.main_window.canvas
+        main_canvas.installEventFilter(self)
+        main_canvas.appearance_changed.connect(self._on_appearance_changed)
+        self.main_window.installEventFilter(self)
+        image_animator.frame_changed.connect(self._on_image_frame_changed)
+
+        for screen in app.screens():
+            self._add_screen(screen)
+        app.screenAdded.connect(self._add_screen)
+        app.screenRemoved.connect(self._remove_screen)
+
+    def canvases(self) -> List[DrawingCanvas]:
+        """所有屏幕的画布，主画布在前"""
+        return [self.main_window.canvas] + [window.canvas for window in self.windows.values()]
+
+    def canvases_by_screen(self) -> Dict[str, DrawingCanvas]:
+        """屏幕名称 -> 该屏幕的画布"""
+        main_screen = self._main_screen()
+        result = {main_screen.name() if main_screen else "": self.main_window.canvas}
+        for screen, window in self.windows.items():
+            result[screen.name()] = window.canvas
+        return result
+
+    def to_json_data(self, image_store=None) -> str:
+        """把所有屏幕的形状按屏幕导出为JSON数据"""
+        screens = {name: canvas.state_manager.export_shapes(image_store)
+                   for name, canvas in self.canvases_by_screen().items()}
+        return json.dumps({"screens": screens}, indent=2)
+
+    def from_json_data(self, json_data: str, image_store=None) -> None:
+        """导入JSON数据，替换所有屏幕的画布内容"""
+        data = json.loads(json_data)
+        canvases = self.canvases_by_screen()
+        main_canvas = self.main_window.canvas
+        partitions = {canvas: [] for canvas in canvases.values()}
+        if isinstance(data, list):
+            # 旧版导出：单个画布的形状列表
+            partitions[main_canvas].extend(data)
+        elif isinstance(data, dict) and isinstance(data.get("screens"), dict):
+            for name, shapes in data["screens"].items():
+                canvas = canvases.get(name, main_canvas)
+                if canvas is main_canvas and name not in canvases:
+                    logger.info("导入的屏幕 %s 不存在，%d 个形状放到主画布", name, len(shapes))
+                partitions[canvas].extend(shapes)
+        else:
+            raise ValueError("无法识别的标注文件格式")
+        for canvas, shapes in partitions.items():
+            canvas.state_manager.import_shapes(shapes, image_store)
+
+    def undo(self) -> None:
+        """撤销最近操作过的画布"""
+        self.active_canvas.undo()
+
+    def redo(self) -> None:
+        """重做最近操作过的画布"""
+        self.active_canvas.redo()
+
+    def clear_all(self) -> None:
+        """清空所有屏幕的画布"""
+        for canvas in self.canvases():
+            canvas.clear_canvas()
+
+    def apply_passthrough(self, enabled: bool) -> None:
+        """把鼠标穿透状态同步到其他屏幕的画布窗口"""
+        for window in self.windows.values():
+            self._apply_window_passthrough(window, enabled)
+
+    def set_ink_passthrough(self, enabled: bool) -> None:
+        """在其他屏幕上开启或关闭“仅标注处接收鼠标”模式"""
+        self.ink_passthrough = enabled
+        for window in self.windows.values():
+            self._apply_window_ink_passthrough(window, enabled)
+
+    @staticmethod
+    def _apply_window_ink_passthrough(window: ScreenCanvasWindow, enabled: bool) -> None:
+        if enabled:
+            window.canvas.input_mask.enable(window.input_region.set_region)
+        elif window.canvas.input_mask.enabled:
+            window.canvas.input_mask.disable()
+            window.input_region.set_region(None)
+
+    def _apply_window_passthrough(self, window: ScreenCanvasWindow, enabled: bool) -> None:
+        if window.input_region.set_passthrough(enabled):
+            return
+        flags = window.windowFlags()
+        if enabled:
+            flags |= Qt.WindowTransparentForInput
+        else:
+            flags &= ~Qt.WindowTransparentForInput
+        visible = window.isVisible()
+        window.setWindowFlags(flags)
+        if visible:
+            window.show()
+
+    def _main_screen(self):
+        handle = self.main_window.windowHandle()
+        screen = handle.screen() if handle else None
+        return screen or QApplication.primaryScreen()
+
+    def _add_screen(self, screen) -> None:
+        if screen in self.windows or screen is self._main_screen():
+            return
+        window = ScreenCanvasWindow(screen, self.main_window)
+        window.canvas.installEventFilter(self)
+        window.installEventFilter(self)
+        window.canvas.setVisible(self.main_window.canvas.isVisible())
+        screen.geometryChanged.connect(lambda geometry, w=window: w.fit_to_screen())
+        self.windows[screen] = window
+        # 画布窗口同样置顶，显示或激活后需要把工具栏重新放到它上面
+        self.main_window.window_manager.register_canvas_window(window)
+        if getattr(self.main_window, 'passthrough_state', False):
+            self._apply_window_passthrough(window, True)
+        elif self.ink_passthrough:
+            self._apply_window_ink_passthrough(window, True)
+        if self.main_window.isVisible():
+            window.show()
+        logger.info("为屏幕 %s 创建画布窗口: %s", screen.name(), screen.geometry())
+
+    def _remove_screen(self, screen) -> None:
+        window = self.windows.pop(screen, None)
+        if window is not None:
+            self._merge_into_main(window)
+        # 主窗口所在的屏幕被移除后，窗口系统会把它移到另一个屏幕，
+        # 那个屏幕原有的画布窗口合并进主窗口，主窗口改为覆盖该屏幕
+        main_screen = self._main_screen()
+        window = self.windows.pop(main_screen, None)
+        if window is not None:
+            self._merge_into_main(window)
+        if main_screen is not None:
+            self.main_window.window_manager.fit_to_geometry(main_screen.geometry())
+
+    def _merge_into_main(self, window: ScreenCanvasWindow) -> None:
+        """把画布窗口上的形状移到主画布并关闭窗口"""
+        main_canvas = self.main_window.canvas
+        if window.canvas.shapes:
+            main_canvas.state_manager.save_state_to_undo_stack()
+            main_canvas.shapes.extend(window.canvas.shapes)
+            main_canvas.input_mask.reset()
+            main_canvas.update()
+            logger.info("屏幕已移除，%d 个形状移到主画布", len(window.canvas.shapes))
+        window.canvas.ink.clear()
+        if self.active_canvas is window.canvas:
+            self.active_canvas = main_canvas
+        self.main_window.window_manager.unregister_canvas_window(window)
+        window.close()
+        window.deleteLater()
+
+    def _on_image_frame_changed(self, source_key) -> None:
+        """所有屏幕上都没有引用该动画的图片（被删除或撤销）时停止播放"""
+        if not any(canvas.references_animation(source_key) for canvas in self.canvases()):
+            image_animator.release(source_key)
+
+    def _on_appearance_changed(self) -> None:
+        """画布背景颜色或透明度变化后重绘其他屏幕"""
+        for window in self.windows.values():
+            window.canvas.update()
+
+    def eventFilter(self, obj, event) -> bool:
+        event_type = event.type()
+        if event_type == QEvent.MouseButtonPress and isinstance(obj, DrawingCanvas):
+            self.active_canvas = obj
+        elif isinstance(obj, ScreenCanvasWindow) and event_type in (QEvent.Show, QEvent.WindowActivate):
+            # 工具栏可能在这个屏幕上，画布窗口显示或激活后重新置顶工具栏
+            self.main_window.window_manager.schedule_toolbar_restack()
+        elif obj is self.main_window and event_type in (QEvent.Show, QEvent.Hide):
+            # 主窗口显示/隐藏时同步其他屏幕
+            for window in self.windows.values():
+                window.setVisible(event_type == QEvent.Show)
+        elif obj is self.main_window.canvas and event_type in (QEvent.Show, QEvent.Hide):
+            # 画布显示/隐藏时同步其他屏幕
+            for window in self.windows.values():
+                window.canvas.setVisible(event_type == QEvent.Show)
+        return False
@@ -4,10 +4,13 @@
 """
 from typing import TYPE_CHECKING
 from constants import TOOL_NAMES, STATUS_MESSAGE_TIMEOUT
+from app_log import get_logger
 
 if TYPE_CHECKING:
     from main import AnnotationTool
 
+logger = get_logger(__name__)
+
 
 class ToolManager:
     """工具管理器"""
@@ -20,7 +23,7 @@ class ToolManager:
         
         # 检查工具名称是否有效
         if not tool:
-            print("错误: 工具名称为空")
+            logger.error("工具名称为空")
             return
         
         # 取消所有工具按钮的选中状态
@@ -41,7 +44,7 @@ class ToolManager:
             # 强制更新画布
             self.main_window.canvas.update()
         else:
-            print(f"错误: 找不到工具 '{tool}' 对应的按钮")
+            logger.error("找不到工具 '%s' 对应的按钮", tool)
     
     def toggle_single_draw_mode(self, checked: bool) -> None:
         """切换单次绘制模式"""
@@ -49,7 +52,7 @@ class ToolManager:
         
         # 检查按钮是否存在
         if not self.main_window.toolbar.single_draw_mode_btn:
-            print("警告: single_draw_mode_btn 未初始化")
+            logger.warning("single_draw_mode_btn 未初始化")
             return
             
         if checked:
@@ -65,6 +68,28 @@ class ToolManager:
             button_style.unpolish(self.main_window.toolbar.single_draw_mode_btn)
             button_style.polish(self.main_window.toolbar.single_draw_mode_btn)
     
+    def toggle_disappearing_ink(self, checked: bool) -> None:
+        """切换消失墨水模式"""
+        self.main_window.canvas.properties.set_disappearing_ink(checked)
+        
+        # 检查按钮是否存在
+        if not self.main_window.toolbar.disappearing_ink_btn:
+            logger.warning("disappearing_ink_btn 未初始化")
+            return
+            
+        if checked:
+            self.main_window.toolbar.disappearing_ink_btn.setProperty("class", "action active")
+            self.main_window._status_bar.showMessage("已开启消失墨水模式", STATUS_MESSAGE_TIMEOUT)
+        else:
+            self.main_window.toolbar.disappearing_ink_btn.setProperty("class", "action")
+            self.main_window._status_bar.showMessage("已关闭消失墨水模式", STATUS_MESSAGE_TIMEOUT)
+        
+        # 刷新按钮样式
+        button_style = self.main_window.toolbar.disappearing_ink_btn.style()
+        if button_style:
+            button_style.unpolish(self.main_window.toolbar.disappearing_ink_btn)
+            button_style.polish(self.main_window.toolbar.disappearing_ink_btn)
+    
     def add_tool_hotkey(self, hotkey_str: str, tool_name: str) -> None:
         """添加工具切换热键"""
         # 为了避免闭包问题，创建一个副本
@@ -72,16 +97,12 @@ class ToolManager:
         
         def tool_callback() -> None:
             # 确保工具名称正确传递
-            print(f"触发工具热键：{hotkey_str} -> {tool_name_copy}")
+            logger.debug("触发工具热键：%s -> %s", hotkey_str, tool_name_copy)
             
             # 直接在回调中调用select_tool，而不是使用QTimer
             try:
-                print(f"工具热键回调正在执行，切换到工具: {tool_name_copy}")
                 self.select_tool(tool_name_copy)
-                print(f"工具热键回调执行完毕")
-            except Exception as e:
-                print(f"工具热键回调执行出错: {e}")
-                import traceback
-                traceback.print_exc()
+            except Exception:
+                logger.exception("工具热键回调执行出错: %s", tool_name_copy)
         
         self.main_window.hotkey_manager.register_hotkey(hotkey_str, tool_callback)
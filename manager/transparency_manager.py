@@ -1,19 +1,26 @@
 """
 透明度和穿透模式管理模块
 """
+import time
 from typing import TYPE_CHECKING
 from PyQt5.QtCore import Qt
-from constants import STATUS_MESSAGE_TIMEOUT, TOOLBAR_CHECK_INTERVAL
+from constants import STATUS_MESSAGE_TIMEOUT
+from app_log import get_logger
+from .input_region import InputRegion
 
 if TYPE_CHECKING:
     from main import AnnotationTool
 
+logger = get_logger(__name__)
+
 
 class TransparencyManager:
     """透明度管理器"""
     
     def __init__(self, main_window: 'AnnotationTool'):
         self.main_window = main_window
+        self.input_region = InputRegion(main_window)
+        self.last_toggle_latency_ms = 0.0  # 最近一次切换穿透的耗时
     
     def initialize_transparency_settings(self) -> None:
         """初始化透明度设置"""
@@ -30,7 +37,8 @@ class TransparencyManager:
 
         # 设置初始透明度
         if self.main_window.passthrough_state:
-            self.main_window.setWindowFlags(self.main_window.windowFlags() | Qt.WindowTransparentForInput)
+            if not self.input_region.set_passthrough(True):
+                self.main_window.setWindowFlags(self.main_window.windowFlags() | Qt.WindowTransparentForInput)
             if self.main_window.canvas.properties.canvas_opacity != self.main_window.user_passthrough_opacity:
                 self.main_window.canvas.set_canvas_opacity(self.main_window.user_passthrough_opacity)
             if self.main_window.toolbar.toggle_passthrough_btn:
@@ -50,11 +58,14 @@ class TransparencyManager:
     
     def toggle_mouse_passthrough(self) -> None:
         """切换鼠标穿透模式"""
-        current_flags = self.main_window.windowFlags()
+        # 整窗穿透和“仅标注处接收鼠标”互斥
+        if self.main_window.canvas.input_mask.enabled:
+            self.main_window.canvas.input_mask.disable()
+            self.main_window.screen_manager.set_ink_passthrough(False)
+        
         if self.main_window.passthrough_state:
             # Currently in pass-through mode, switch to non-pass-through
-            new_flags = current_flags & ~Qt.WindowTransparentForInput
-            self.main_window.setWindowFlags(new_flags)
+            self._apply_passthrough(False)
             self.main_window.passthrough_state = False
             # 使用用户在非穿透模式下设置的透明度
             self.main_window.canvas.set_canvas_opacity(self.main_window.user_non_passthrough_opacity)
@@ -63,14 +74,9 @@ class TransparencyManager:
                 self.main_window.toolbar.toggle_passthrough_btn.setText("🖱️ 穿透")
                 self.main_window.toolbar.toggle_passthrough_btn.setProperty("class", "action")
             self.main_window._status_bar.showMessage("鼠标非穿透模式", STATUS_MESSAGE_TIMEOUT)
-            
-            # 退出穿透模式时重新启动定时器
-            if hasattr(self.main_window, 'toolbar_timer') and self.main_window.toolbar_timer:
-                self.main_window.toolbar_timer.start(TOOLBAR_CHECK_INTERVAL)  # 恢复定时器
         else:
             # Currently in non-pass-through mode, switch to pass-through
-            new_flags = current_flags | Qt.WindowTransparentForInput
-            self.main_window.setWindowFlags(new_flags)
+            self._apply_passthrough(True)
             self.main_window.passthrough_state = True
             # 使用用户在穿透模式下设置的透明度
             self.main_window.canvas.set_canvas_opacity(self.main_window.user_passthrough_opacity)
@@ -79,10 +85,6 @@ class TransparencyManager:
                 self.main_window.toolbar.toggle_passthrough_btn.setText("🖱️ 非穿透")
                 self.main_window.toolbar.toggle_passthrough_btn.setProperty("class", "action active")
             self.main_window._status_bar.showMessage("鼠标穿透模式", STATUS_MESSAGE_TIMEOUT)
-            
-            # 进入穿透模式时停止定时器，避免抢夺焦点
-            if hasattr(self.main_window, 'toolbar_timer') and self.main_window.toolbar_timer:
-                self.main_window.toolbar_timer.stop()
         
         # 更新GUI滑动条以同步画布透明度
         self.main_window.toolbar.update_canvas_opacity_ui()
@@ -97,7 +99,7 @@ class TransparencyManager:
                 self.main_window.toolbar.toggle_passthrough_btn
             )
         
-        # 必须重新显示窗口以应用新的标志
+        # 窗口可能被隐藏过，穿透切换后保持显示
         self.main_window.show()
         # 只在非穿透模式下激活主窗口，避免抢夺焦点
         if not self.main_window.passthrough_state:
@@ -106,6 +108,66 @@ class TransparencyManager:
         
         # 确保工具栏在主窗口之上 - 使用更强的方法
         self.main_window.window_manager.ensure_toolbar_on_top()
+        
+        # 进入穿透模式后开始空闲计时，退出穿透模式时立即恢复
+        if hasattr(self.main_window, 'idle_manager'):
+            self.main_window.idle_manager.notify_activity()
+    
+    def toggle_ink_passthrough(self) -> None:
+        """切换“仅标注处接收鼠标”模式
+        
+        画布只在已有标注的区域接收鼠标，其余区域穿透到下层窗口；
+        工具栏是独立的窗口，始终可以操作。
+        """
+        canvas = self.main_window.canvas
+        if canvas.input_mask.enabled:
+            canvas.input_mask.disable()
+            self.input_region.set_region(None)
+            self.main_window.screen_manager.set_ink_passthrough(False)
+            self.main_window._status_bar.showMessage("已退出仅标注处接收鼠标模式", STATUS_MESSAGE_TIMEOUT)
+            return
+        
+        if not self.input_region.supports_partial:
+            self.main_window._status_bar.showMessage("当前平台不支持仅标注处接收鼠标", STATUS_MESSAGE_TIMEOUT)
+            return
+        
+        # 先退出整窗穿透，恢复非穿透模式的画布透明度
+        if self.main_window.passthrough_state:
+            self.toggle_mouse_passthrough()
+        canvas.input_mask.enable(self._apply_input_region)
+        self.main_window.screen_manager.set_ink_passthrough(True)
+        self.main_window._status_bar.showMessage("仅标注处接收鼠标", STATUS_MESSAGE_TIMEOUT)
+    
+    def _apply_input_region(self, region) -> None:
+        """把标注形状的输入区域应用到主窗口"""
+        start = time.perf_counter()
+        self.input_region.set_region(region)
+        logger.debug("更新输入区域: %d 个矩形, 耗时 %.2f ms",
+                     region.rectCount(), (time.perf_counter() - start) * 1000)
+    
+    def _apply_passthrough(self, enabled: bool) -> None:
+        """切换主窗口的鼠标穿透并记录耗时
+        
+        优先修改原生窗口的输入区域，窗口保持不变，不会闪烁或丢失绘制缓存；
+        平台不支持时回退到 Qt.WindowTransparentForInput，这会重建原生窗口。
+        """
+        start = time.perf_counter()
+        if self.input_region.set_passthrough(enabled):
+            method = "输入区域"
+        else:
+            flags = self.main_window.windowFlags()
+            if enabled:
+                flags |= Qt.WindowTransparentForInput
+            else:
+                flags &= ~Qt.WindowTransparentForInput
+            self.main_window.setWindowFlags(flags)
+            # 修改窗口标志会重建原生窗口，必须重新显示
+            self.main_window.show()
+            method = "窗口标志"
+        # 其他屏幕的画布窗口保持同样的穿透状态
+        self.main_window.screen_manager.apply_passthrough(enabled)
+        self.last_toggle_latency_ms = (time.perf_counter() - start) * 1000
+        logger.info("切换鼠标穿透耗时 %.2f ms（%s）", self.last_toggle_latency_ms, method)
     
     def change_canvas_opacity(self, value: int) -> None:
         """通过工具栏处理画布透明度变化"""
@@ -2,16 +2,19 @@
 系统托盘管理模块
 """
 from typing import TYPE_CHECKING, Optional
-from PyQt5.QtWidgets import QSystemTrayIcon, QMenu, QAction, QStyle
+from PyQt5.QtWidgets import QSystemTrayIcon, QMenu, QAction, QStyle, QFileDialog
 from PyQt5.QtGui import QIcon
 from utils import load_icon_with_fallback, create_default_icon
+from app_log import get_logger, dump_log
 from constants import (TRAY_TOOLTIP, TRAY_NOTIFICATION_TITLE, 
                       TRAY_NOTIFICATION_MESSAGE, TRAY_NOTIFICATION_TIMEOUT,
-                      STATUS_MESSAGE_TIMEOUT)
+                      STATUS_MESSAGE_TIMEOUT, LOG_FILE_FILTER)
 
 if TYPE_CHECKING:
     from main import AnnotationTool
 
+logger = get_logger(__name__)
+
 
 class TrayManager:
     """系统托盘管理器"""
@@ -25,7 +28,7 @@ class TrayManager:
         """设置系统托盘"""
         # 检查系统是否支持系统托盘
         if not QSystemTrayIcon.isSystemTrayAvailable():
-            print("系统托盘不可用")
+            logger.warning("系统托盘不可用")
             return
         
         # 创建系统托盘图标
@@ -37,7 +40,7 @@ class TrayManager:
         # 设置托盘图标
         icon = self._load_tray_icon()
         self.tray_icon.setIcon(icon)
-        print(f"托盘图标设置完成，图标有效性: {not icon.isNull()}")
+        logger.debug("托盘图标设置完成，图标有效性: %s", not icon.isNull())
         
         # 设置托盘提示
         self.tray_icon.setToolTip(TRAY_TOOLTIP)
@@ -58,8 +61,8 @@ class TrayManager:
             icon = load_icon_with_fallback("1.ico")
             if not icon.isNull():
                 return icon
-        except Exception as e:
-            print(f"加载托盘图标失败: {e}")
+        except Exception:
+            logger.exception("加载托盘图标失败")
         
         # 尝试使用系统标准图标
         try:
@@ -68,8 +71,8 @@ class TrayManager:
                 icon = style.standardIcon(QStyle.SP_ComputerIcon)
                 if not icon.isNull():
                     return icon
-        except Exception as e:
-            print(f"使用系统图标失败: {e}")
+        except Exception:
+            logger.exception("使用系统图标失败")
         
         # 最后使用默认图标
         return create_default_icon()
@@ -83,6 +86,11 @@ class TrayManager:
         show_action.triggered.connect(self.show_from_tray)
         tray_menu.addAction(show_action)
         
+        # 导出日志动作
+        export_log_action: QAction = QAction("导出日志...", self.main_window)
+        export_log_action.triggered.connect(self.export_log)
+        tray_menu.addAction(export_log_action)
+        
         # 分隔符
         tray_menu.addSeparator()
         
@@ -95,6 +103,18 @@ class TrayManager:
         if self.tray_icon:
             self.tray_icon.setContextMenu(tray_menu)
     
+    def export_log(self) -> None:
+        """把内存中的最近日志导出到文件"""
+        file_name, _ = QFileDialog.getSaveFileName(
+            self.main_window, "导出日志", "imscreen.log", LOG_FILE_FILTER)
+        if not file_name:
+            return
+        try:
+            dump_log(file_name)
+            self.main_window._status_bar.showMessage(f"日志已导出到 {file_name}", STATUS_MESSAGE_TIMEOUT)
+        except OSError:
+            logger.exception("导出日志失败: %s", file_name)
+    
     def show_from_tray(self) -> None:
         """从托盘恢复窗口显示"""
         # 显示主窗口和工具栏
@@ -124,7 +144,7 @@ class TrayManager:
             self.tray_icon_visible = False
         
         self.main_window._status_bar.showMessage("窗口已从托盘恢复", STATUS_MESSAGE_TIMEOUT)
-        print("窗口已从托盘恢复")
+        logger.info("窗口已从托盘恢复")
     
     def _tray_icon_activated(self, reason: QSystemTrayIcon.ActivationReason) -> None:
         """托盘图标被点击"""
@@ -157,7 +177,7 @@ class TrayManager:
                 TRAY_NOTIFICATION_TIMEOUT
             )
         
-        print("程序已隐藏到系统托盘")
+        logger.info("程序已隐藏到系统托盘")
     
     def cleanup(self) -> None:
         """清理托盘资源"""
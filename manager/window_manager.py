@@ -4,8 +4,8 @@
 """
 from typing import TYPE_CHECKING
 from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import Qt, QRect
-from constants import STATUS_MESSAGE_TIMEOUT
+from PyQt5.QtCore import Qt, QRect, QTimer
+from constants import STATUS_MESSAGE_TIMEOUT, TOOLBAR_RESTACK_DELAY
 
 if TYPE_CHECKING:
     from main import AnnotationTool
@@ -16,6 +16,18 @@ class WindowManager:
     
     def __init__(self, main_window: 'AnnotationTool'):
         self.main_window = main_window
+        
+        # 工具栏置顶由窗口激活、焦点切换和对话框关闭等事件触发，没有周期性唤醒。
+        # 短时间内的多次请求合并为一次，对话框打开期间暂停。
+        self._restack_timer = QTimer()
+        self._restack_timer.setSingleShot(True)
+        self._restack_timer.setInterval(TOOLBAR_RESTACK_DELAY)
+        self._restack_timer.timeout.connect(self._restack_toolbar)
+        self._restack_activate = False
+        self._restack_suspended = 0
+        
+        # 其他屏幕的置顶画布窗口，与主窗口一样需要保持在工具栏之下
+        self.canvas_windows = []
     
     def setup_window_properties(self) -> None:
         """设置窗口属性"""
@@ -66,6 +78,15 @@ class WindowManager:
         self.main_window.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
         self.main_window.setAttribute(Qt.WA_TranslucentBackground)
     
+    def fit_to_geometry(self, screen_geometry: QRect) -> None:
+        """让主窗口和画布覆盖指定的屏幕区域（屏幕变化后调用）"""
+        if self.main_window.geometry() == screen_geometry:
+            return
+        self.main_window.setFixedSize(screen_geometry.size())
+        self.main_window.setGeometry(screen_geometry)
+        self.main_window.canvas.setGeometry(0, 0, screen_geometry.width(), screen_geometry.height())
+        self.main_window.canvas.setFixedSize(screen_geometry.size())
+    
     def setup_menubar(self) -> None:
         """设置菜单栏 - 在无边框模式下隐藏菜单栏"""
         menu_bar = self.main_window.menuBar()
@@ -113,8 +134,66 @@ class WindowManager:
                 self.main_window.toolbar.toggle_visibility_btn
             )
     
-    def ensure_toolbar_on_top(self) -> None:
-        """确保工具栏始终显示在最前面"""
+    def install_restack_triggers(self) -> None:
+        """在应用激活状态和焦点窗口变化时重新置顶工具栏"""
+        app = QApplication.instance()
+        if app:
+            app.applicationStateChanged.connect(lambda state: self.schedule_toolbar_restack())
+            app.focusWindowChanged.connect(lambda window: self.schedule_toolbar_restack())
+    
+    def register_canvas_window(self, window) -> None:
+        """登记其他屏幕的画布窗口，它显示或激活时重新置顶工具栏"""
+        if window not in self.canvas_windows:
+            self.canvas_windows.append(window)
+        self.schedule_toolbar_restack()
+    
+    def unregister_canvas_window(self, window) -> None:
+        """画布窗口关闭前取消登记"""
+        if window in self.canvas_windows:
+            self.canvas_windows.remove(window)
+    
+    def schedule_toolbar_restack(self, activate: bool = False) -> None:
+        """请求在 TOOLBAR_RESTACK_DELAY 后置顶工具栏，多次请求合并为一次
+        
+        Args:
+            activate: 是否同时激活工具栏窗口；焦点变化触发的置顶只提升层级，不抢夺焦点
+        """
+        if self._restack_suspended:
+            return
+        self._restack_activate = self._restack_activate or activate
+        self._restack_timer.start()
+    
+    def suspend_toolbar_restack(self) -> None:
+        """暂停工具栏置顶，对话框打开期间使用，避免抢夺对话框焦点"""
+        self._restack_suspended += 1
+        self._restack_timer.stop()
+        self._restack_activate = False
+    
+    def resume_toolbar_restack(self) -> None:
+        """恢复工具栏置顶，并在对话框关闭后置顶一次"""
+        if self._restack_suspended:
+            self._restack_suspended -= 1
+        if not self._restack_suspended:
+            self.schedule_toolbar_restack(activate=True)
+    
+    def _restack_toolbar(self) -> None:
+        activate, self._restack_activate = self._restack_activate, False
+        # 焦点正在本程序的其他窗口（如对话框）上时不要改变层级，等其关闭后的事件再处理
+        app = QApplication.instance()
+        active_window = app.activeWindow() if app else None
+        if (active_window is not None and
+                active_window is not self.main_window and
+                active_window is not getattr(self.main_window, 'toolbar', None) and
+                active_window not in self.canvas_windows):
+            return
+        self.ensure_toolbar_on_top(activate)
+    
+    def ensure_toolbar_on_top(self, activate: bool = True) -> None:
+        """确保工具栏始终显示在最前面
+        
+        Args:
+            activate: 是否在需要时激活工具栏窗口
+        """
         if (hasattr(self.main_window, 'toolbar') and 
             self.main_window.toolbar and 
             not self.main_window.toolbar_completely_hidden):
@@ -141,10 +220,10 @@ class WindowManager:
             
             # 将工具栏置顶
             self.main_window.toolbar.raise_()
-            self.main_window.toolbar.repaint()  # 强制重绘
             
             # 只在非穿透模式下且确实需要时才激活窗口
-            if (not getattr(self.main_window, 'passthrough_state', False) and 
+            if (activate and
+                not getattr(self.main_window, 'passthrough_state', False) and 
                 not self.main_window.toolbar.isActiveWindow()):
                 self.main_window.toolbar.activateWindow()
                 self.main_window.toolbar.setFocus()  # 确保获得焦点
@@ -35,6 +35,7 @@ class RulerManager(QObject):
         
         # 临时标定数据
         self.temp_calibration_line = None
+        self.calibration_canvas = None  # 标定线所在的画布
         
     def open_ruler_settings(self):
         """打开标尺设置对话框"""
@@ -61,8 +62,9 @@ class RulerManager(QObject):
                     f"请在屏幕上画一条长度为 {real_length}{unit} 的直线进行标定", 5000
                 )
                 
-                # 连接画布信号，监听绘制完成
-                self.canvas.state_manager.shape_added.connect(self.on_calibration_shape_added)
+                # 连接所有屏幕画布的信号，监听绘制完成
+                for canvas in self.main_window.screen_manager.canvases():
+                    canvas.state_manager.shape_added.connect(self.on_calibration_shape_added)
             else:
                 self.main_window._status_bar.showMessage("标定取消", 2000)
         else:
@@ -73,12 +75,16 @@ class RulerManager(QObject):
         if not self.calibration_mode:
             return
         
+        # 记录标定线所在的画布
+        self.calibration_canvas = self.sender().canvas if self.sender() else self.canvas
+        
         # 断开信号
-        try:
-            self.canvas.state_manager.shape_added.disconnect(self.on_calibration_shape_added)
-        except TypeError:
-            # 如果信号未连接，忽略错误
-            pass
+        for canvas in self.main_window.screen_manager.canvases():
+            try:
+                canvas.state_manager.shape_added.disconnect(self.on_calibration_shape_added)
+            except TypeError:
+                # 如果信号未连接，忽略错误
+                pass
         
         # 检查是否是直线
         if shape.__class__.__name__ != 'Line':
@@ -105,9 +111,7 @@ class RulerManager(QObject):
             self.ruler_settings['unit'] = unit
             
             # 删除临时标定线
-            if self.temp_calibration_line in self.canvas.shapes:
-                self.canvas.shapes.remove(self.temp_calibration_line)
-                self.canvas.update()
+            self._remove_calibration_line()
             
             self.ruler_settings_changed.emit(self.ruler_settings)
             self.main_window._status_bar.showMessage(
@@ -115,17 +119,24 @@ class RulerManager(QObject):
             )
         else:
             # 删除临时标定线
-            if self.temp_calibration_line in self.canvas.shapes:
-                self.canvas.shapes.remove(self.temp_calibration_line)
-                self.canvas.update()
+            self._remove_calibration_line()
             self.main_window._status_bar.showMessage("标定失败：缺少标定数据", 2000)
         
         self.calibration_mode = False
         self.temp_calibration_line = None
+        self.calibration_canvas = None
         # 清除待标定数据
         if hasattr(self, 'pending_calibration_data'):
             delattr(self, 'pending_calibration_data')
     
+    def _remove_calibration_line(self):
+        """从所在画布删除临时标定线"""
+        canvas = self.calibration_canvas or self.canvas
+        if self.temp_calibration_line in canvas.shapes:
+            canvas.shapes.remove(self.temp_calibration_line)
+            canvas.input_mask.remove_shape(self.temp_calibration_line)
+            canvas.update()
+    
     def toggle_ruler_mode(self):
         """切换标尺模式"""
         self.ruler_mode = not self.ruler_mode
@@ -5,7 +5,7 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                             QLineEdit, QComboBox, QPushButton, QDoubleSpinBox,
                             QSpinBox, QCheckBox, QGroupBox, QFormLayout,
                             QDialogButtonBox, QTabWidget, QWidget)
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QEvent
 from PyQt5.QtGui import QDoubleValidator, QIntValidator
 
 
@@ -26,9 +26,11 @@ class RulerSettingsDialog(QDialog):
         self.setWindowModality(Qt.ApplicationModal)
         
         # 初始化焦点保护定时器
+        # 对话框失去焦点后延迟夺回焦点，只在失去焦点时启动，不定期唤醒
         self.focus_timer = QTimer()
         self.focus_timer.timeout.connect(self.ensure_focus)
-        self.focus_timer.setSingleShot(False)
+        self.focus_timer.setSingleShot(True)
+        self.focus_timer.setInterval(500)
         
         # 默认设置
         self.settings = {
@@ -226,43 +228,43 @@ class RulerSettingsDialog(QDialog):
         self.raise_()
         self.activateWindow()
         
-        # 暂停主窗口的工具栏定时器，避免焦点冲突
+        # 对话框打开期间暂停工具栏置顶，避免焦点冲突
         parent_window = self.parent()
-        if parent_window:
-            toolbar_timer = getattr(parent_window, 'toolbar_timer', None)
-            if toolbar_timer and toolbar_timer.isActive():
-                self.toolbar_timer_was_active = True
-                toolbar_timer.stop()
-            else:
-                self.toolbar_timer_was_active = False
-        else:
-            self.toolbar_timer_was_active = False
+        window_manager = getattr(parent_window, 'window_manager', None)
+        if window_manager and not getattr(self, '_toolbar_restack_suspended', False):
+            window_manager.suspend_toolbar_restack()
+            self._toolbar_restack_suspended = True
         
-        # 启动焦点保护定时器
-        self.focus_timer.start(500)  # 每500毫秒检查一次焦点
+        # 激活请求可能被窗口系统拒绝，稍后再确认一次
+        self.focus_timer.start()
     
-    def closeEvent(self, event):
-        """重写关闭事件以恢复工具栏定时器"""
+    def changeEvent(self, event):
+        """对话框失去焦点时启动焦点保护定时器"""
+        super().changeEvent(event)
+        if event.type() == QEvent.ActivationChange:
+            if self.isVisible() and not self.isActiveWindow():
+                self.focus_timer.start()
+            else:
+                self.focus_timer.stop()
+    
+    def hideEvent(self, event):
+        """accept/reject 只隐藏对话框而不触发 closeEvent，在这里同样停止定时器并恢复工具栏置顶"""
+        self._release_focus_guard()
+        super().hideEvent(event)
+    
+    def _release_focus_guard(self):
         # 停止焦点保护定时器
         self.focus_timer.stop()
         
-        # 恢复工具栏定时器（如果之前是活动的）
-        parent_window = self.parent()
-        if (hasattr(self, 'toolbar_timer_was_active') and 
-            self.toolbar_timer_was_active and
-            parent_window):
-            toolbar_timer = getattr(parent_window, 'toolbar_timer', None)
-            passthrough_state = getattr(parent_window, 'passthrough_state', False)
-            if toolbar_timer and not passthrough_state:
-                toolbar_timer.start(1000)  # 减少延迟到1秒重新启动定时器
-        
-        # 立即确保工具栏回到最前面，并延迟再次确保
-        if parent_window and hasattr(parent_window, 'window_manager'):
-            parent_window.window_manager.ensure_toolbar_on_top()  # type: ignore
-            # 延迟再次确保，给对话框更多时间完全关闭
-            QTimer.singleShot(100, parent_window.window_manager.ensure_toolbar_on_top)  # type: ignore
-            QTimer.singleShot(500, parent_window.window_manager.ensure_toolbar_on_top)  # type: ignore
-        
+        # 恢复工具栏置顶，对话框完全关闭后工具栏回到最前面
+        window_manager = getattr(self.parent(), 'window_manager', None)
+        if window_manager and getattr(self, '_toolbar_restack_suspended', False):
+            self._toolbar_restack_suspended = False
+            window_manager.resume_toolbar_restack()
+    
+    def closeEvent(self, event):
+        """重写关闭事件以恢复工具栏置顶"""
+        self._release_focus_guard()
         super().closeEvent(event)
 
 
@@ -283,9 +285,11 @@ class QuickRulerCalibrationDialog(QDialog):
         self.setWindowModality(Qt.ApplicationModal)
         
         # 初始化焦点保护定时器
+        # 对话框失去焦点后延迟夺回焦点，只在失去焦点时启动，不定期唤醒
         self.focus_timer = QTimer()
         self.focus_timer.timeout.connect(self.ensure_focus)
-        self.focus_timer.setSingleShot(False)
+        self.focus_timer.setSingleShot(True)
+        self.focus_timer.setInterval(500)
         
         # 初始化标定数据
         self.calibration_data = (None, None)
@@ -358,41 +362,41 @@ class QuickRulerCalibrationDialog(QDialog):
         self.raise_()
         self.activateWindow()
         
-        # 暂停主窗口的工具栏定时器，避免焦点冲突
+        # 对话框打开期间暂停工具栏置顶，避免焦点冲突
         parent_window = self.parent()
-        if parent_window:
-            toolbar_timer = getattr(parent_window, 'toolbar_timer', None)
-            if toolbar_timer and toolbar_timer.isActive():
-                self.toolbar_timer_was_active = True
-                toolbar_timer.stop()
-            else:
-                self.toolbar_timer_was_active = False
-        else:
-            self.toolbar_timer_was_active = False
+        window_manager = getattr(parent_window, 'window_manager', None)
+        if window_manager and not getattr(self, '_toolbar_restack_suspended', False):
+            window_manager.suspend_toolbar_restack()
+            self._toolbar_restack_suspended = True
         
-        # 启动焦点保护定时器
-        self.focus_timer.start(500)  # 每500毫秒检查一次焦点
+        # 激活请求可能被窗口系统拒绝，稍后再确认一次
+        self.focus_timer.start()
     
-    def closeEvent(self, event):
-        """重写关闭事件以恢复工具栏定时器"""
+    def changeEvent(self, event):
+        """对话框失去焦点时启动焦点保护定时器"""
+        super().changeEvent(event)
+        if event.type() == QEvent.ActivationChange:
+            if self.isVisible() and not self.isActiveWindow():
+                self.focus_timer.start()
+            else:
+                self.focus_timer.stop()
+    
+    def hideEvent(self, event):
+        """accept/reject 只隐藏对话框而不触发 closeEvent，在这里同样停止定时器并恢复工具栏置顶"""
+        self._release_focus_guard()
+        super().hideEvent(event)
+    
+    def _release_focus_guard(self):
         # 停止焦点保护定时器
         self.focus_timer.stop()
         
-        # 恢复工具栏定时器（如果之前是活动的）
-        parent_window = self.parent()
-        if (hasattr(self, 'toolbar_timer_was_active') and 
-            self.toolbar_timer_was_active and
-            parent_window):
-            toolbar_timer = getattr(parent_window, 'toolbar_timer', None)
-            passthrough_state = getattr(parent_window, 'passthrough_state', False)
-            if toolbar_timer and not passthrough_state:
-                toolbar_timer.start(1000)  # 减少延迟到1秒重新启动定时器
-        
-        # 立即确保工具栏回到最前面，并延迟再次确保
-        if parent_window and hasattr(parent_window, 'window_manager'):
-            parent_window.window_manager.ensure_toolbar_on_top()  # type: ignore
-            # 延迟再次确保，给对话框更多时间完全关闭
-            QTimer.singleShot(100, parent_window.window_manager.ensure_toolbar_on_top)  # type: ignore
-            QTimer.singleShot(500, parent_window.window_manager.ensure_toolbar_on_top)  # type: ignore
-        
+        # 恢复工具栏置顶，对话框完全关闭后工具栏回到最前面
+        window_manager = getattr(self.parent(), 'window_manager', None)
+        if window_manager and getattr(self, '_toolbar_restack_suspended', False):
+            self._toolbar_restack_suspended = False
+            window_manager.resume_toolbar_restack()
+    
+    def closeEvent(self, event):
+        """重写关闭事件以恢复工具栏置顶"""
+        self._release_focus_guard()
         super().closeEvent(event)
@@ -2,9 +2,12 @@
 高级形状类 - 箭头、自由绘制、填充自由绘制
 """
 import math
-from PyQt5.QtGui import QColor, QPen, QPainterPath, QPolygonF
-from PyQt5.QtCore import QPointF
+from PyQt5.QtGui import QColor, QPainterPath, QPolygonF
+from PyQt5.QtCore import QPointF, QRectF
 from .base import Shape
+from .style_cache import get_pen
+from .bezier import (fit_bezier_curves, sample_bezier_segments,
+                     segments_to_list, segments_from_list)
 
 
 class Arrow(Shape):
@@ -78,7 +81,7 @@ class Arrow(Shape):
         arrowhead = QPolygonF([self.end_point, wing1_end, wing2_end])
         
         # Use a thin pen for sharp edges
-        arrow_pen = QPen(self.color, max(1, int(self.thickness * 0.2)))  # Even thinner for very sharp edges
+        arrow_pen = get_pen(self.base_color.rgba(), self.opacity, max(1, int(self.thickness * 0.2)))  # Even thinner for very sharp edges
         painter.setPen(arrow_pen)
         painter.setBrush(self.color)
         painter.drawPolygon(arrowhead)
@@ -87,6 +90,12 @@ class Arrow(Shape):
         painter.setBrush(old_brush)
         painter.setPen(old_pen)
 
+    def get_paint_rect(self):
+        # 箭头两翼最多伸出 arrow_size
+        margin = max(15, self.thickness * 2) + self._stroke_margin()
+        rect = QRectF(QPointF(self.start_point), QPointF(self.end_point)).normalized()
+        return rect.adjusted(-margin, -margin, margin, margin)
+
     def to_dict(self):
         data = super().to_dict()
         data.update({
@@ -105,39 +114,97 @@ class Arrow(Shape):
         return cls(start_point, end_point, color=color, thickness=data["thickness"], opacity=data["opacity"])
 
 
-class Freehand(Shape):
-    def __init__(self, points, **kwargs):
+class StrokeBase(Shape):
+    """自由笔画基类，处理采样点与贝塞尔曲线拟合的公共功能"""
+
+    def __init__(self, points, bezier_segments=None, **kwargs):
         super().__init__(**kwargs)
-        self.points = points # List of QPointF
+        self.points = points  # List of QPointF
+        self.bezier_segments = bezier_segments or []  # 拟合后的三次贝塞尔曲线段
+        self.raw_points_retained = True  # points 是否为原始采样点
+        self._path_cache = None
+        self._path_cache_key = None
 
-    def draw(self, painter):
-        painter.setPen(self.pen)
-        if len(self.points) > 1:
-            path = QPainterPath()
+    def fit_curves(self, tolerance=2.0, keep_raw_points=False):
+        """将采样点拟合为分段三次贝塞尔曲线（在笔画提交时调用）"""
+        segments = fit_bezier_curves(self.points, tolerance)
+        if not segments:
+            return False
+        self.bezier_segments = segments
+        if not keep_raw_points:
+            # 不保留原始采样点时，用曲线上的采样点替代，供橡皮擦命中检测使用
+            self.points = sample_bezier_segments(segments)
+            self.raw_points_retained = False
+        self._path_cache = None
+        return True
+
+    def build_path(self):
+        """构建笔画路径，拟合后的曲线使用 cubicTo 绘制"""
+        # 绘制过程中 points 会被直接追加，因此用点数作为缓存键
+        key = (len(self.bezier_segments), len(self.points))
+        if self._path_cache is not None and self._path_cache_key == key:
+            return self._path_cache
+
+        path = QPainterPath()
+        if self.bezier_segments:
+            path.moveTo(self.bezier_segments[0][0])
+            for _, c1, c2, end in self.bezier_segments:
+                path.cubicTo(c1, c2, end)
+        elif self.points:
             path.moveTo(self.points[0])
             for i in range(1, len(self.points)):
                 path.lineTo(self.points[i])
-            painter.drawPath(path)
+
+        self._path_cache = path
+        self._path_cache_key = key
+        return path
+
+    def get_paint_rect(self):
+        if not self.points and not self.bezier_segments:
+            return QRectF()
+        margin = self._stroke_margin()
+        return self.build_path().boundingRect().adjusted(-margin, -margin, margin, margin)
 
     def to_dict(self):
         data = super().to_dict()
-        data.update({
-            'points': [{'x': p.x(), 'y': p.y()} for p in self.points]
-        })
+        if self.bezier_segments:
+            data['bezier'] = segments_to_list(self.bezier_segments)
+        if self.raw_points_retained or not self.bezier_segments:
+            data['points'] = [{'x': p.x(), 'y': p.y()} for p in self.points]
         return data
 
     @classmethod
     def from_dict(cls, data):
         color = QColor(*data["color"])
-        points = [QPointF(p['x'], p['y']) for p in data['points']]
-        return cls(points, color=color, thickness=data["thickness"], opacity=data["opacity"])
+        bezier_segments = segments_from_list(data.get('bezier', []))
+        if 'points' in data:
+            points = [QPointF(p['x'], p['y']) for p in data['points']]
+        else:
+            points = sample_bezier_segments(bezier_segments)
+        instance = cls(points, bezier_segments=bezier_segments, color=color,
+                       thickness=data["thickness"], opacity=data["opacity"])
+        instance.raw_points_retained = 'points' in data
+        return instance
 
 
-class FilledFreehand(Shape):
-    def __init__(self, points, **kwargs):
-        super().__init__(**kwargs)
-        self.points = points # List of QPointF
+class Freehand(StrokeBase):
+    def draw(self, painter):
+        painter.setPen(self.pen)
+        if len(self.points) > 1 or self.bezier_segments:
+            painter.drawPath(self.build_path())
+
+    def batch_key(self):
+        return (Freehand, self.state_key)
+
+    @classmethod
+    def draw_batch(cls, painter, shapes):
+        painter.setPen(shapes[0].pen)
+        for s in shapes:
+            if len(s.points) > 1 or s.bezier_segments:
+                painter.drawPath(s.build_path())
+
 
+class FilledFreehand(StrokeBase):
     def draw(self, painter):
         # 保存当前画笔状态
         old_pen = painter.pen()
@@ -146,34 +213,14 @@ class FilledFreehand(Shape):
         painter.setPen(self.pen)
         painter.setBrush(self.color)  # 设置填充颜色
         
-        if len(self.points) > 2:  # 至少需要3个点才能形成一个封闭区域
-            path = QPainterPath()
-            path.moveTo(self.points[0])
-            for i in range(1, len(self.points)):
-                path.lineTo(self.points[i])
+        if len(self.points) > 2 or self.bezier_segments:  # 至少需要3个点才能形成一个封闭区域
+            path = QPainterPath(self.build_path())
             path.closeSubpath()  # 封闭路径以便填充
             painter.drawPath(path)
         elif len(self.points) > 1:
             # 如果点数不足，只绘制线条
-            path = QPainterPath()
-            path.moveTo(self.points[0])
-            for i in range(1, len(self.points)):
-                path.lineTo(self.points[i])
-            painter.drawPath(path)
+            painter.drawPath(self.build_path())
         
         # 恢复原始画笔状态
         painter.setPen(old_pen)
         painter.setBrush(old_brush)
-
-    def to_dict(self):
-        data = super().to_dict()
-        data.update({
-            'points': [{'x': p.x(), 'y': p.y()} for p in self.points]
-        })
-        return data
-
-    @classmethod
-    def from_dict(cls, data):
-        color = QColor(*data["color"])
-        points = [QPointF(p['x'], p['y']) for p in data['points']]
-        return cls(points, color=color, thickness=data["thickness"], opacity=data["opacity"])
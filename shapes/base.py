@@ -1,8 +1,9 @@
 """
 基础形状类 - 定义所有形状的基础接口和属性
 """
-from PyQt5.QtGui import QColor, QPen
+from PyQt5.QtGui import QColor
 from PyQt5.QtCore import QDateTime
+from .style_cache import get_color, get_pen
 
 
 class Shape:
@@ -12,22 +13,22 @@ class Shape:
         self.base_color = color  # 保存原始颜色，不包含透明度
         self.thickness = thickness
         self.opacity = opacity
+        self.expires_at = None  # 消失墨水模式下的到期时间（毫秒时间戳）
         self._update_pen()
 
     def _update_pen(self):
         """更新画笔，应用当前的透明度设置"""
-        # 创建一个新的颜色对象，应用透明度
-        drawing_color = QColor(self.base_color)
-        drawing_color.setAlphaF(self.opacity)
-        self.pen = QPen(drawing_color)
-        self.pen.setWidth(self.thickness)
+        # 颜色和画笔从共享缓存获取，不在绘制路径中重复创建
+        rgba = self.base_color.rgba()
+        self._drawing_color = get_color(rgba, self.opacity)
+        self.pen = get_pen(rgba, self.opacity, self.thickness)
+        # 画笔状态键，用于批量绘制时判断相邻形状能否共用画笔
+        self.state_key = (rgba, self.opacity, self.thickness)
 
     @property 
     def color(self):
-        """获取当前绘制颜色（包含透明度）"""
-        drawing_color = QColor(self.base_color)
-        drawing_color.setAlphaF(self.opacity)
-        return drawing_color
+        """获取当前绘制颜色（包含透明度），返回的是共享对象，不要修改"""
+        return self._drawing_color
 
     def set_color(self, color):
         self.base_color = QColor(color)  # 复制颜色以避免意外修改
@@ -44,13 +45,40 @@ class Shape:
     def draw(self, painter):
         raise NotImplementedError
 
+    def batch_key(self):
+        """返回批量绘制的分组键，相邻且键相同的形状可以共用画笔状态一次绘制
+
+        返回 None 表示该形状只能单独绘制
+        """
+        return None
+
+    @classmethod
+    def draw_batch(cls, painter, shapes):
+        """批量绘制一组 batch_key 相同的形状"""
+        for shape in shapes:
+            shape.draw(painter)
+
+    def get_paint_rect(self):
+        """获取绘制内容占据的区域（包括线宽），用于局部重绘
+
+        返回 None 表示无法确定，调用方应重绘整个画布
+        """
+        return None
+
+    def _stroke_margin(self):
+        """线宽和抗锯齿带来的外扩距离"""
+        return self.thickness / 2 + 2
+
     def to_dict(self):
-        return {
+        data = {
             'type': self.__class__.__name__,
             'color': self.base_color.getRgb(),
             'thickness': self.thickness,
             'opacity': self.opacity
         }
+        if self.expires_at is not None:
+            data['expires_at'] = self.expires_at
+        return data
 
     @classmethod
     def from_dict(cls, data):
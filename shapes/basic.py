@@ -1,8 +1,8 @@
 """
 基本几何形状类 - 直线、矩形、圆形、点
 """
-from PyQt5.QtGui import QColor
-from PyQt5.QtCore import QPointF, QRectF
+from PyQt5.QtGui import QColor, QPainterPath
+from PyQt5.QtCore import QPointF, QRectF, QLineF, Qt
 from .base import Shape
 
 
@@ -16,6 +16,19 @@ class Line(Shape):
         painter.setPen(self.pen)
         painter.drawLine(self.start_point, self.end_point)
 
+    def batch_key(self):
+        return (Line, self.state_key)
+
+    @classmethod
+    def draw_batch(cls, painter, shapes):
+        painter.setPen(shapes[0].pen)
+        painter.drawLines([QLineF(QPointF(s.start_point), QPointF(s.end_point)) for s in shapes])
+
+    def get_paint_rect(self):
+        margin = self._stroke_margin()
+        rect = QRectF(QPointF(self.start_point), QPointF(self.end_point)).normalized()
+        return rect.adjusted(-margin, -margin, margin, margin)
+
     def to_dict(self):
         data = super().to_dict()
         data.update({
@@ -43,6 +56,18 @@ class Rectangle(Shape):
         painter.setPen(self.pen)
         painter.drawRect(self.rect)
 
+    def batch_key(self):
+        return (Rectangle, self.state_key)
+
+    @classmethod
+    def draw_batch(cls, painter, shapes):
+        painter.setPen(shapes[0].pen)
+        painter.drawRects([QRectF(s.rect) for s in shapes])
+
+    def get_paint_rect(self):
+        margin = self._stroke_margin()
+        return QRectF(self.rect).normalized().adjusted(-margin, -margin, margin, margin)
+
     def to_dict(self):
         data = super().to_dict()
         data.update({
@@ -70,6 +95,20 @@ class Circle(Shape):
         painter.setPen(self.pen)
         painter.drawEllipse(self.center_point, self.radius, self.radius)
 
+    def batch_key(self):
+        return (Circle, self.state_key)
+
+    @classmethod
+    def draw_batch(cls, painter, shapes):
+        painter.setPen(shapes[0].pen)
+        for s in shapes:
+            painter.drawEllipse(s.center_point, s.radius, s.radius)
+
+    def get_paint_rect(self):
+        extent = self.radius + self._stroke_margin()
+        return QRectF(self.center_point.x() - extent, self.center_point.y() - extent,
+                      extent * 2, extent * 2)
+
     def to_dict(self):
         data = super().to_dict()
         data.update({
@@ -106,6 +145,37 @@ class Point(Shape):
         painter.setPen(old_pen)
         painter.setBrush(old_brush)
 
+    def batch_key(self):
+        return (Point, self.state_key)
+
+    @classmethod
+    def draw_batch(cls, painter, shapes):
+        old_pen = painter.pen()
+        old_brush = painter.brush()
+
+        first = shapes[0]
+        painter.setPen(first.pen)
+        painter.setBrush(first.color)
+        if first.color.alpha() == 255:
+            # 不透明的点合并为一条路径，一次调用完成绘制
+            path = QPainterPath()
+            path.setFillRule(Qt.WindingFill)
+            for s in shapes:
+                path.addEllipse(QPointF(s.center_point), s.radius, s.radius)
+            painter.drawPath(path)
+        else:
+            # 半透明的点重叠处需要叠加混合，只共享画笔状态，逐个绘制
+            for s in shapes:
+                painter.drawEllipse(s.center_point, s.radius, s.radius)
+
+        painter.setPen(old_pen)
+        painter.setBrush(old_brush)
+
+    def get_paint_rect(self):
+        extent = self.radius + self._stroke_margin()
+        return QRectF(self.center_point.x() - extent, self.center_point.y() - extent,
+                      extent * 2, extent * 2)
+
     def to_dict(self):
         data = super().to_dict()
         data.update({
@@ -0,0 +1,239 @@
+"""
+贝塞尔曲线拟合 - 将自由绘制的采样点拟合为分段三次贝塞尔曲线
+
+算法基于 Philip J. Schneider 的 "An Algorithm for Automatically Fitting
+Digitized Curves"（Graphics Gems, 1990）：先按弦长参数化，用最小二乘求
+控制点，误差过大时用牛顿迭代重新参数化，仍不满足则在误差最大处拆分。
+内部使用 (x, y) 元组计算，仅在输出时转换为 QPointF。
+"""
+import math
+from PyQt5.QtCore import QPointF
+
+# 单段曲线允许的最大重新参数化次数
+MAX_REPARAMETERIZE_ITERATIONS = 4
+
+
+def fit_bezier_curves(points, tolerance=2.0):
+    """将点序列拟合为分段三次贝塞尔曲线
+
+    Args:
+        points: QPoint/QPointF 序列
+        tolerance: 允许的最大偏离距离（像素）
+
+    Returns:
+        [(p0, c1, c2, p3), ...] 形式的 QPointF 四元组列表；点数不足时返回空列表
+    """
+    pts = _dedupe([(float(p.x()), float(p.y())) for p in points])
+    if len(pts) < 2:
+        return []
+
+    error = tolerance * tolerance  # 内部比较的是距离平方
+    left_tangent = _normalize(_sub(pts[1], pts[0]))
+    right_tangent = _normalize(_sub(pts[-2], pts[-1]))
+
+    segments = []
+    # 使用显式栈代替递归，避免长笔画拆分过深时超出递归深度
+    stack = [(0, len(pts) - 1, left_tangent, right_tangent)]
+    while stack:
+        first, last, t_left, t_right = stack.pop()
+        result = _fit_cubic(pts, first, last, t_left, t_right, error)
+        if isinstance(result, tuple):
+            segments.append(result)
+            continue
+        split = result
+        center_tangent = _normalize(_sub(pts[split - 1], pts[split + 1]))
+        if center_tangent == (0.0, 0.0):
+            center_tangent = _normalize(_sub(pts[split - 1], pts[split]))
+        # 先压入右半段，保证左半段先出栈，输出顺序与笔画方向一致
+        stack.append((split, last, _scale(center_tangent, -1.0), t_right))
+        stack.append((first, split, t_left, center_tangent))
+
+    return [tuple(QPointF(x, y) for x, y in segment) for segment in segments]
+
+
+def sample_bezier_segments(segments, spacing=4.0):
+    """沿贝塞尔曲线等间隔采样点，用于命中检测等需要折线的场景"""
+    samples = []
+    for p0, c1, c2, p3 in segments:
+        control = [(p.x(), p.y()) for p in (p0, c1, c2, p3)]
+        polygon_length = sum(_distance(control[i], control[i + 1]) for i in range(3))
+        steps = max(2, min(32, int(polygon_length / spacing)))
+        if not samples:
+            samples.append(QPointF(*control[0]))
+        for i in range(1, steps + 1):
+            x, y = _bezier_point(control, i / steps)
+            samples.append(QPointF(x, y))
+    return samples
+
+
+def segments_to_list(segments, precision=2):
+    """将曲线段序列化为扁平的数字列表"""
+    return [
+        [round(v, precision) for p in segment for v in (p.x(), p.y())]
+        for segment in segments
+    ]
+
+
+def segments_from_list(data):
+    """从扁平的数字列表恢复曲线段"""
+    return [
+        tuple(QPointF(values[i], values[i + 1]) for i in range(0, 8, 2))
+        for values in data
+    ]
+
+
+def _fit_cubic(pts, first, last, t_left, t_right, error):
+    """拟合 pts[first:last+1]，成功返回曲线段元组，否则返回拆分点索引"""
+    p_first = pts[first]
+    p_last = pts[last]
+
+    if last - first == 1:
+        # 只有两个点时使用启发式控制点
+        dist = _distance(p_first, p_last) / 3.0
+        return (p_first, _add(p_first, _scale(t_left, dist)),
+                _add(p_last, _scale(t_right, dist)), p_last)
+
+    u = _chord_length_parameterize(pts, first, last)
+    bezier = _generate_bezier(pts, first, last, u, t_left, t_right)
+    max_error, split = _compute_max_error(pts, first, last, bezier, u)
+    if max_error < error:
+        return bezier
+
+    # 误差不大时尝试重新参数化后再拟合
+    if max_error < error * 4.0:
+        for _ in range(MAX_REPARAMETERIZE_ITERATIONS):
+            u = [_newton_raphson(bezier, pts[first + i], u[i]) for i in range(len(u))]
+            bezier = _generate_bezier(pts, first, last, u, t_left, t_right)
+            max_error, split = _compute_max_error(pts, first, last, bezier, u)
+            if max_error < error:
+                return bezier
+
+    return split
+
+
+def _generate_bezier(pts, first, last, u, t_left, t_right):
+    """最小二乘法求解两端切线方向上的控制点距离"""
+    p_first = pts[first]
+    p_last = pts[last]
+
+    c00 = c01 = c11 = 0.0
+    x0 = x1 = 0.0
+    for i, t in enumerate(u):
+        mt = 1.0 - t
+        b0 = mt * mt * mt
+        b1 = 3.0 * t * mt * mt
+        b2 = 3.0 * t * t * mt
+        b3 = t * t * t
+        a0 = _scale(t_left, b1)
+        a1 = _scale(t_right, b2)
+        c00 += _dot(a0, a0)
+        c01 += _dot(a0, a1)
+        c11 += _dot(a1, a1)
+        p = pts[first + i]
+        tmp = (p[0] - (p_first[0] * (b0 + b1) + p_last[0] * (b2 + b3)),
+               p[1] - (p_first[1] * (b0 + b1) + p_last[1] * (b2 + b3)))
+        x0 += _dot(a0, tmp)
+        x1 += _dot(a1, tmp)
+
+    det_c0_c1 = c00 * c11 - c01 * c01
+    det_c0_x = c00 * x1 - c01 * x0
+    det_x_c1 = x0 * c11 - x1 * c01
+    alpha_l = det_x_c1 / det_c0_c1 if det_c0_c1 != 0 else 0.0
+    alpha_r = det_c0_x / det_c0_c1 if det_c0_c1 != 0 else 0.0
+
+    seg_length = _distance(p_first, p_last)
+    epsilon = 1.0e-6 * seg_length
+    if alpha_l < epsilon or alpha_r < epsilon:
+        # 最小二乘解不可用时回退到 Wu/Barsky 启发式
+        alpha_l = alpha_r = seg_length / 3.0
+
+    return (p_first, _add(p_first, _scale(t_left, alpha_l)),
+            _add(p_last, _scale(t_right, alpha_r)), p_last)
+
+
+def _compute_max_error(pts, first, last, bezier, u):
+    """计算拟合曲线与采样点之间的最大距离平方及其位置"""
+    max_dist = 0.0
+    split = (last - first + 1) // 2 + first
+    for i in range(1, last - first):
+        p = _bezier_point(bezier, u[i])
+        dx = p[0] - pts[first + i][0]
+        dy = p[1] - pts[first + i][1]
+        dist = dx * dx + dy * dy
+        if dist >= max_dist:
+            max_dist = dist
+            split = first + i
+    return max_dist, split
+
+
+def _newton_raphson(bezier, point, t):
+    """用牛顿迭代改进点在曲线上的参数"""
+    d = _sub(_bezier_point(bezier, t), point)
+    q1 = [_scale(_sub(bezier[i + 1], bezier[i]), 3.0) for i in range(3)]
+    q2 = [_scale(_sub(q1[i + 1], q1[i]), 2.0) for i in range(2)]
+    mt = 1.0 - t
+    d1 = (mt * mt * q1[0][0] + 2 * mt * t * q1[1][0] + t * t * q1[2][0],
+          mt * mt * q1[0][1] + 2 * mt * t * q1[1][1] + t * t * q1[2][1])
+    d2 = (mt * q2[0][0] + t * q2[1][0], mt * q2[0][1] + t * q2[1][1])
+    numerator = _dot(d, d1)
+    denominator = _dot(d1, d1) + _dot(d, d2)
+    if denominator == 0:
+        return t
+    return t - numerator / denominator
+
+
+def _chord_length_parameterize(pts, first, last):
+    """按累计弦长为每个点分配 [0, 1] 区间内的参数"""
+    u = [0.0]
+    for i in range(first + 1, last + 1):
+        u.append(u[-1] + _distance(pts[i], pts[i - 1]))
+    total = u[-1]
+    if total == 0:
+        return [i / (last - first) for i in range(last - first + 1)]
+    return [value / total for value in u]
+
+
+def _bezier_point(control, t):
+    mt = 1.0 - t
+    b0 = mt * mt * mt
+    b1 = 3.0 * t * mt * mt
+    b2 = 3.0 * t * t * mt
+    b3 = t * t * t
+    return (b0 * control[0][0] + b1 * control[1][0] + b2 * control[2][0] + b3 * control[3][0],
+            b0 * control[0][1] + b1 * control[1][1] + b2 * control[2][1] + b3 * control[3][1])
+
+
+def _dedupe(pts):
+    """去除连续重复的点，避免切线方向为零向量"""
+    result = []
+    for p in pts:
+        if not result or p != result[-1]:
+            result.append(p)
+    return result
+
+
+def _add(a, b):
+    return (a[0] + b[0], a[1] + b[1])
+
+
+def _sub(a, b):
+    return (a[0] - b[0], a[1] - b[1])
+
+
+def _scale(a, s):
+    return (a[0] * s, a[1] * s)
+
+
+def _dot(a, b):
+    return a[0] * b[0] + a[1] * b[1]
+
+
+def _distance(a, b):
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+def _normalize(a):
+    length = math.hypot(a[0], a[1])
+    if length == 0:
+        return (0.0, 0.0)
+    return (a[0] / length, a[1] / length)
@@ -2,39 +2,160 @@
 图片形状类 - 处理图片标注
 """
 import os
-from PyQt5.QtGui import QColor, QPen, QPixmap, QPainter
+import weakref
+from PyQt5.QtGui import QColor, QPen, QTransform
 from PyQt5.QtCore import QPointF, QRectF, Qt
 from PyQt5.QtWidgets import QFileDialog
 from .base import Shape
+from .image_cache import image_cache
+from .image_loader import image_loader
+from .image_animation import image_animator
+from .image_vector import get_svg_renderer, render_svg_pixmap, release_svg_renderer
+from .image_watcher import image_watcher
+
+# 图片未就绪时占位符的边长（像素）
+PLACEHOLDER_SIZE = 100
 
 
 class Image(Shape):
     """图片标注形状"""
     
-    def __init__(self, position, image_path="", scale_factor=1.0, rotation=0, **kwargs):
+    def __init__(self, position, image_path="", scale_factor=1.0, rotation=0, image_hash=None,
+                 lazy=False, **kwargs):
         super().__init__(**kwargs)
         self.position = position  # 图片左上角位置
         self.image_path = image_path  # 图片文件路径
+        self.image_hash = image_hash  # 导出时内嵌图片的内容哈希
         self.scale_factor = scale_factor  # 缩放比例
         self.rotation = rotation  # 旋转角度（度）
-        self.pixmap = None  # 缓存的QPixmap对象
+        self.decoded_image = None  # 解码结果 DecodedImage（来自共享缓存，可能按显示尺寸缩小过）
+        self.svg_renderer = None  # SVG 图片的矢量渲染器
+        self.animation = None  # GIF 等动画图片的共享播放状态
+        self.source_key = None  # 共享缓存中的键 (路径, 修改时间)
+        self.pixmap = None  # 按当前缩放/旋转预先变换好的QPixmap
         self.original_size = None  # 原始尺寸
         self.scaled_size = None  # 缩放后尺寸
         self.selection_threshold = 20  # 点击检测阈值（像素）
+        self._pixmap_key = None
+        self._reload_key = None  # 文件修改后正在解码的新 source_key，期间继续显示旧图片
+        self._watched_path = None
+        self._watch_finalizer = None  # 形状被回收时释放文件监视
+        self._load_deferred = bool(image_path) and lazy  # 推迟到首次绘制时再加载
         
         # 加载图片
-        if image_path:
+        if image_path and not lazy:
             self.load_image()
     
     def load_image(self):
-        """加载图片文件"""
-        if os.path.exists(self.image_path):
-            self.pixmap = QPixmap(self.image_path)
-            if not self.pixmap.isNull():
-                self.original_size = self.pixmap.size()
+        """加载图片文件
+
+        命中共享缓存时立即可用；否则在后台线程解码，期间绘制占位符，
+        解码完成后由画布调用 apply_decoded_image 并重绘该图片区域。
+        图片按接近显示尺寸的分辨率解码，而不是保留完整的源分辨率。
+        SVG 按显示尺寸矢量渲染，多帧动画由共享的 QMovie 播放。
+
+        Returns:
+            图片是否已经可以绘制
+        """
+        self._watch_file()
+        self._reload_key = None
+        self.pixmap = None
+        self.decoded_image = None
+        self.svg_renderer = None
+        self.animation = None
+        self.source_key = image_cache.source_key(self.image_path)
+        
+        if os.path.splitext(self.image_path)[1].lower() == '.svg':
+            self.svg_renderer = get_svg_renderer(self.image_path, self.source_key)
+            if self.svg_renderer is not None:
+                self.original_size = self.svg_renderer.defaultSize()
                 self.update_scaled_size()
                 return True
+        else:
+            self.animation = image_animator.request(self.image_path, self.source_key)
+            if self.animation is not None:
+                self.original_size = self.animation.original_size
+                self.update_scaled_size()
+                return True
+        
+        self.source_key, self.decoded_image = image_loader.request(self.image_path, self.scale_factor)
+        if self.decoded_image is not None:
+            self.original_size = self.decoded_image.original_size
+            self.update_scaled_size()
+            return True
         return False
+
+    def ensure_loaded(self):
+        """执行推迟的加载（撤销、重做和导入时重建的图片推迟到首次使用时加载）"""
+        if self._load_deferred:
+            self._load_deferred = False
+            self.load_image()
+
+    def reload_image(self):
+        """磁盘上的图片文件被修改后重新加载
+
+        位图在后台重新解码，新结果就绪前继续显示旧图片。
+
+        Returns:
+            新图片是否已经可以绘制
+        """
+        if self.svg_renderer is not None:
+            release_svg_renderer(self.source_key)
+        if self.decoded_image is None:
+            return self.load_image()
+        
+        source_key, decoded = image_loader.request(self.image_path, self.scale_factor)
+        if source_key is None:
+            return self.load_image()
+        self._reload_key = source_key
+        if decoded is not None:
+            self.apply_decoded_image(source_key, decoded)
+            return True
+        return False
+
+    def _watch_file(self):
+        """监视当前图片文件，路径改变时释放对旧路径的监视"""
+        if not self.image_path:
+            return
+        abs_path = os.path.abspath(self.image_path)
+        if abs_path == self._watched_path:
+            return
+        if self._watch_finalizer is not None:
+            self._watch_finalizer()
+        self._watched_path = image_watcher.watch(abs_path)
+        self._watch_finalizer = weakref.finalize(self, image_watcher.unwatch, abs_path)
+        self._watch_finalizer.atexit = False
+
+    def is_ready(self):
+        """图片是否已经可以绘制"""
+        if self.scaled_size is None:
+            return False
+        return (self.decoded_image is not None or self.svg_renderer is not None
+                or self.animation is not None)
+
+    def is_loading(self):
+        """图片是否正在后台解码"""
+        return self.decoded_image is None and image_loader.is_pending(self.source_key)
+
+    def apply_decoded_image(self, source_key, decoded):
+        """后台解码完成后更新图片，返回该形状是否受影响"""
+        if self.svg_renderer is not None or self.animation is not None:
+            return False
+        if source_key == self._reload_key:
+            # 文件修改后的新内容，无论分辨率高低都替换旧图片
+            self.source_key = source_key
+            self._reload_key = None
+        elif source_key != self.source_key:
+            return False
+        elif self.decoded_image is not None:
+            # 已有图片时只接受更高分辨率的解码结果
+            if decoded is None or decoded.decoded_scale <= self.decoded_image.decoded_scale:
+                return False
+        self.decoded_image = decoded
+        if decoded is not None:
+            self.original_size = decoded.original_size
+            self.update_scaled_size()
+        return True
     
     def update_scaled_size(self):
         """更新缩放后的尺寸"""
@@ -43,8 +164,15 @@ class Image(Shape):
     
     def set_scale_factor(self, scale_factor):
         """设置缩放比例"""
+        old_scale = self.scale_factor
         self.scale_factor = max(0.1, min(5.0, scale_factor))  # 限制在0.1到5.0之间
         self.update_scaled_size()
+        
+        # 放大时请求更高分辨率的解码，结果就绪前继续显示当前的图片
+        if self.scale_factor > old_scale and self.decoded_image is not None:
+            source_key, decoded = image_loader.request(self.image_path, self.scale_factor)
+            if decoded is not None:
+                self.apply_decoded_image(source_key, decoded)
     
     def set_rotation(self, rotation):
         """设置旋转角度"""
@@ -65,6 +193,19 @@ class Image(Shape):
         
         return left_top_rect.contains(point)
     
+    def get_paint_rect(self):
+        """获取实际绘制区域（包括旋转后的外接矩形或占位符），用于局部重绘"""
+        if not self.is_ready():
+            return QRectF(self.position.x(), self.position.y(),
+                          PLACEHOLDER_SIZE, PLACEHOLDER_SIZE).adjusted(-2, -2, 2, 2)
+        rect = self.get_bounding_rect()
+        if self.rotation != 0:
+            center = rect.center()
+            transform = QTransform().translate(center.x(), center.y())
+            transform = transform.rotate(self.rotation).translate(-center.x(), -center.y())
+            rect = transform.mapRect(rect)
+        return rect.adjusted(-1, -1, 1, 1)
+    
     def get_bounding_rect(self):
         """获取图片的边界矩形"""
         if self.scaled_size is None:
@@ -77,51 +218,67 @@ class Image(Shape):
             self.scaled_size.height()
         )
     
+    def _get_display_pixmap(self, device_pixel_ratio):
+        """获取按当前缩放、旋转和设备像素比变换好的图片"""
+        if self.svg_renderer is not None:
+            return render_svg_pixmap(self.source_key, self.svg_renderer,
+                                     self.scale_factor, self.rotation, device_pixel_ratio)
+        if self.animation is not None:
+            return self.animation.get_frame_pixmap(self.scale_factor, self.rotation, device_pixel_ratio)
+        
+        key = (self.source_key, self.decoded_image.decoded_scale,
+               self.scale_factor, self.rotation, device_pixel_ratio)
+        if self.pixmap is None or self._pixmap_key != key:
+            self.pixmap = image_cache.get_pixmap(
+                self.source_key, self.decoded_image,
+                self.scale_factor, self.rotation, device_pixel_ratio
+            )
+            self._pixmap_key = key
+        return self.pixmap
+    
     def draw(self, painter):
         """绘制图片"""
-        if not self.pixmap or self.pixmap.isNull() or self.scaled_size is None:
+        self.ensure_loaded()
+        
+        if not self.is_ready():
             # 如果图片加载失败，绘制一个占位符
             self._draw_placeholder(painter)
             return
         
+        device = painter.device()
+        device_pixel_ratio = device.devicePixelRatioF() if device else 1.0
+        pixmap = self._get_display_pixmap(device_pixel_ratio)
+        
         # 保存当前状态
         old_opacity = painter.opacity()
-        old_transform = painter.transform()
         
         # 设置不透明度（使用基类的opacity属性）
         painter.setOpacity(self.opacity)
         
-        # 计算绘制矩形的中心点（旋转中心）
-        draw_rect = QRectF(
+        # 计算绘制矩形的中心点（旋转中心），旋转后的图片以该点居中绘制
+        center = QRectF(
             self.position.x(),
             self.position.y(),
             self.scaled_size.width(),
             self.scaled_size.height()
-        )
-        center = draw_rect.center()
-        
-        # 应用旋转变换
-        if self.rotation != 0:
-            painter.translate(center)
-            painter.rotate(self.rotation)
-            painter.translate(-center)
+        ).center()
+        width = pixmap.width() / device_pixel_ratio
+        height = pixmap.height() / device_pixel_ratio
         
-        # 绘制图片
-        painter.drawPixmap(draw_rect.toRect(), self.pixmap)
+        # 绘制预先变换好的图片，不再逐帧缩放和旋转
+        painter.drawPixmap(QPointF(center.x() - width / 2, center.y() - height / 2), pixmap)
         
         # 恢复状态
-        painter.setTransform(old_transform)
         painter.setOpacity(old_opacity)
     
     def _draw_placeholder(self, painter):
-        """绘制占位符（当图片加载失败时）"""
+        """绘制占位符（当图片正在加载或加载失败时）"""
         # 绘制一个简单的矩形占位符
-        placeholder_size = 100
         placeholder_rect = QRectF(
             self.position.x(),
             self.position.y(),
-            placeholder_size,
-            placeholder_size
+            PLACEHOLDER_SIZE,
+            PLACEHOLDER_SIZE
         )
         
         # 设置占位符样式
@@ -136,7 +293,8 @@ class Image(Shape):
         
         # 绘制文字说明
         painter.setPen(QPen(QColor(100, 100, 100)))
-        painter.drawText(placeholder_rect, Qt.AlignCenter, "图片\n加载失败")
+        status = "加载中..." if self.is_loading() else "加载失败"
+        painter.drawText(placeholder_rect, Qt.AlignCenter, f"图片\n{status}")
     
     def _draw_selection_indicator(self, painter):
         """绘制选择指示器"""
@@ -166,15 +324,18 @@ class Image(Shape):
             'scale_factor': self.scale_factor,
             'rotation': self.rotation
         })
+        if self.image_hash:
+            data['image_hash'] = self.image_hash
         return data
     
     @classmethod
     def from_dict(cls, data):
-        """从字典反序列化"""
+        """从字典反序列化，图片推迟到首次绘制时才解码"""
         position = QPointF(data['position'][0], data['position'][1])
         image_path = data.get('image_path', '')
         scale_factor = data.get('scale_factor', 1.0)
         rotation = data.get('rotation', 0)
+        image_hash = data.get('image_hash')
         
         # 创建基础属性
         color = QColor(*data["color"])
@@ -186,6 +347,8 @@ class Image(Shape):
             image_path=image_path,
             scale_factor=scale_factor,
             rotation=rotation,
+            image_hash=image_hash,
+            lazy=True,
             color=color,
             thickness=thickness,
             opacity=opacity
@@ -0,0 +1,88 @@
+"""
+动画图片 - 用 QMovie 播放 GIF 等多帧图片
+
+同一文件的所有 Image 形状共享一个 QMovie，按帧号缓存变换好的 QPixmap。
+每次换帧发出 frame_changed 信号，由画布只重绘引用该文件的图片区域；
+画布上已没有引用者时画布会调用 release 停止播放，避免空转的定时器。
+"""
+from PyQt5.QtGui import QImageReader, QMovie, QPixmap, QTransform
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from .image_cache import ByteLRUCache
+
+# 每个动画图片的变换帧缓存上限（字节）
+ANIMATION_FRAME_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class AnimatedImage:
+    """一个动画文件的播放状态与帧缓存"""
+
+    def __init__(self, path):
+        self.movie = QMovie(path)
+        self.movie.setCacheMode(QMovie.CacheAll)
+        self.movie.jumpToFrame(0)
+        self.original_size = self.movie.currentImage().size()
+        self._frames = ByteLRUCache(ANIMATION_FRAME_CACHE_MAX_BYTES)
+
+    def get_frame_pixmap(self, scale, rotation, device_pixel_ratio):
+        """获取当前帧按缩放、旋转和设备像素比变换好的 QPixmap"""
+        key = (self.movie.currentFrameNumber(), round(scale, 4), rotation, device_pixel_ratio)
+        pixmap = self._frames.get(key)
+        if pixmap is None:
+            factor = scale * device_pixel_ratio
+            transform = QTransform().rotate(rotation).scale(factor, factor)
+            frame = self.movie.currentImage().transformed(transform, Qt.SmoothTransformation)
+            pixmap = QPixmap.fromImage(frame)
+            pixmap.setDevicePixelRatio(device_pixel_ratio)
+            self._frames.put(key, pixmap, pixmap.width() * pixmap.height() * pixmap.depth() // 8)
+        return pixmap
+
+    def stop(self):
+        self.movie.stop()
+        self._frames.clear()
+
+
+class ImageAnimator(QObject):
+    """管理所有正在播放的动画图片"""
+
+    # 动画换帧时发出，参数为 source_key
+    frame_changed = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self._animations = {}  # source_key -> AnimatedImage
+        self._static = set()  # 已确认不是动画的 source_key
+
+    def request(self, path, source_key):
+        """获取文件对应的动画并开始播放，文件不是多帧动画时返回 None"""
+        if source_key is None or source_key in self._static:
+            return None
+        animation = self._animations.get(source_key)
+        if animation is not None:
+            return animation
+
+        reader = QImageReader(path)
+        if not reader.supportsAnimation() or reader.imageCount() == 1:
+            self._static.add(source_key)
+            return None
+        animation = AnimatedImage(path)
+        if not animation.movie.isValid():
+            self._static.add(source_key)
+            return None
+        animation.movie.frameChanged.connect(lambda _frame, key=source_key: self.frame_changed.emit(key))
+        self._animations[source_key] = animation
+        animation.movie.start()
+        return animation
+
+    def is_playing(self):
+        """是否有动画正在播放"""
+        return bool(self._animations)
+
+    def release(self, source_key):
+        """停止播放并丢弃帧缓存"""
+        animation = self._animations.pop(source_key, None)
+        if animation is not None:
+            animation.stop()
+
+
+# 进程级共享实例
+image_animator = ImageAnimator()
@@ -0,0 +1,164 @@
+"""
+图片缓存 - 进程级共享的图片解码与变换结果缓存
+
+解码后的图片按 (路径, 修改时间) 缓存，预先缩放/旋转好的 QPixmap 按
+(源图片, 解码分辨率, 缩放, 旋转, 设备像素比) 缓存，两者都按字节数做 LRU 淘汰。
+撤销/重做和导入时重建的 Image 形状因此无需重新从磁盘解码。
+"""
+import os
+from collections import OrderedDict, namedtuple
+from PyQt5.QtGui import QImageReader, QPixmap, QTransform
+from PyQt5.QtCore import Qt, QSize
+
+# 缓存容量上限（字节），解码图片与变换结果各占一半
+IMAGE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# 解码结果：image 可能是按 decoded_scale 缩小解码的，original_size 为源文件尺寸
+DecodedImage = namedtuple('DecodedImage', ['image', 'original_size', 'decoded_scale'])
+
+
+def decode_image(path, decoded_scale=1.0):
+    """用 QImageReader 解码图片，decoded_scale < 1 时直接按缩小后的尺寸解码
+
+    Returns:
+        DecodedImage；无法解码时返回 None
+    """
+    reader = QImageReader(path)
+    original_size = reader.size()
+    if decoded_scale < 1.0 and original_size.isValid():
+        reader.setScaledSize(QSize(
+            max(1, round(original_size.width() * decoded_scale)),
+            max(1, round(original_size.height() * decoded_scale))
+        ))
+    else:
+        decoded_scale = 1.0
+    image = reader.read()
+    if image.isNull():
+        return None
+    if not original_size.isValid():
+        original_size = image.size()
+    return DecodedImage(image, original_size, decoded_scale)
+
+
+class ByteLRUCache:
+    """按总字节数限制容量的 LRU 缓存"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # key -> (value, cost)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, cost):
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key)[1]
+        if cost > self.max_bytes:
+            # 单个对象超过容量上限时不缓存
+            return
+        self._entries[key] = (value, cost)
+        self.total_bytes += cost
+        while self.total_bytes > self.max_bytes:
+            _, (_, evicted_cost) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_cost
+
+    def discard_where(self, predicate):
+        """移除所有 key 满足条件的条目"""
+        for key in [k for k in self._entries if predicate(k)]:
+            self.total_bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ImageCache:
+    """图片解码与变换结果的共享缓存"""
+
+    def __init__(self, max_bytes=IMAGE_CACHE_MAX_BYTES):
+        self._decoded = ByteLRUCache(max_bytes // 2)
+        self._transformed = ByteLRUCache(max_bytes // 2)
+
+    @staticmethod
+    def source_key(path):
+        """返回图片的缓存键 (绝对路径, 修改时间)，文件不存在时返回 None"""
+        try:
+            mtime = os.path.getmtime(path)
+        except (OSError, TypeError):
+            return None
+        return (os.path.abspath(path), mtime)
+
+    def lookup(self, source_key, min_decoded_scale=0.0):
+        """查找已解码的图片，未缓存或分辨率低于 min_decoded_scale 时返回 None"""
+        decoded = self._decoded.get(source_key)
+        if decoded is None or decoded.decoded_scale < min_decoded_scale:
+            return None
+        return decoded
+
+    def store(self, source_key, decoded):
+        """缓存解码结果，每个文件只保留分辨率最高的一份，返回缓存后的结果"""
+        current = self._decoded.get(source_key)
+        if current is not None and current.decoded_scale >= decoded.decoded_scale:
+            return current
+        self._decoded.put(source_key, decoded, decoded.image.sizeInBytes())
+        return decoded
+
+    def get_image(self, path, decoded_scale=1.0):
+        """同步获取解码后的图片，必要时在当前线程从磁盘解码
+
+        Returns:
+            (source_key, DecodedImage)；文件不存在或无法解码时返回 (None, None)
+        """
+        key = self.source_key(path)
+        if key is None:
+            return None, None
+        decoded = self.lookup(key, decoded_scale)
+        if decoded is None:
+            decoded = decode_image(path, decoded_scale)
+            if decoded is None:
+                return None, None
+            decoded = self.store(key, decoded)
+        return key, decoded
+
+    def get_pixmap(self, source_key, decoded, scale, rotation, device_pixel_ratio):
+        """获取按缩放、旋转和设备像素比预先变换好的 QPixmap"""
+        def transform_image():
+            # 解码图片可能已经缩小过，只需补足剩余的缩放比例
+            factor = scale * device_pixel_ratio / decoded.decoded_scale
+            transform = QTransform().rotate(rotation).scale(factor, factor)
+            pixmap = QPixmap.fromImage(decoded.image.transformed(transform, Qt.SmoothTransformation))
+            pixmap.setDevicePixelRatio(device_pixel_ratio)
+            return pixmap
+
+        key = (source_key, decoded.decoded_scale, round(scale, 4), rotation, device_pixel_ratio)
+        return self.get_rendered_pixmap(key, transform_image)
+
+    def get_rendered_pixmap(self, key, render):
+        """获取变换结果，未缓存时调用 render 生成；key 的第一项须为 source_key"""
+        pixmap = self._transformed.get(key)
+        if pixmap is None:
+            pixmap = render()
+            self._transformed.put(key, pixmap, pixmap.width() * pixmap.height() * pixmap.depth() // 8)
+        return pixmap
+
+    def invalidate(self, path):
+        """丢弃某个文件的所有缓存结果"""
+        abs_path = os.path.abspath(path)
+        self._decoded.discard_where(lambda key: key[0] == abs_path)
+        self._transformed.discard_where(lambda key: key[0] is not None and key[0][0] == abs_path)
+
+    def clear(self):
+        self._decoded.clear()
+        self._transformed.clear()
+
+
+# 进程级共享实例
+image_cache = ImageCache()
@@ -0,0 +1,110 @@
+"""
+图片异步加载 - 在线程池中用 QImageReader 解码图片，避免阻塞界面线程
+
+解码结果写入共享的 image_cache，完成后通过 image_decoded 信号通知
+界面线程，由画布只重绘对应图片所在的区域。图片按接近显示尺寸的
+分辨率解码，只有显示比例变大时才重新解码更高的分辨率。
+"""
+import math
+from PyQt5.QtGui import QGuiApplication
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from .image_cache import image_cache, decode_image
+
+# 解码分辨率按 1/√2 的倍数分级，避免缩放比例稍有变化就重新解码
+DECODE_SCALE_STEP = math.sqrt(2)
+
+
+def decode_scale_for(scale):
+    """根据显示比例计算需要的解码分辨率（相对源图片，最大为 1）"""
+    screens = QGuiApplication.screens() if QGuiApplication.instance() else []
+    device_pixel_ratio = max((s.devicePixelRatio() for s in screens), default=1.0)
+    needed = max(scale * device_pixel_ratio, 1e-3)
+    if needed >= 1.0:
+        return 1.0
+    # 向上取整到分级，解码分辨率不低于显示需要的分辨率，避免放大显示时模糊
+    # 正好落在分级上时允许很小的浮点误差，避免多升一级
+    level = math.ceil(math.log(needed, DECODE_SCALE_STEP) - 1e-9)
+    if DECODE_SCALE_STEP ** level < needed * (1 - 1e-9):
+        level += 1
+    return min(1.0, DECODE_SCALE_STEP ** level)
+
+
+class _DecodeSignals(QObject):
+    """工作线程向界面线程回传结果用的信号载体"""
+    finished = pyqtSignal(object, object)  # source_key, DecodedImage
+
+
+class _DecodeTask(QRunnable):
+    """在线程池中解码单个图片文件"""
+
+    def __init__(self, path, source_key, decoded_scale, signals):
+        super().__init__()
+        self.path = path
+        self.source_key = source_key
+        self.decoded_scale = decoded_scale
+        self.signals = signals
+
+    def run(self):
+        self.signals.finished.emit(self.source_key, decode_image(self.path, self.decoded_scale))
+
+
+class ImageLoader(QObject):
+    """异步图片加载器，同一文件的并发请求只解码一次"""
+
+    # 图片解码完成（成功或失败）时发出，参数为 source_key 和 DecodedImage（失败时为 None）
+    image_decoded = pyqtSignal(object, object)
+
+    def __init__(self):
+        super().__init__()
+        self._pending = {}  # source_key -> 正在解码的最高分辨率
+        self._failed = set()  # 解码失败的 source_key，避免反复重试
+        self._signals = _DecodeSignals()
+        self._signals.finished.connect(self._on_task_finished)
+        self._thread_pool = None
+
+    def request(self, path, scale=1.0):
+        """请求加载足够以 scale 比例显示的图片，命中缓存时立即返回
+
+        Returns:
+            (source_key, DecodedImage 或 None)。source_key 为 None 表示文件不存在；
+            DecodedImage 为 None 且 source_key 有效时表示正在后台解码
+        """
+        source_key = image_cache.source_key(path)
+        if source_key is None or source_key in self._failed:
+            return None, None
+
+        decoded_scale = decode_scale_for(scale)
+        decoded = image_cache.lookup(source_key, decoded_scale)
+        if decoded is not None:
+            return source_key, decoded
+
+        if self._pending.get(source_key, 0.0) < decoded_scale:
+            self._pending[source_key] = decoded_scale
+            if self._thread_pool is None:
+                # 使用独立的线程池：Qt 的平滑缩放会把工作分到全局线程池并等待完成，
+                # 界面线程持有 GIL 等待时，全局线程池里需要 GIL 的解码任务无法结束，
+                # 两者互相等待导致界面卡死
+                self._thread_pool = QThreadPool(self)
+            self._thread_pool.start(_DecodeTask(path, source_key, decoded_scale, self._signals))
+        return source_key, None
+
+    def is_pending(self, source_key):
+        """图片是否正在后台解码"""
+        return source_key in self._pending
+
+    def _on_task_finished(self, source_key, decoded):
+        """在界面线程中接收解码结果"""
+        if decoded is None:
+            self._pending.pop(source_key, None)
+            self._failed.add(source_key)
+        else:
+            if self._pending.get(source_key, 0.0) <= decoded.decoded_scale:
+                self._pending.pop(source_key, None)
+            # 缓存中只保留分辨率最高的结果，较晚完成的低分辨率解码不会覆盖它
+            decoded = image_cache.store(source_key, decoded)
+        self.image_decoded.emit(source_key, decoded)
+
+
+# 进程级共享实例
+image_loader = ImageLoader()
+
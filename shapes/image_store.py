@@ -0,0 +1,74 @@
+"""
+图片内容寻址存储 - 导出标注时按内容哈希保存图片文件
+
+图片字节以 <sha256><扩展名> 为文件名保存在 JSON 文件旁的资源目录中，
+相同内容的图片无论被多少形状、多少次导出引用都只保存一份。
+导入时按哈希找回图片，找不到时再回退到原始的 image_path。
+"""
+import hashlib
+import os
+import shutil
+from .image_cache import image_cache
+
+# 导出文件旁存放图片的资源目录名
+IMAGE_STORE_DIR_NAME = "annotation_images"
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# (绝对路径, 修改时间) -> 内容哈希，同一文件在多次导出之间无需重复计算
+_hash_cache = {}
+
+
+def hash_image_file(path):
+    """计算图片文件内容的 sha256，文件不存在时返回 None"""
+    source_key = image_cache.source_key(path)
+    if source_key is None:
+        return None
+    digest = _hash_cache.get(source_key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        _hash_cache[source_key] = digest
+    return digest
+
+
+class ImageStore:
+    """位于某个目录下的内容寻址图片存储"""
+
+    def __init__(self, root):
+        self.root = root
+
+    @classmethod
+    def beside(cls, json_path):
+        """获取与导出文件同目录的图片存储"""
+        return cls(os.path.join(os.path.dirname(os.path.abspath(json_path)), IMAGE_STORE_DIR_NAME))
+
+    @staticmethod
+    def _blob_name(digest, image_path):
+        return digest + os.path.splitext(image_path)[1].lower()
+
+    def path_for(self, digest, image_path=""):
+        """返回哈希对应的图片文件路径，未保存时返回 None"""
+        path = os.path.join(self.root, self._blob_name(digest, image_path))
+        return path if os.path.isfile(path) else None
+
+    def put(self, image_path):
+        """保存图片文件，内容已存在时跳过复制
+
+        Returns:
+            内容哈希；文件不存在时返回 None
+        """
+        digest = hash_image_file(image_path)
+        if digest is None:
+            return None
+        if self.path_for(digest, image_path) is None:
+            os.makedirs(self.root, exist_ok=True)
+            target = os.path.join(self.root, self._blob_name(digest, image_path))
+            # 先写临时文件再改名，避免中断时留下不完整的图片
+            temp_path = target + ".tmp"
+            shutil.copyfile(image_path, temp_path)
+            os.replace(temp_path, target)
+        return digest
@@ -0,0 +1,63 @@
+"""
+矢量图片 - 用 QSvgRenderer 按实际显示尺寸渲染 SVG
+
+SVG 不先栅格化再拉伸，而是按当前缩放、旋转和设备像素比直接渲染，
+结果存入共享的 image_cache。QtSvg 不可用时返回 None，由调用方回退到普通解码。
+"""
+from PyQt5.QtGui import QImage, QPainter, QPixmap, QTransform
+from PyQt5.QtCore import QRectF, Qt
+from .image_cache import image_cache
+
+try:
+    from PyQt5.QtSvg import QSvgRenderer
+except ImportError:
+    QSvgRenderer = None
+
+_renderers = {}  # source_key -> QSvgRenderer
+
+
+def get_svg_renderer(path, source_key):
+    """获取 SVG 渲染器，文件无效或 QtSvg 不可用时返回 None"""
+    if QSvgRenderer is None or source_key is None:
+        return None
+    renderer = _renderers.get(source_key)
+    if renderer is None:
+        renderer = QSvgRenderer(path)
+        if not renderer.isValid():
+            return None
+        _renderers[source_key] = renderer
+    return renderer
+
+
+def render_svg_pixmap(source_key, renderer, scale, rotation, device_pixel_ratio):
+    """获取按缩放、旋转和设备像素比渲染好的 QPixmap"""
+    def render():
+        size = renderer.defaultSize()
+        width = size.width() * scale * device_pixel_ratio
+        height = size.height() * scale * device_pixel_ratio
+        transform = QTransform().rotate(rotation)
+        bounds = transform.mapRect(QRectF(-width / 2, -height / 2, width, height))
+
+        image = QImage(max(1, round(bounds.width())), max(1, round(bounds.height())),
+                       QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.translate(image.width() / 2, image.height() / 2)
+        painter.rotate(rotation)
+        renderer.render(painter, QRectF(-width / 2, -height / 2, width, height))
+        painter.end()
+
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        return pixmap
+
+    key = (source_key, "svg", round(scale, 4), rotation, device_pixel_ratio)
+    return image_cache.get_rendered_pixmap(key, render)
+
+
+
+def release_svg_renderer(source_key):
+    """丢弃文件对应的渲染器"""
+    _renderers.pop(source_key, None)
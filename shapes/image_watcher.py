@@ -0,0 +1,78 @@
+"""
+图片文件监视 - 链接的图片在磁盘上被修改后自动重新加载
+
+所有 Image 形状共享一个 QFileSystemWatcher，同一路径只监视一次并按引用计数释放。
+短时间内的多次修改合并为一次通知，通知前先丢弃该文件的缓存结果。
+"""
+import os
+from PyQt5.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+from .image_cache import image_cache
+
+# 文件修改后等待多久再重新加载（毫秒），合并写入过程中的多次通知
+IMAGE_RELOAD_DEBOUNCE_MS = 300
+
+
+class ImageWatcher(QObject):
+    """按路径引用计数的共享文件监视器"""
+
+    # 文件修改（经过去抖）后发出，参数为绝对路径
+    image_changed = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self._watcher = None
+        self._refcounts = {}  # 绝对路径 -> 引用该路径的形状数
+        self._changed = set()
+        self._debounce_timer = None
+
+    def _ensure_watcher(self):
+        if self._watcher is None:
+            self._watcher = QFileSystemWatcher(self)
+            self._watcher.fileChanged.connect(self._on_file_changed)
+            self._debounce_timer = QTimer(self)
+            self._debounce_timer.setSingleShot(True)
+            self._debounce_timer.setInterval(IMAGE_RELOAD_DEBOUNCE_MS)
+            self._debounce_timer.timeout.connect(self._flush_changes)
+
+    def watch(self, path):
+        """开始监视路径，返回其绝对路径"""
+        abs_path = os.path.abspath(path)
+        count = self._refcounts.get(abs_path, 0)
+        self._refcounts[abs_path] = count + 1
+        if count == 0 and os.path.isfile(abs_path):
+            self._ensure_watcher()
+            self._watcher.addPath(abs_path)
+        return abs_path
+
+    def unwatch(self, path):
+        """释放一次对路径的监视，最后一个引用释放时停止监视"""
+        abs_path = os.path.abspath(path)
+        count = self._refcounts.get(abs_path, 0) - 1
+        if count > 0:
+            self._refcounts[abs_path] = count
+            return
+        self._refcounts.pop(abs_path, None)
+        self._changed.discard(abs_path)
+        if self._watcher is not None:
+            self._watcher.removePath(abs_path)
+
+    def _on_file_changed(self, path):
+        self._changed.add(path)
+        self._debounce_timer.start()
+
+    def _flush_changes(self):
+        """去抖结束，通知所有仍被引用的已修改文件"""
+        changed, self._changed = self._changed, set()
+        watched = set(self._watcher.files())
+        for path in changed:
+            if path not in self._refcounts:
+                continue
+            # 以“写临时文件再改名”方式保存的文件会脱离监视，需要重新添加
+            if path not in watched and os.path.isfile(path):
+                self._watcher.addPath(path)
+            image_cache.invalidate(path)
+            self.image_changed.emit(path)
+
+
+# 进程级共享实例
+image_watcher = ImageWatcher()
@@ -1,9 +1,11 @@
 """
 交互式形状类 - 文本、激光笔、橡皮擦
 """
-from PyQt5.QtGui import QColor, QPen, QBrush, QFont, QFontMetrics
+from PyQt5.QtGui import QColor, QPen, QBrush, QPainterPath, QStaticText, QTransform, QImage, QPainter
 from PyQt5.QtCore import QPointF, QRectF, QDateTime, Qt
 from .base import Shape
+from .style_cache import get_color, get_pen, get_font, get_font_metrics
+from .ruler import MAJOR_TICK_LENGTH
 
 
 class Text(Shape):
@@ -51,14 +53,21 @@ class Text(Shape):
         # 计算文本边界
         self._calculate_bounds()
     
+    def _font(self):
+        """获取当前文本样式对应的共享字体对象"""
+        return get_font(self.font_family, self.font_size, self.font_bold, self.font_italic)
+
+    @staticmethod
+    def _rgba(color):
+        """颜色可能是 QColor 或 [r, g, b, a] 列表，统一转换为 rgba 整数"""
+        if isinstance(color, list):
+            color = QColor(*color)
+        return color.rgba()
+
     def _calculate_bounds(self):
         """计算文本的边界矩形"""
-        font = QFont(self.font_family, self.font_size)
-        font.setBold(self.font_bold)
-        font.setItalic(self.font_italic)
-        
-        # 使用QFontMetrics计算文本尺寸
-        metrics = QFontMetrics(font)
+        # 使用缓存的QFontMetrics计算文本尺寸
+        metrics = get_font_metrics(self._font())
         
         # 支持多行文本
         lines = self.text.split('\n')
@@ -77,56 +86,49 @@ class Text(Shape):
             max_width + 2 * self.padding,
             total_height + 2 * self.padding
         )
+        
+        # 边界变化时文本布局也随之失效，下次绘制时重建
+        self._static_lines = None
+
+    def _build_static_lines(self):
+        """为每一行文本准备 QStaticText，并计算其左上角位置"""
+        font = self._font()
+        metrics = get_font_metrics(font)
+        text_x = int(self.position.x())
+        text_y = int(self.position.y())
+        
+        static_lines = []
+        for i, line in enumerate(self.text.split('\n')):
+            static_text = QStaticText(line)
+            static_text.setTextFormat(Qt.PlainText)
+            static_text.setPerformanceHint(QStaticText.AggressiveCaching)
+            static_text.prepare(QTransform(), font)
+            # drawStaticText 以行的左上角定位，等价于以 ascent 处为基线的 drawText
+            static_lines.append((QPointF(text_x, text_y + i * metrics.height()), static_text))
+        self._static_lines = static_lines
 
     def draw(self, painter):
-        # 创建字体
-        font = QFont(self.font_family, self.font_size)
-        font.setBold(self.font_bold)
-        font.setItalic(self.font_italic)
+        # 获取字体
+        font = self._font()
         painter.setFont(font)
         
-        # 重新计算边界（以防文本发生变化）
-        self._calculate_bounds()
+        # 边界和文本布局只在 setter 修改属性后重建
+        if self._static_lines is None:
+            self._build_static_lines()
         
         # 绘制背景
         if self.background_color:
-            if isinstance(self.background_color, list):
-                bg_color = QColor(*self.background_color)
-            else:
-                bg_color = QColor(self.background_color)
-            bg_color.setAlphaF(self.opacity)
-            painter.fillRect(self.text_rect, bg_color)
+            painter.fillRect(self.text_rect, get_color(self._rgba(self.background_color), self.opacity))
         
         # 绘制边框
         if self.border_enabled and self.border_color and self.border_width > 0:
-            if isinstance(self.border_color, list):
-                border_color = QColor(*self.border_color)
-            else:
-                border_color = QColor(self.border_color)
-            border_color.setAlphaF(self.opacity)
-            border_pen = QPen(border_color, self.border_width)
-            painter.setPen(border_pen)
+            painter.setPen(get_pen(self._rgba(self.border_color), self.opacity, self.border_width))
             painter.drawRect(self.text_rect)
         
-        # 绘制文本
-        if isinstance(self.text_color, list):
-            text_color = QColor(*self.text_color)
-        else:
-            text_color = QColor(self.text_color)
-        text_color.setAlphaF(self.opacity)
-        painter.setPen(QPen(text_color))
-        
-        # 计算文本绘制位置
-        text_x = int(self.position.x())
-        text_y = int(self.position.y())
-        
-        # 支持多行文本
-        lines = self.text.split('\n')
-        font_metrics = QFontMetrics(font)
-        
-        for i, line in enumerate(lines):
-            line_y = text_y + i * font_metrics.height() + font_metrics.ascent()
-            painter.drawText(text_x, int(line_y), line)
+        # 绘制文本（支持多行文本）
+        painter.setPen(get_pen(self._rgba(self.text_color), self.opacity))
+        for top_left, static_text in self._static_lines:
+            painter.drawStaticText(top_left, static_text)
 
     def set_text(self, text):
         """设置文本内容"""
@@ -189,6 +191,10 @@ class Text(Shape):
         self.padding = padding
         self._calculate_bounds()
 
+    def get_paint_rect(self):
+        margin = self.border_width / 2 + 2
+        return self.text_rect.adjusted(-margin, -margin, margin, margin)
+
     def contains_point(self, point):
         """检查点是否在文本区域内"""
         return self.text_rect.contains(point)
@@ -299,11 +305,41 @@ class Eraser(Shape):
     def __init__(self, points, **kwargs):
         # 橡皮擦不需要颜色，只需要大小信息
         super().__init__(**kwargs)
-        self.points = points  # 擦除路径上的点
+        self.points = []  # 擦除路径上的点
         # 橡皮擦是特殊的形状，用于标记需要删除的区域
         
+        # 擦除轨迹用圆头宽画笔描边即为扫过的区域。轨迹画在与画布同样大小的叠加图像上，
+        # 每次只描新增的一段，绘制时整体半透明贴图，重叠部分不会叠加透明度。
+        # 折线路径只在首次绘制（或画布大小变化）创建叠加图像时用到
+        self._sweep_path = QPainterPath()
+        radius = self.get_eraser_radius()
+        self._sweep_pen = QPen(QColor(255, 255, 255), radius * 2, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+        self._sweep_image = None
+        for point in points:
+            self.add_point(point)
+    
+    def add_point(self, point):
+        """添加擦除点，只在叠加图像上描新增的一段
+
+        Returns:
+            新增轨迹段需要重绘的区域
+        """
+        point = QPointF(point)
+        if self.points:
+            previous = self.points[-1]
+            self._sweep_path.lineTo(point)
+        else:
+            previous = point
+            self._sweep_path.moveTo(point)
+        self.points.append(point)
+        if self._sweep_image is not None and len(self.points) > 1:
+            self._stroke_sweep(lambda painter: painter.drawLine(previous, point))
+        
+        margin = self.get_eraser_radius() + 2  # 包含预览圆的虚线边框
+        return QRectF(previous, point).normalized().adjusted(-margin, -margin, margin, margin)
+        
     def draw(self, painter):
-        """绘制橡皮擦预览 - 显示为半透明的圆形"""
+        """绘制橡皮擦预览 - 半透明的擦除轨迹加上当前位置的圆形"""
         if not self.points:
             return
             
@@ -311,23 +347,51 @@ class Eraser(Shape):
         old_pen = painter.pen()
         old_brush = painter.brush()
         
-        # 设置橡皮擦预览样式 - 半透明的白色圆圈
-        preview_color = QColor(255, 255, 255, 100)  # 半透明白色
-        preview_pen = QPen(preview_color, 2, Qt.DashLine)
-        preview_brush = QBrush(QColor(255, 255, 255, 50))  # 更透明的填充
-        
-        painter.setPen(preview_pen)
-        painter.setBrush(preview_brush)
+        radius = self.get_eraser_radius()  # 橡皮擦大小基于粗细设置
+        if len(self.points) > 1:
+            self._ensure_sweep_image(painter.device())
+            old_opacity = painter.opacity()
+            painter.setOpacity(old_opacity * 50 / 255)
+            painter.drawImage(QPointF(0, 0), self._sweep_image)
+            painter.setOpacity(old_opacity)
+            painter.setBrush(Qt.NoBrush)
+        else:
+            painter.setBrush(QBrush(QColor(255, 255, 255, 50)))  # 更透明的填充
         
-        # 在每个点绘制圆形橡皮擦预览
-        radius = self.thickness * 2  # 橡皮擦大小基于粗细设置
-        for point in self.points:
-            painter.drawEllipse(point, radius, radius)
+        # 在当前位置绘制半透明的白色虚线圆圈
+        preview_color = QColor(255, 255, 255, 100)  # 半透明白色
+        painter.setPen(QPen(preview_color, 2, Qt.DashLine))
+        painter.drawEllipse(self.points[-1], radius, radius)
         
         # 恢复状态
         painter.setPen(old_pen)
         painter.setBrush(old_brush)
     
+    def release_preview(self):
+        """擦除结束后释放轨迹叠加图像"""
+        self._sweep_image = None
+
+    def _ensure_sweep_image(self, device):
+        """按绘制设备的大小和设备像素比创建叠加图像，并补画已有的轨迹"""
+        ratio = device.devicePixelRatioF() if device else 1.0
+        width, height = (device.width(), device.height()) if device else (1, 1)
+        image = self._sweep_image
+        if (image is not None and image.devicePixelRatioF() == ratio and
+                image.width() == round(width * ratio) and image.height() == round(height * ratio)):
+            return
+        self._sweep_image = QImage(round(width * ratio), round(height * ratio), QImage.Format_ARGB32_Premultiplied)
+        self._sweep_image.setDevicePixelRatio(ratio)
+        self._sweep_image.fill(Qt.transparent)
+        self._stroke_sweep(lambda painter: painter.drawPath(self._sweep_path))
+
+    def _stroke_sweep(self, stroke):
+        painter = QPainter(self._sweep_image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(self._sweep_pen)
+        painter.setBrush(Qt.NoBrush)
+        stroke(painter)
+        painter.end()
+
     def to_dict(self):
         """序列化为字典 - 橡皮擦不需要保存，因为它是删除操作"""
         data = super().to_dict()
@@ -497,75 +561,19 @@ class Eraser(Shape):
         return False
     
     def _intersects_with_interval_ticks(self, eraser_point, ruler_shape, eraser_radius):
-        """检查与按间隔绘制的刻度线的相交"""
-        import math
-        
-        # 获取标尺的实际长度和像素长度
-        dx = ruler_shape.end_point.x() - ruler_shape.start_point.x()
-        dy = ruler_shape.end_point.y() - ruler_shape.start_point.y()
-        total_pixel_length = math.sqrt(dx * dx + dy * dy)
+        """检查与按间隔绘制的刻度线的相交，复用标尺缓存的刻度几何"""
+        threshold = eraser_radius + ruler_shape.thickness
         
-        if total_pixel_length == 0:
+        # 刻度线最多伸出主线半个主刻度长度，离主线太远时无需逐条检查
+        if (self._point_to_line_distance(eraser_point, ruler_shape.start_point, ruler_shape.end_point)
+                > threshold + MAJOR_TICK_LENGTH / 2):
             return False
         
-        # 计算单位向量
-        unit_x = dx / total_pixel_length
-        unit_y = dy / total_pixel_length
-        perp_unit_x = -unit_y
-        perp_unit_y = unit_x
-        
-        # 计算刻度间隔对应的像素距离
-        scale_factor = ruler_shape.get_scale_factor()
-        pixel_interval = ruler_shape.tick_interval / scale_factor
-        
-        # 检查起点刻度
-        if self._check_single_tick_intersection(eraser_point, ruler_shape.start_point, perp_unit_x, perp_unit_y, True, eraser_radius, ruler_shape.thickness):
-            return True
-        
-        # 检查中间刻度
-        current_distance = pixel_interval
-        tick_index = 1
-        
-        while current_distance < total_pixel_length:
-            tick_x = ruler_shape.start_point.x() + unit_x * current_distance
-            tick_y = ruler_shape.start_point.y() + unit_y * current_distance
-            tick_pos = QPointF(tick_x, tick_y)
-            
-            # 判断是否为主刻度
-            actual_distance = current_distance * scale_factor
-            is_major = (tick_index % 5 == 0) or (abs(actual_distance - round(actual_distance)) < 0.01)
-            
-            if self._check_single_tick_intersection(eraser_point, tick_pos, perp_unit_x, perp_unit_y, is_major, eraser_radius, ruler_shape.thickness):
+        for tick_line in ruler_shape.get_tick_lines():
+            if self._point_to_line_distance(eraser_point, tick_line.p1(), tick_line.p2()) <= threshold:
                 return True
-            
-            current_distance += pixel_interval
-            tick_index += 1
-        
-        # 检查终点刻度
-        if total_pixel_length - (current_distance - pixel_interval) > pixel_interval * 0.1:
-            if self._check_single_tick_intersection(eraser_point, ruler_shape.end_point, perp_unit_x, perp_unit_y, True, eraser_radius, ruler_shape.thickness):
-                return True
-        
         return False
     
-    def _check_single_tick_intersection(self, eraser_point, tick_pos, perp_unit_x, perp_unit_y, is_major, eraser_radius, thickness):
-        """检查单个刻度线的相交"""
-        # 刻度线长度
-        tick_length = 8 if is_major else 4
-        half_length = tick_length / 2
-        
-        # 计算刻度线端点
-        start_x = tick_pos.x() - perp_unit_x * half_length
-        start_y = tick_pos.y() - perp_unit_y * half_length
-        end_x = tick_pos.x() + perp_unit_x * half_length
-        end_y = tick_pos.y() + perp_unit_y * half_length
-        
-        tick_start = QPointF(start_x, start_y)
-        tick_end = QPointF(end_x, end_y)
-        
-        # 检查与刻度线的相交
-        return self._point_to_line_distance(eraser_point, tick_start, tick_end) <= eraser_radius + thickness
-    
     def _point_to_line_distance(self, point, line_start, line_end):
         """计算点到线段的最短距离"""
         # 向量计算
@@ -2,21 +2,32 @@
 标尺相关形状类 - 直线标尺和圆形标尺
 """
 import math
-from PyQt5.QtGui import QColor, QPen, QFont, QFontMetrics
-from PyQt5.QtCore import QPointF, QRectF
+from PyQt5.QtGui import QColor
+from PyQt5.QtCore import QPointF, QRectF, QLineF
 from .base import Shape
+from .style_cache import get_pen, get_font, get_font_metrics
+
+# 刻度线长度（像素）
+MAJOR_TICK_LENGTH = 8
+MINOR_TICK_LENGTH = 4
+
+# 标签半透明白色背景
+LABEL_BACKGROUND_COLOR = QColor(255, 255, 255, 200)
 
 
 class RulerBase(Shape):
     """标尺基类，处理标尺的公共功能"""
     
+    # 刻度和长度标签超出标尺线条的最大距离（像素）
+    LABEL_MARGIN = 60
+    
     def __init__(self, pixel_length=100, real_length=10.0, unit="cm", **kwargs):
         super().__init__(**kwargs)
         self.pixel_length = pixel_length  # 像素长度
         self.real_length = real_length    # 实际长度（浮点数）
         self.unit = unit                  # 单位
         self.show_label = True            # 是否显示标签
-        self.label_font = QFont("Arial", 10)  # 标签字体
+        self.label_font = get_font("Arial", 10)  # 标签字体（共享对象，不要修改）
         
     def get_scale_factor(self):
         """获取缩放因子（实际长度/像素长度）"""
@@ -47,23 +58,20 @@ class RulerBase(Shape):
         old_font = painter.font()
         
         # 设置标签样式
-        label_color = QColor(self.base_color)
-        label_color.setAlphaF(self.opacity)
-        painter.setPen(QPen(label_color))
+        painter.setPen(get_pen(self.base_color.rgba(), self.opacity))
         painter.setFont(self.label_font)
         
         # 计算文本尺寸
-        metrics = QFontMetrics(self.label_font)
+        metrics = get_font_metrics(self.label_font)
         text_rect = metrics.boundingRect(text)
         
         # 绘制背景
-        bg_color = QColor(255, 255, 255, 200)  # 半透明白色背景
         painter.fillRect(
             int(position.x() - text_rect.width() // 2 - 2),
             int(position.y() - text_rect.height() // 2 - 2),
             text_rect.width() + 4,
             text_rect.height() + 4,
-            bg_color
+            LABEL_BACKGROUND_COLOR
         )
         
         # 绘制文本
@@ -87,6 +95,8 @@ class LineRuler(RulerBase):
         self.end_point = end_point
         self.show_ticks = True  # 是否显示刻度
         self.tick_interval = 1.0  # 刻度间隔（实际单位）
+        self._tick_lines = []
+        self._tick_lines_key = None
         
     def get_length(self):
         """获取直线的像素长度"""
@@ -145,23 +155,38 @@ class LineRuler(RulerBase):
                 self.draw_label(painter, label_text, label_pos)
     
     def draw_ticks(self, painter):
-        """绘制刻度"""
+        """绘制刻度，所有刻度线一次 drawLines 调用完成"""
         if not self.show_ticks:
             return
-            
+        tick_lines = self.get_tick_lines()
+        if tick_lines:
+            painter.drawLines(tick_lines)
+    
+    def get_tick_lines(self):
+        """获取所有刻度线，按 (端点, 比例, 刻度间隔) 缓存
+
+        绘制和橡皮擦命中检测共用这份几何数据。
+        """
+        key = (self.start_point.x(), self.start_point.y(),
+               self.end_point.x(), self.end_point.y(),
+               self.pixel_length, self.real_length, self.tick_interval)
+        if self._tick_lines_key != key:
+            self._tick_lines = self._compute_tick_lines()
+            self._tick_lines_key = key
+        return self._tick_lines
+    
+    def _compute_tick_lines(self):
+        """计算刻度线几何"""
         # 获取标尺的当前像素长度
-        current_pixel_length = self.get_length()
+        total_pixel_length = self.get_length()
         
         # 如果长度太短，不绘制刻度
-        if current_pixel_length <= 0:
-            return
+        if total_pixel_length <= 0:
+            return []
         
         # 获取基准缩放因子（实际单位/像素）
         # 这个缩放因子基于构造时设定的参考长度关系
-        if self.pixel_length == 0:
-            scale_factor = 1.0  # 默认1像素=1单位
-        else:
-            scale_factor = self.real_length / self.pixel_length
+        scale_factor = self.get_scale_factor()
         
         # 计算刻度间隔对应的像素距离
         # tick_interval是实际单位的间隔，需要转换为像素距离
@@ -169,30 +194,22 @@ class LineRuler(RulerBase):
         
         # 如果刻度间隔太小（小于1像素），不绘制刻度
         if pixel_interval < 1:
-            return
-        
-        # 获取标尺的总像素长度
-        total_pixel_length = current_pixel_length
+            return []
         
         # 计算标尺方向的单位向量
         dx = self.end_point.x() - self.start_point.x()
         dy = self.end_point.y() - self.start_point.y()
-        length = math.sqrt(dx * dx + dy * dy)
-        
-        if length == 0:
-            return
-            
-        unit_x = dx / length
-        unit_y = dy / length
+        unit_x = dx / total_pixel_length
+        unit_y = dy / total_pixel_length
         
         # 垂直方向单位向量（用于绘制刻度线）
         perp_unit_x = -unit_y
         perp_unit_y = unit_x
         
-        # 绘制起点刻度（总是绘制）
-        self._draw_single_tick(painter, self.start_point, perp_unit_x, perp_unit_y, True)
+        # 起点刻度（总是绘制）
+        lines = [self._tick_line(self.start_point.x(), self.start_point.y(), perp_unit_x, perp_unit_y, True)]
         
-        # 绘制中间刻度
+        # 中间刻度
         current_distance = pixel_interval
         tick_index = 1
         
@@ -200,39 +217,35 @@ class LineRuler(RulerBase):
             # 计算当前刻度位置
             tick_x = self.start_point.x() + unit_x * current_distance
             tick_y = self.start_point.y() + unit_y * current_distance
-            tick_pos = QPointF(tick_x, tick_y)
             
             # 判断是否为主刻度（每5个刻度或整数单位）
             actual_distance = current_distance * scale_factor
             is_major = (tick_index % 5 == 0) or (abs(actual_distance - round(actual_distance)) < 0.01)
             
-            self._draw_single_tick(painter, tick_pos, perp_unit_x, perp_unit_y, is_major)
+            lines.append(self._tick_line(tick_x, tick_y, perp_unit_x, perp_unit_y, is_major))
             
             current_distance += pixel_interval
             tick_index += 1
         
-        # 绘制终点刻度（总是绘制，除非与最后一个刻度重合）
+        # 终点刻度（总是绘制，除非与最后一个刻度重合）
         if total_pixel_length - (current_distance - pixel_interval) > pixel_interval * 0.1:
-            self._draw_single_tick(painter, self.end_point, perp_unit_x, perp_unit_y, True)
+            lines.append(self._tick_line(self.end_point.x(), self.end_point.y(), perp_unit_x, perp_unit_y, True))
+        return lines
     
-    def _draw_single_tick(self, painter, position, perp_unit_x, perp_unit_y, is_major):
-        """绘制单个刻度线"""
-        # 刻度线长度
-        tick_length = 8 if is_major else 4  # 主刻度8像素，次刻度4像素
-        
-        # 计算刻度线端点
-        half_length = tick_length / 2
-        start_x = position.x() - perp_unit_x * half_length
-        start_y = position.y() - perp_unit_y * half_length
-        end_x = position.x() + perp_unit_x * half_length
-        end_y = position.y() + perp_unit_y * half_length
-        
-        # 绘制刻度线
-        painter.drawLine(
-            QPointF(start_x, start_y),
-            QPointF(end_x, end_y)
+    @staticmethod
+    def _tick_line(x, y, perp_unit_x, perp_unit_y, is_major):
+        """单个刻度线，主刻度8像素，次刻度4像素"""
+        half_length = (MAJOR_TICK_LENGTH if is_major else MINOR_TICK_LENGTH) / 2
+        return QLineF(
+            x - perp_unit_x * half_length, y - perp_unit_y * half_length,
+            x + perp_unit_x * half_length, y + perp_unit_y * half_length
         )
     
+    def get_paint_rect(self):
+        margin = self.LABEL_MARGIN + self._stroke_margin()
+        rect = QRectF(QPointF(self.start_point), QPointF(self.end_point)).normalized()
+        return rect.adjusted(-margin, -margin, margin, margin)
+
     def to_dict(self):
         data = super().to_dict()
         data.update({
@@ -312,6 +325,11 @@ class CircleRuler(RulerBase):
             label_pos = QPointF(self.center_point.x(), self.center_point.y() - self.radius - 20)
             self.draw_label(painter, label_text, label_pos)
     
+    def get_paint_rect(self):
+        extent = self.radius + self.LABEL_MARGIN + self._stroke_margin()
+        return QRectF(self.center_point.x() - extent, self.center_point.y() - extent,
+                      extent * 2, extent * 2)
+
     def to_dict(self):
         data = super().to_dict()
         data.update({
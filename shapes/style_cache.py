@@ -0,0 +1,81 @@
+"""
+绘制样式缓存 - 按定义属性共享 QColor、QPen、QFont 和 QFontMetrics 对象
+
+绘制路径中频繁创建这些对象的开销不小，这里按属性元组做驻留，
+使用容量有限的 LRU 淘汰策略。返回的对象被多个形状共享，调用方不得修改。
+"""
+from collections import OrderedDict
+from PyQt5.QtGui import QColor, QPen, QFont, QFontMetrics
+from PyQt5.QtCore import Qt
+
+
+class LRUCache:
+    """按插入/访问顺序淘汰的简单 LRU 缓存"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get_or_create(self, key, factory):
+        """获取缓存对象，不存在时调用 factory 创建"""
+        entries = self._entries
+        value = entries.get(key)
+        if value is not None:
+            entries.move_to_end(key)
+            return value
+        value = factory()
+        entries[key] = value
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_colors = LRUCache(256)
+_pens = LRUCache(256)
+_fonts = LRUCache(64)
+_font_metrics = LRUCache(64)
+
+
+def get_color(rgba, opacity=None):
+    """获取颜色，opacity 不为 None 时覆盖颜色的透明度"""
+    def create():
+        color = QColor.fromRgba(rgba)
+        if opacity is not None:
+            color.setAlphaF(opacity)
+        return color
+    return _colors.get_or_create((rgba, opacity), create)
+
+
+def get_pen(rgba, opacity=None, width=1, style=Qt.SolidLine):
+    """获取画笔"""
+    return _pens.get_or_create(
+        (rgba, opacity, width, style),
+        lambda: QPen(get_color(rgba, opacity), width, style)
+    )
+
+
+def get_font(family, size, bold=False, italic=False):
+    """获取字体"""
+    def create():
+        font = QFont(family, size)
+        font.setBold(bold)
+        font.setItalic(italic)
+        return font
+    return _fonts.get_or_create((family, size, bold, italic), create)
+
+
+def get_font_metrics(font):
+    """获取字体对应的度量对象"""
+    return _font_metrics.get_or_create(font.key(), lambda: QFontMetrics(font))
+
+
+def clear_style_cache():
+    """清空所有样式缓存"""
+    for cache in (_colors, _pens, _fonts, _font_metrics):
+        cache.clear()
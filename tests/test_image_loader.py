@@ -0,0 +1,85 @@
+"""
+图片异步加载测试
+"""
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from shapes.image_loader import decode_scale_for, DECODE_SCALE_STEP  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 在子进程中运行：卡死时由超时结束，不会拖住整个测试进程
+_DECODE_WHILE_PAINTING = textwrap.dedent("""
+    import os, sys
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    sys.path.insert(0, sys.argv[1])
+    from PyQt5.QtGui import QGuiApplication, QImage, QColor
+    from PyQt5.QtCore import QThreadPool, QTimer
+    app = QGuiApplication([])
+    # 全局线程池线程数较少时更容易被解码任务占满
+    QThreadPool.globalInstance().setMaxThreadCount(4)
+    from shapes.image_loader import image_loader
+    from shapes.image_cache import image_cache
+
+    paths = []
+    for i in range(10):
+        path = os.path.join(sys.argv[2], "image%d.png" % i)
+        image = QImage(4000, 3000, QImage.Format_RGB32)
+        image.fill(QColor(i * 20, 100, 200))
+        image.save(path)
+        paths.append(path)
+
+    remaining = set()
+
+    def on_decoded(source_key, decoded):
+        # 与 Image.draw 相同，在界面线程中平滑缩放刚解码完成的图片
+        assert decoded is not None
+        image_cache.get_pixmap(source_key, decoded, 0.37, 0, 1.0)
+        remaining.discard(source_key)
+        if not remaining:
+            app.quit()
+
+    image_loader.image_decoded.connect(on_decoded)
+    for path in paths:
+        source_key, decoded = image_loader.request(path)
+        remaining.add(source_key)
+    app.exec_()
+    print("ok")
+""")
+
+
+def test_decode_while_painting_does_not_deadlock(tmp_path):
+    """后台解码多张大图的同时在界面线程平滑缩放，不应互相等待卡死"""
+    try:
+        result = subprocess.run(
+            [sys.executable, "-c", _DECODE_WHILE_PAINTING, REPO_ROOT, str(tmp_path)],
+            capture_output=True, text=True, timeout=60
+        )
+    except subprocess.TimeoutExpired:
+        pytest.fail("解码图片时界面线程卡死")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().endswith("ok")
+
+
+def test_decode_scale_never_below_needed():
+    """解码分辨率不低于显示需要的分辨率，且不超过它的一个分级"""
+    for i in range(1, 1000):
+        needed = i / 1000
+        decoded = decode_scale_for(needed)
+        assert decoded >= needed * (1 - 1e-9), (needed, decoded)
+        assert decoded == 1.0 or decoded / DECODE_SCALE_STEP < needed, (needed, decoded)
+
+
+def test_decode_scale_keeps_exact_steps():
+    """正好落在分级上的比例不会多升一级"""
+    for level in range(1, 10):
+        scale = DECODE_SCALE_STEP ** -level
+        assert decode_scale_for(scale) == pytest.approx(scale)
+    assert decode_scale_for(1.0) == 1.0
+    assert decode_scale_for(2.0) == 1.0
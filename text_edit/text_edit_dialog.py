@@ -7,6 +7,9 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTextEdit,
                              QPushButton, QLabel, QMessageBox, QApplication)
 from PyQt5.QtCore import Qt, QTimer, QCoreApplication
 from PyQt5.QtGui import QFont, QTextCursor, QKeyEvent
+from app_log import get_logger
+
+logger = get_logger(__name__)
 
 
 class CustomTextEdit(QTextEdit):
@@ -76,8 +79,8 @@ class TextEditDialog(QDialog):
             # 仅设置焦点，不重复激活窗口
             self.text_edit.setFocus()
             self.text_edit.selectAll()
-        except Exception as e:
-            print(f"Error setting focus: {e}")
+        except Exception:
+            logger.exception("Error setting focus")
     
     def _center_on_screen(self):
         """将对话框居中显示在屏幕上"""
@@ -87,8 +90,8 @@ class TextEditDialog(QDialog):
             x = (screen_geometry.width() - self.width()) // 2
             y = (screen_geometry.height() - self.height()) // 2
             self.move(x, y)
-        except Exception as e:
-            print(f"Error centering dialog: {e}")
+        except Exception:
+            logger.exception("Error centering dialog")
     
     def setup_ui(self):
         """设置用户界面"""
@@ -254,8 +257,8 @@ class TextEditDialog(QDialog):
         """重写显示事件以确保对话框稳定显示"""
         super().showEvent(event)
         
-        # 暂停主窗口的工具栏定时器，防止中断中文输入法
-        self._pause_toolbar_timer()
+        # 暂停工具栏置顶，防止中断中文输入法
+        self._suspend_toolbar_restack()
         
         # 确保对话框正常显示，但避免过度激活以免中断输入法
         self.raise_()
@@ -266,35 +269,32 @@ class TextEditDialog(QDialog):
             self._focus_set = True
             QTimer.singleShot(200, self._initial_focus_setup)
     
-    def _pause_toolbar_timer(self):
-        """暂停工具栏定时器以避免中断输入法"""
+    def _suspend_toolbar_restack(self):
+        """暂停工具栏置顶以避免中断输入法"""
         try:
             if (hasattr(self, 'parent_widget') and 
                 self.parent_widget and 
-                hasattr(self.parent_widget, 'toolbar_timer')):
-                self.parent_widget.toolbar_timer.stop()
+                hasattr(self.parent_widget, 'window_manager') and
+                not getattr(self, '_toolbar_restack_suspended', False)):
+                self.parent_widget.window_manager.suspend_toolbar_restack()
+                self._toolbar_restack_suspended = True
                 # 设置一个标志，表示对话框正在使用中
                 self.parent_widget._text_dialog_active = True
-                print("文本编辑对话框：已暂停工具栏定时器")
-        except Exception as e:
-            print(f"Error pausing toolbar timer: {e}")
+        except Exception:
+            logger.exception("Error suspending toolbar restack")
     
-    def _resume_toolbar_timer(self):
-        """恢复工具栏定时器"""
+    def _resume_toolbar_restack(self):
+        """恢复工具栏置顶，对话框关闭后工具栏回到最前面"""
         try:
             if (hasattr(self, 'parent_widget') and 
                 self.parent_widget and 
-                hasattr(self.parent_widget, 'toolbar_timer') and
-                hasattr(self.parent_widget, 'passthrough_state')):
+                getattr(self, '_toolbar_restack_suspended', False)):
+                self._toolbar_restack_suspended = False
                 # 清除对话框活动标志
                 self.parent_widget._text_dialog_active = False
-                # 只在非穿透模式下恢复定时器
-                if not self.parent_widget.passthrough_state:
-                    from constants import TOOLBAR_CHECK_INTERVAL
-                    self.parent_widget.toolbar_timer.start(TOOLBAR_CHECK_INTERVAL)
-                    print("文本编辑对话框：已恢复工具栏定时器")
-        except Exception as e:
-            print(f"Error resuming toolbar timer: {e}")
+                self.parent_widget.window_manager.resume_toolbar_restack()
+        except Exception:
+            logger.exception("Error resuming toolbar restack")
     
     def _initial_focus_setup(self):
         """初始焦点设置（仅执行一次）"""
@@ -304,8 +304,8 @@ class TextEditDialog(QDialog):
                 self.text_edit.setFocus(Qt.OtherFocusReason)
                 # 延迟选中文本，给输入法更多时间初始化
                 QTimer.singleShot(50, lambda: self.text_edit.selectAll() if self.text_edit.hasFocus() else None)
-        except Exception as e:
-            print(f"Error in initial focus setup: {e}")
+        except Exception:
+            logger.exception("Error in initial focus setup")
     
     def _ensure_dialog_focus(self):
         """确保对话框保持焦点（移除定期检查以避免中断输入法）"""
@@ -315,19 +315,12 @@ class TextEditDialog(QDialog):
     def closeEvent(self, event):
         """重写关闭事件以恢复工具栏焦点"""
         try:
-            # 恢复工具栏定时器
-            self._resume_toolbar_timer()
-            
-            # 如果有父窗口，延迟恢复工具栏焦点，避免立即抢夺焦点
-            if (hasattr(self, 'parent_widget') and 
-                self.parent_widget and 
-                hasattr(self.parent_widget, 'window_manager')):
-                # 使用较长的延迟，确保对话框完全关闭后再处理工具栏
-                QTimer.singleShot(300, self.parent_widget.window_manager.ensure_toolbar_on_top)  # type: ignore
+            # 恢复工具栏置顶，对话框关闭后由窗口管理器延迟置顶工具栏
+            self._resume_toolbar_restack()
             
             event.accept()
             # 延迟清理资源，避免立即删除造成的问题
             QTimer.singleShot(50, self.deleteLater)
-        except Exception as e:
-            print(f"Error in close event: {e}")
+        except Exception:
+            logger.exception("Error in close event")
             event.accept()
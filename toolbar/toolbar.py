@@ -81,6 +81,7 @@ class AnnotationToolbar(QWidget):
         self.toggle_passthrough_btn: Optional[QPushButton] = None
         self.toggle_visibility_btn: Optional[QPushButton] = None
         self.single_draw_mode_btn: Optional[QPushButton] = None
+        self.disappearing_ink_btn: Optional[QPushButton] = None
         
         # 操作按钮
         self.undo_btn: Optional[QPushButton] = None
@@ -118,9 +118,8 @@ class ToolbarEventHandler:
     
     def handle_text_style_dialog(self) -> None:
         """处理文本样式设置对话框事件"""
-        # 暂时停止工具栏的定时器，避免焦点冲突
-        if hasattr(self.main_window, 'toolbar_timer'):
-            self.main_window.toolbar_timer.stop()
+        # 对话框打开期间暂停工具栏置顶，避免焦点冲突
+        self.main_window.window_manager.suspend_toolbar_restack()
         
         try:
             # 确保在主线程中执行
@@ -158,10 +157,8 @@ class ToolbarEventHandler:
             import traceback
             traceback.print_exc()
         finally:
-            # 恢复工具栏定时器（仅在非穿透模式下）
-            if (hasattr(self.main_window, 'toolbar_timer') and 
-                not getattr(self.main_window, 'passthrough_state', False)):
-                self.main_window.toolbar_timer.start(1000)
+            # 恢复工具栏置顶
+            self.main_window.window_manager.resume_toolbar_restack()
     
     def handle_mouse_events(self, obj: QWidget, event: QEvent) -> bool:
         """处理鼠标事件（主要用于拖动）
@@ -330,19 +330,19 @@ class ToolbarWidgetBuilder:
         self.toolbar.undo_btn = QPushButton("↶ 撤销")
         self.toolbar.undo_btn.setProperty("class", "action")
         self.toolbar.undo_btn.setMinimumHeight(32)
-        self.toolbar.undo_btn.clicked.connect(self.canvas.undo)
+        self.toolbar.undo_btn.clicked.connect(self.main_window.screen_manager.undo)
         buttons.append(self.toolbar.undo_btn)
         
         self.toolbar.redo_btn = QPushButton("↷ 重做")
         self.toolbar.redo_btn.setProperty("class", "action")
         self.toolbar.redo_btn.setMinimumHeight(32)
-        self.toolbar.redo_btn.clicked.connect(self.canvas.redo)
+        self.toolbar.redo_btn.clicked.connect(self.main_window.screen_manager.redo)
         buttons.append(self.toolbar.redo_btn)
         
         self.toolbar.clear_btn = QPushButton("🗑 清空")
         self.toolbar.clear_btn.setProperty("class", "action warning")
         self.toolbar.clear_btn.setMinimumHeight(32)
-        self.toolbar.clear_btn.clicked.connect(self.canvas.clear_canvas)
+        self.toolbar.clear_btn.clicked.connect(self.main_window.screen_manager.clear_all)
         buttons.append(self.toolbar.clear_btn)
         
         # 模式控制按钮
@@ -367,6 +367,13 @@ class ToolbarWidgetBuilder:
         self.toolbar.single_draw_mode_btn.clicked.connect(self.main_window.toggle_single_draw_mode)
         buttons.append(self.toolbar.single_draw_mode_btn)
         
+        self.toolbar.disappearing_ink_btn = QPushButton("⏳ 消失")
+        self.toolbar.disappearing_ink_btn.setProperty("class", "action")
+        self.toolbar.disappearing_ink_btn.setMinimumHeight(32)
+        self.toolbar.disappearing_ink_btn.setCheckable(True)
+        self.toolbar.disappearing_ink_btn.clicked.connect(self.main_window.toggle_disappearing_ink)
+        buttons.append(self.toolbar.disappearing_ink_btn)
+        
         # 文件操作按钮
         self.toolbar.import_btn = QPushButton("📥 导入")
         self.toolbar.import_btn.setProperty("class", "action primary")
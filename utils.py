@@ -7,6 +7,9 @@ import os
 from typing import Optional
 from PyQt5.QtGui import QIcon, QPixmap, QPainter, QColor
 from PyQt5.QtCore import Qt
+from app_log import get_logger
+
+logger = get_logger(__name__)
 
 
 def get_resource_path(relative_path: str) -> str:
@@ -54,16 +57,16 @@ def load_icon_with_fallback(icon_path: str) -> QIcon:
     try:
         # 尝试使用绝对路径加载图标文件
         full_icon_path = get_resource_path(icon_path)
-        print(f"尝试加载图标文件: {full_icon_path}")
+        logger.debug("尝试加载图标文件: %s", full_icon_path)
         
         if os.path.exists(full_icon_path):
             icon = QIcon(full_icon_path)
-            print(f"图标文件存在，加载结果: isNull={icon.isNull()}")
+            logger.debug("图标文件存在，加载结果: isNull=%s", icon.isNull())
             if not icon.isNull():
-                print(f"图标可用尺寸: {icon.availableSizes()}")
+                logger.debug("图标可用尺寸: %s", icon.availableSizes())
                 return icon
         else:
-            print(f"图标文件不存在: {full_icon_path}")
+            logger.debug("图标文件不存在: %s", full_icon_path)
             # 尝试查找当前目录和几个可能的位置
             possible_paths = [
                 icon_path,  # 相对路径
@@ -72,15 +75,15 @@ def load_icon_with_fallback(icon_path: str) -> QIcon:
             ]
             
             for path in possible_paths:
-                print(f"尝试路径: {path}")
+                logger.debug("尝试路径: %s", path)
                 if os.path.exists(path):
                     icon = QIcon(path)
                     if not icon.isNull():
-                        print(f"在路径 {path} 找到有效图标")
+                        logger.debug("在路径 %s 找到有效图标", path)
                         return icon
-    except Exception as e:
-        print(f"加载图标文件失败: {e}")
+    except Exception:
+        logger.exception("加载图标文件失败")
     
     # 如果加载失败，返回默认图标
-    print("使用默认图标")
+    logger.warning("图标文件 %s 加载失败，使用默认图标", icon_path)
     return create_default_icon()